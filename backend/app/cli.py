@@ -0,0 +1,201 @@
+"""
+Maintenance commands for the DS Club Portal backend.
+
+Usage (from the backend directory or inside the container):
+    python -m app.cli notifications-retention [--retention-days N]
+    python -m app.cli audit-load-segments
+    python -m app.cli audit-partitions [--months-ahead N]
+    python -m app.cli attendance-summary-rebuild
+    python -m app.cli achievements-rebuild
+    python -m app.cli skills-rebuild
+    python -m app.cli blobs-import
+    python -m app.cli blobs-gc
+    python -m app.cli blobs-compress
+    python -m app.cli uploads-expire
+"""
+import argparse
+import json
+
+from .database import SessionLocal, init_db
+
+
+def notifications_retention(args):
+    from .services.notification_retention import NotificationRetentionService
+
+    db = SessionLocal()
+    try:
+        return NotificationRetentionService.run(db, retention_days=args.retention_days)
+    finally:
+        db.close()
+
+
+def audit_load_segments(args):
+    from .services.audit_segments import SegmentAuditSink
+
+    sink = SegmentAuditSink()
+    recovered = sink.recover()
+    loaded = sink.load_closed_segments(force=True)
+    return {"segments_recovered": recovered, "segments_loaded": loaded, "directory": sink.directory}
+
+
+def audit_partitions(args):
+    from .config import get_settings
+    from .utils.partitions import ensure_monthly_partitions
+
+    months_ahead = args.months_ahead if args.months_ahead is not None else get_settings().AUDIT_PARTITIONS_AHEAD
+    db = SessionLocal()
+    try:
+        partitions = ensure_monthly_partitions(db, 'audit_logs', months_ahead)
+        return {
+            "partitions_created": partitions["created"],
+            "partitions_skipped": partitions["skipped"],
+            "rows_moved_from_default": partitions["rows_moved"]
+        }
+    finally:
+        db.close()
+
+
+def attendance_summary_rebuild(args):
+    from .services.attendance_summary import AttendanceSummaryService
+
+    db = SessionLocal()
+    try:
+        return AttendanceSummaryService.rebuild(db)
+    finally:
+        db.close()
+
+
+def achievements_rebuild(args):
+    from .services.achievements import AchievementService
+
+    db = SessionLocal()
+    try:
+        return AchievementService.rebuild(db)
+    finally:
+        db.close()
+
+
+def skills_rebuild(args):
+    from .services.skills import SkillService
+
+    db = SessionLocal()
+    try:
+        return SkillService.rebuild(db)
+    finally:
+        db.close()
+
+
+def blobs_import(args):
+    from .services.blob_store import BlobStore
+
+    db = SessionLocal()
+    try:
+        return BlobStore.import_legacy(db)
+    finally:
+        db.close()
+
+
+def blobs_gc(args):
+    from .services.blob_store import BlobStore
+
+    db = SessionLocal()
+    try:
+        return BlobStore.collect(db)
+    finally:
+        db.close()
+
+
+def blobs_compress(args):
+    from .services.blob_store import BlobStore
+
+    db = SessionLocal()
+    try:
+        return BlobStore.precompress_all(db)
+    finally:
+        db.close()
+
+
+def uploads_expire(args):
+    from .services.resumable_uploads import ResumableUploadService
+
+    db = SessionLocal()
+    try:
+        return ResumableUploadService.expire(db)
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="DS Club Portal maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    retention = commands.add_parser(
+        "notifications-retention",
+        help="Create upcoming notification partitions, archive and drop expired ones"
+    )
+    retention.add_argument("--retention-days", type=int, default=None)
+    retention.set_defaults(handler=notifications_retention)
+
+    segments = commands.add_parser(
+        "audit-load-segments",
+        help="Recover crashed audit segments and bulk-load all closed segments (AUDIT_BACKEND=segments)"
+    )
+    segments.set_defaults(handler=audit_load_segments)
+
+    partitions = commands.add_parser(
+        "audit-partitions",
+        help="Create upcoming monthly audit_logs partitions (PostgreSQL)"
+    )
+    partitions.add_argument("--months-ahead", type=int, default=None)
+    partitions.set_defaults(handler=audit_partitions)
+
+    summary = commands.add_parser(
+        "attendance-summary-rebuild",
+        help="Recompute event_attendance_summary from attendance_records (backfill / repair)"
+    )
+    summary.set_defaults(handler=attendance_summary_rebuild)
+
+    achievements = commands.add_parser(
+        "achievements-rebuild",
+        help="Recompute member streaks and badges from attendance_records (backfill / repair)"
+    )
+    achievements.set_defaults(handler=achievements_rebuild)
+
+    skills = commands.add_parser(
+        "skills-rebuild",
+        help="Re-derive the normalized skill tags (user_skills) from users.skills (backfill / repair)"
+    )
+    skills.set_defaults(handler=skills_rebuild)
+
+    blobs = commands.add_parser(
+        "blobs-import",
+        help="Move study materials stored as uploads/<file name> into the content-addressed blob store"
+    )
+    blobs.set_defaults(handler=blobs_import)
+
+    gc = commands.add_parser(
+        "blobs-gc",
+        help="Repair blob reference counts and delete unreferenced blobs, orphan and stale temp files"
+    )
+    gc.set_defaults(handler=blobs_gc)
+
+    compress = commands.add_parser(
+        "blobs-compress",
+        help="Write missing gzip copies of text-format study materials (CSV, notebooks, ...) for downloads"
+    )
+    compress.set_defaults(handler=blobs_compress)
+
+    expire = commands.add_parser(
+        "uploads-expire",
+        help="Delete abandoned resumable uploads (RESUMABLE_UPLOAD_EXPIRY_HOURS) and their files"
+    )
+    expire.set_defaults(handler=uploads_expire)
+
+    args = parser.parse_args(argv)
+    init_db()
+    result = args.handler(args)
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,46 @@ class Settings(BaseSettings):
     # Approval Workflow
     APPROVAL_TIMEOUT_MINUTES: int = 3  # Signup approval timeout
     
+    # Notification Retention
+    NOTIFICATION_RETENTION_DAYS: int = 90  # Read notifications older than this are archived
+    NOTIFICATION_ARCHIVE_BACKEND: str = "file"  # 'file' (gzip JSONL) or 'table' (notifications_archive)
+    NOTIFICATION_ARCHIVE_DIR: str = "archive/notifications"
+    NOTIFICATION_PARTITIONS_AHEAD: int = 3  # Monthly partitions created in advance (PostgreSQL)
+    
+    # Audit Logging (buffered writer)
+    AUDIT_ASYNC_ENABLED: bool = True  # False writes each audit row synchronously (own connection)
+    AUDIT_QUEUE_SIZE: int = 10000  # Max buffered audit rows per worker
+    AUDIT_BATCH_SIZE: int = 500  # Rows per multi-row INSERT
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Max time a row waits in the buffer
+    AUDIT_OVERFLOW_POLICY: str = "block"  # block (then drop), drop_newest, drop_oldest
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 0.05  # Max time a request waits when the buffer is full
+    AUDIT_BACKEND: str = "database"  # 'database' (multi-row INSERT) or 'segments' (local files + COPY)
+    AUDIT_SEGMENT_DIR: str = "audit_segments"
+    AUDIT_SEGMENT_MAX_BYTES: int = 4 * 1024 * 1024  # Rotate the open segment after this size
+    AUDIT_SEGMENT_MAX_AGE_SECONDS: int = 30  # ...or after this age
+    AUDIT_FAILURE_ROLLUP_ENABLED: bool = True  # Aggregate attendance_failed per (user, reason, minute)
+    AUDIT_FAILURE_FULL_ROWS_PER_WINDOW: int = 3  # Full audit rows kept per window before counting only
+    AUDIT_ROLLUP_FLUSH_SECONDS: float = 15.0  # How often closed windows are written
+    AUDIT_PARTITIONS_AHEAD: int = 3  # Monthly audit_logs partitions created in advance (PostgreSQL)
+    
+    # Change versions (conditional GET, shared caches)
+    CHANGE_VERSION_CACHE_SECONDS: float = 1.0  # How long a worker trusts its cached change versions
+    ADMIN_STATS_CACHE_SECONDS: float = 5.0  # Admin dashboard stats, shared by all workers
+    MEMBER_HISTORY_CACHE_SECONDS: float = 300.0  # Per-member attendance history (first page)
+    ANALYTICS_MAX_AGE_SECONDS: float = 3600.0  # Analytics matrix reload even without writes (events age into the past)
+    EXPORT_CHUNK_ROWS: int = 5000  # Rows per server-side cursor fetch / Arrow record batch in exports
+    MEMBER_SEARCH_SIMILARITY: float = 0.4  # Minimum trigram word similarity for fuzzy member search matches
+    
+    # Uploads (study materials)
+    UPLOAD_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # Enforced while the body streams (413 once exceeded)
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # File data buffered per disk write / hash update (worker thread)
+    RESUMABLE_MAX_CHUNK_BYTES: int = 64 * 1024 * 1024  # Largest PUT accepted by resumable uploads
+    RESUMABLE_UPLOAD_EXPIRY_HOURS: int = 24  # Resumable uploads untouched this long are removed (uploads-expire)
+    DOWNLOAD_CHUNK_BYTES: int = 1024 * 1024  # File data per read when the server has no zero-copy send
+    DOWNLOAD_ACCEL_PREFIX: str = ""  # e.g. /_protected/: hand file bodies to nginx via X-Accel-Redirect (sendfile)
+    DOWNLOAD_SIGNING_SECRET: str = ""  # Key for signed download URLs (default: derived from SECRET_KEY)
+    DOWNLOAD_URL_EXPIRY_SECONDS: int = 3600  # Signed URLs last one to two of these windows
+    
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
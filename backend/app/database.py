@@ -29,7 +29,7 @@ def get_db():
 
 def init_db():
     """Initialize database tables. In production with Supabase, tables should be created via migrations."""
-    from .models import user, event, attendance, material, approval, audit_log, notification
+    from .models import user, event, attendance, material, approval, audit_log, notification, change_version, shared_cache, achievement, skill
     Base.metadata.create_all(bind=engine)
 
 def check_db_connection():
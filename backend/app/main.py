@@ -1,6 +1,5 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 import os
 
@@ -8,8 +7,10 @@ from .database import engine, init_db, SessionLocal, check_db_connection
 from .models.user import User, UserRole
 from .utils.security import get_password_hash
 from .config import get_settings
+from .services.audit_writer import get_audit_writer, shutdown_audit_writer
+from .services.security_rollup import shutdown_security_aggregator
 
-from .routes import auth, events, attendance, admin, resources, member
+from .routes import auth, events, attendance, admin, resources, member, notifications, audit, analytics, exports
 
 app = FastAPI(
     title="DS Club Portal",
@@ -25,12 +26,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Content-Disposition", "Content-Range", "Accept-Ranges", "Upload-Offset"],
 )
 
-# Mount uploads directory
-os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
 # Include routers
 app.include_router(auth.router)
 app.include_router(events.router)
@@ -38,6 +36,10 @@ app.include_router(attendance.router)
 app.include_router(admin.router)
 app.include_router(resources.router)
 app.include_router(member.router)
+app.include_router(notifications.router)
+app.include_router(audit.router)
+app.include_router(analytics.router)
+app.include_router(exports.router)
 
 @app.on_event("startup")
 def startup_event():
@@ -66,6 +68,12 @@ def startup_event():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+def shutdown_event():
+    # Flush buffered audit rows and security rollups before the worker exits
+    shutdown_security_aggregator()
+    shutdown_audit_writer()
+
 @app.get("/")
 def root():
     return {"message": "DS Club Portal API", "status": "running", "version": "1.0.0"}
@@ -76,5 +84,6 @@ def health_check():
     db_healthy = check_db_connection()
     return {
         "status": "healthy" if db_healthy else "unhealthy",
-        "database": "connected" if db_healthy else "disconnected"
+        "database": "connected" if db_healthy else "disconnected",
+        "audit_writer": get_audit_writer().stats()
     }
\ No newline at end of file
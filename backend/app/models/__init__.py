@@ -1,7 +1,11 @@
 from .user import User, UserRole
 from .event import Event
-from .attendance import QRSession, AttendanceRecord, UsedNonce
-from .material import StudyMaterial
+from .attendance import QRSession, AttendanceRecord, UsedNonce, EventAttendanceSummary
+from .material import StudyMaterial, MaterialBlob, MaterialUpload
 from .approval import ApprovalRequest, ApprovalStatus
-from .audit_log import AuditLog
-from .notification import Notification
+from .audit_log import AuditLog, SecurityEventRollup
+from .notification import Notification, NotificationCounter, NotificationArchive
+from .change_version import ChangeVersion
+from .shared_cache import SharedCacheEntry
+from .achievement import MemberStreak, MemberBadge
+from .skill import Skill, UserSkill
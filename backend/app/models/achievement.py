@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, PrimaryKeyConstraint
+from datetime import datetime
+from ..database import Base
+
+class MemberStreak(Base):
+    """
+    Per-member attendance totals and streaks, updated in the check-in transaction
+    so the badges / activity endpoints read one row instead of the full history.
+    A streak is a run of consecutive live events (in scheduled order) attended.
+    """
+    __tablename__ = "member_streaks"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_attended = Column(Integer, default=0, nullable=False)
+    current_streak = Column(Integer, default=0, nullable=False)  # Run ending at last_event_id
+    longest_streak = Column(Integer, default=0, nullable=False)
+    last_event_id = Column(String, nullable=True)  # Latest attended event (scheduled order)
+    last_event_at = Column(DateTime, nullable=True)  # Its scheduled_at
+    last_check_in = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class MemberBadge(Base):
+    """Badges a member has earned (see services/achievements.py for the catalogue)."""
+    __tablename__ = "member_badges"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    badge = Column(String(50), nullable=False)
+    awarded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint('user_id', 'badge'),
+    )
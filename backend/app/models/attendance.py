@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, ForeignKey, Index, UniqueConstraint, CheckConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 import uuid
@@ -74,6 +74,23 @@ class AttendanceRecord(Base):
     )
 
 
+class EventAttendanceSummary(Base):
+    """
+    Per-event attendance totals, maintained incrementally on check-in and on
+    member activation/deactivation so reports never re-count attendance_records.
+    eligible_count is the number of active students at event time: it follows
+    activations until the event starts and is frozen afterwards.
+    """
+    __tablename__ = "event_attendance_summary"
+    
+    event_id = Column(String, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    attended_count = Column(Integer, default=0, nullable=False)
+    eligible_count = Column(Integer, default=0, nullable=False)
+    first_check_in = Column(DateTime, nullable=True)
+    last_check_in = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class UsedNonce(Base):
     """
     Tracks used nonces to prevent replay attacks.
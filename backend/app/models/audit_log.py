@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, DateTime, Text, Index
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index, UniqueConstraint
 from datetime import datetime
 import uuid
 from ..database import Base
@@ -12,12 +12,41 @@ class AuditLog(Base):
     action = Column(String(50), nullable=False)  # e.g., 'signup', 'login', 'attendance_marked'
     resource_type = Column(String(50), nullable=True)  # e.g., 'event', 'user', 'approval'
     resource_id = Column(String, nullable=True)
-    meta_data = Column(Text, nullable=True)  # JSON string (renamed from 'metadata' to avoid SQLAlchemy conflict)
+    meta_data = Column(Text, nullable=True)  # JSON string; JSONB in PostgreSQL (renamed from 'metadata' to avoid SQLAlchemy conflict)
     ip_address = Column(String, nullable=True)
     user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Monthly partition key in PostgreSQL
     
+    # JSONB expression indexes on meta_data->>'event_id' / 'qr_session_id' are
+    # PostgreSQL-only and live in migrations/005_audit_log_partitions.sql
     __table_args__ = (
         Index('idx_audit_user_action', 'user_id', 'action'),
         Index('idx_audit_action_created', 'action', 'created_at'),
+        Index('idx_audit_user_created', 'user_id', 'created_at'),
+        Index('idx_audit_resource', 'resource_type', 'resource_id'),
+        Index('idx_audit_created_brin', 'created_at', postgresql_using='brin'),
+    )
+
+
+class SecurityEventRollup(Base):
+    """
+    Per-minute aggregate of rejected security events (e.g. failed attendance scans).
+    One row per (user, action, reason, minute) instead of one audit row per attempt.
+    """
+    __tablename__ = "security_event_rollups"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, nullable=False)
+    action = Column(String(50), nullable=False)  # e.g., 'attendance_failed'
+    reason = Column(String(50), nullable=False)  # e.g., 'qr_expired', 'nonce_already_used'
+    window_start = Column(DateTime, nullable=False)  # Minute bucket
+    count = Column(Integer, default=0, nullable=False)
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False)
+    ip_address = Column(String, nullable=True)  # Last seen IP within the window
+    
+    __table_args__ = (
+        UniqueConstraint('user_id', 'action', 'reason', 'window_start', name='one_rollup_per_window'),
+        Index('idx_rollups_window', 'window_start'),
+        Index('idx_rollups_user_window', 'user_id', 'window_start'),
     )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, BigInteger
+from datetime import datetime
+from ..database import Base
+
+class ChangeVersion(Base):
+    """
+    Monotonic version per data scope (e.g. 'events', 'resources', 'attendance:user:<id>').
+    Bumped in the same transaction as the write; list endpoints derive their ETags from it.
+    """
+    __tablename__ = "change_versions"
+    
+    scope = Column(String(100), primary_key=True)
+    version = Column(BigInteger, default=1, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
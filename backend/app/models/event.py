@@ -35,4 +35,10 @@ class Event(Base):
     __table_args__ = (
         Index('idx_events_scheduled', 'scheduled_at'),
         Index('idx_events_created_by', 'created_by'),
+        # Listings only ever show live events; id is the keyset tie-breaker
+        Index(
+            'idx_events_active_scheduled', 'scheduled_at', 'id',
+            postgresql_where=(is_deleted == False),
+            sqlite_where=(is_deleted == False)
+        ),
     )
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index, BigInteger, Integer
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -14,6 +14,8 @@ class StudyMaterial(Base):
     description = Column(Text)
     file_path = Column(String, nullable=False)
     file_name = Column(String, nullable=False)  # Matches database column name
+    file_size = Column(BigInteger, nullable=True)  # Bytes; NULL for files uploaded before migration 013
+    content_sha256 = Column(String(64), nullable=True)  # Hex digest; the material_blobs key for stored blobs
     uploaded_by = Column(String, ForeignKey("users.id"), nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     
@@ -23,4 +25,45 @@ class StudyMaterial(Base):
     
     __table_args__ = (
         Index('idx_materials_event', 'event_id'),
+        Index('idx_materials_sha256', 'content_sha256'),
+    )
+
+
+class MaterialBlob(Base):
+    """
+    Content-addressed file in the blob store (uploads/blobs/<aa>/<sha256>).
+    ref_count is the number of study_materials pointing at it; the blob is
+    deleted when the last one goes.
+    """
+    __tablename__ = "material_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class MaterialUpload(Base):
+    """
+    Resumable upload in progress. The file is preallocated at
+    uploads/incoming/<id>.part; `received` bytes from the start have been written
+    and checksum-verified. The row is removed on finalize, abort or expiry.
+    """
+    __tablename__ = "material_uploads"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    event_id = Column(String, ForeignKey("events.id"), nullable=True)
+    file_name = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    received = Column(BigInteger, default=0, nullable=False)
+    expected_sha256 = Column(String(64), nullable=True)  # Checked on finalize when the client sends it
+    created_by = Column(String, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # Pushed back by every chunk
+    
+    __table_args__ = (
+        Index('idx_material_uploads_expires', 'expires_at'),
     )
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, ForeignKey, Index
 from datetime import datetime
 import uuid
 from ..database import Base
@@ -18,5 +18,37 @@ class Notification(Base):
     read_at = Column(DateTime, nullable=True)
     
     __table_args__ = (
-        Index('idx_notifications_recipient_read', 'recipient_id', 'is_read'),
+        # Serves inbox listing (newest first) and unread filtering per recipient
+        Index('idx_notifications_inbox', 'recipient_id', 'is_read', 'created_at'),
     )
+
+
+class NotificationCounter(Base):
+    """
+    Per-user unread notification counter.
+    Maintained incrementally on create / mark-read so badge polling is a primary key lookup.
+    """
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class NotificationArchive(Base):
+    """
+    Cold storage for read notifications past the retention window.
+    Not indexed for inbox queries; rows are only read back for audits / exports.
+    """
+    __tablename__ = "notifications_archive"
+    
+    id = Column(String, primary_key=True)
+    recipient_id = Column(String, nullable=False)
+    type = Column(String(50), nullable=False)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=True)
+    notification_data = Column(Text, nullable=True)
+    is_read = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    read_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
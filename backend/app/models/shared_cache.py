@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, Text
+from ..database import Base
+
+class SharedCacheEntry(Base):
+    """
+    Short-lived cached results shared by all workers (e.g. admin dashboard stats).
+    An entry is valid while it has not expired and its fingerprint still matches the
+    change versions it was computed from.
+    """
+    __tablename__ = "shared_cache"
+    
+    key = Column(String(200), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # Hash of the change versions used
+    value = Column(Text, nullable=False)  # JSON
+    expires_at = Column(DateTime, nullable=False)
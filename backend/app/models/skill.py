@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, PrimaryKeyConstraint
+from datetime import datetime
+import uuid
+from ..database import Base
+
+class Skill(Base):
+    """
+    Skill tag. `slug` is the normalized name (lowercase, single spaces) that
+    members' skills are matched on; `name` keeps the first spelling used.
+    """
+    __tablename__ = "skills"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    slug = Column(String(50), unique=True, nullable=False)
+    name = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class UserSkill(Base):
+    """
+    Member <-> skill mapping. The (skill_id, user_id) primary key is the inverted
+    index (members per skill); idx_user_skills_user serves a member's own skills.
+    """
+    __tablename__ = "user_skills"
+    
+    skill_id = Column(String, ForeignKey("skills.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint('skill_id', 'user_id'),
+        Index('idx_user_skills_user', 'user_id'),
+    )
@@ -28,7 +28,7 @@ class User(Base):
     branch = Column(String(100), nullable=True)
     year = Column(String(20), nullable=True)
     bio = Column(Text, nullable=True)
-    skills = Column(Text, nullable=True)  # Stored as comma-separated values
+    skills = Column(Text, nullable=True)  # Comma-separated display copy; tags live in user_skills
     
     # Alias for name (backwards compatibility)
     @property
@@ -1,18 +1,26 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from pydantic import BaseModel
-from typing import List, Optional
+from sqlalchemy import func, and_, case
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
+import json
 from datetime import datetime
-from ..database import get_db
+from ..database import get_db, SessionLocal
 from ..models.user import User, UserRole
 from ..models.event import Event
-from ..models.attendance import AttendanceRecord
+from ..models.attendance import AttendanceRecord, EventAttendanceSummary
 from ..models.approval import ApprovalRequest, ApprovalStatus
 from ..middleware.auth_middleware import require_admin
 from ..services.audit_service import AuditService
 from ..services.notification_service import NotificationService
+from ..services.attendance_summary import AttendanceSummaryService
+from ..services.change_versions import ChangeVersionService
+from ..services.shared_cache import SharedCache
+from ..services.member_search import MemberSearchService
+from ..services.skills import SkillService
+from ..config import get_settings
 from ..utils import utc_now
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -22,6 +30,20 @@ class ApprovalDecisionRequest(BaseModel):
     approved_role: Optional[str] = 'student'  # 'student' or 'admin'
     rejection_reason: Optional[str] = None
 
+MAX_BULK_IDS = 500
+
+class BulkApprovalDecisionRequest(BaseModel):
+    request_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+    decision: str  # 'approved' or 'rejected', applied to every request
+    approved_role: Optional[str] = 'student'
+    rejection_reason: Optional[str] = None
+
+class BulkMemberRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+
+class BulkMemberStatusRequest(BulkMemberRequest):
+    is_active: Optional[bool] = None  # None flips each member, like toggle-member
+
 @router.get("/approval-requests")
 def get_approval_requests(
     status_filter: str = 'pending',
@@ -101,6 +123,7 @@ def decide_approval(
     if approval_req.is_expired:
         approval_req.status = ApprovalStatus.TIMEOUT.value
         approval_req.decided_at = utc_now()
+        ChangeVersionService.bump(db, "approvals")
         db.commit()
         raise HTTPException(
             status_code=410,
@@ -128,8 +151,11 @@ def decide_approval(
         approval_req.approved_role = decision.approved_role  # Already lowercase
         
         # Activate user
+        was_eligible = AttendanceSummaryService.is_eligible(user)
         user.role = decision.approved_role  # Use string directly ('student' or 'admin')
         user.is_active = True
+        AttendanceSummaryService.eligibility_changed(db, was_eligible, AttendanceSummaryService.is_eligible(user))
+        ChangeVersionService.bump(db, "users", "approvals")
         
         db.commit()
         
@@ -164,7 +190,10 @@ def decide_approval(
         approval_req.rejection_reason = decision.rejection_reason
         
         # Optionally soft-delete user (keep for audit)
+        was_eligible = AttendanceSummaryService.is_eligible(user)
         user.is_active = False
+        AttendanceSummaryService.eligibility_changed(db, was_eligible, False)
+        ChangeVersionService.bump(db, "users", "approvals")
         
         db.commit()
         
@@ -197,35 +226,314 @@ def decide_approval(
             detail="decision must be 'approved' or 'rejected'"
         )
 
+@router.post("/approval-requests/bulk-decide")
+def bulk_decide_approvals(
+    body: BulkApprovalDecisionRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Approve or reject many signup requests in one transaction.
+    
+    Each request follows the rules of /decide, but one that cannot be decided
+    (unknown, already decided, timed out) is reported in `results` instead of failing
+    the batch. Status changes are set-based UPDATEs; notifications and audit rows are
+    inserted in bulk.
+    """
+    if body.decision not in ('approved', 'rejected'):
+        raise HTTPException(
+            status_code=400,
+            detail="decision must be 'approved' or 'rejected'"
+        )
+    approving = body.decision == 'approved'
+    if approving and body.approved_role not in ['student', 'admin']:
+        raise HTTPException(
+            status_code=400,
+            detail="approved_role must be 'student' or 'admin'"
+        )
+    
+    request_ids = list(dict.fromkeys(body.request_ids))
+    approvals = {
+        a.id: a for a in db.query(ApprovalRequest).filter(ApprovalRequest.id.in_(request_ids)).all()
+    }
+    users = {
+        u.id: u for u in db.query(User).filter(
+            User.id.in_({a.user_id for a in approvals.values()})
+        ).all()
+    }
+    
+    results = {}
+    decided = []
+    timed_out = []
+    for request_id in request_ids:
+        approval_req = approvals.get(request_id)
+        if approval_req is None or approval_req.user_id not in users:
+            results[request_id] = {"id": request_id, "status": "not_found"}
+        elif approval_req.status != ApprovalStatus.PENDING.value:
+            results[request_id] = {
+                "id": request_id,
+                "status": "conflict",
+                "detail": f"Request already {approval_req.status}"
+            }
+        elif approval_req.is_expired:
+            timed_out.append(approval_req)
+            results[request_id] = {"id": request_id, "status": "timeout"}
+        else:
+            decided.append(approval_req)
+    
+    now = utc_now()
+    if timed_out:
+        db.query(ApprovalRequest).filter(
+            ApprovalRequest.id.in_([a.id for a in timed_out])
+        ).update(
+            {ApprovalRequest.status: ApprovalStatus.TIMEOUT.value, ApprovalRequest.decided_at: now},
+            synchronize_session=False
+        )
+    
+    user_ids = list(dict.fromkeys(a.user_id for a in decided))
+    if decided:
+        approval_values = {
+            ApprovalRequest.status: body.decision,
+            ApprovalRequest.decided_at: now,
+            ApprovalRequest.decided_by: current_user.id
+        }
+        if approving:
+            approval_values[ApprovalRequest.approved_role] = body.approved_role
+            user_values = {User.role: body.approved_role, User.is_active: True}
+        else:
+            approval_values[ApprovalRequest.rejection_reason] = body.rejection_reason
+            user_values = {User.is_active: False}
+        
+        db.query(ApprovalRequest).filter(
+            ApprovalRequest.id.in_([a.id for a in decided])
+        ).update(approval_values, synchronize_session=False)
+        db.query(User).filter(User.id.in_(user_ids)).update(user_values, synchronize_session=False)
+        
+        was_eligible = sum(AttendanceSummaryService.is_eligible(users[uid]) for uid in user_ids)
+        is_eligible = len(user_ids) if approving and body.approved_role == UserRole.STUDENT.value else 0
+        AttendanceSummaryService.eligibility_delta(db, is_eligible - was_eligible)
+        
+        NotificationService.notify_users_approval_decisions(
+            db, user_ids, body.decision,
+            body.approved_role if approving else None,
+            None if approving else body.rejection_reason
+        )
+    
+    # Read ids before commit expires the loaded objects
+    audit_entries = [
+        (a.id, {
+            'target_user_id': a.user_id,
+            'decision': body.decision,
+            'approved_role': body.approved_role if approving else None
+        })
+        for a in decided
+    ]
+    for approval_req in decided:
+        result = {
+            "id": approval_req.id,
+            "user_id": approval_req.user_id,
+            "status": body.decision,
+            "decided_at": now.isoformat()
+        }
+        if approving:
+            result["approved_role"] = body.approved_role
+        else:
+            result["rejection_reason"] = body.rejection_reason
+        results[approval_req.id] = result
+    
+    if decided or timed_out:
+        ChangeVersionService.bump(db, *(["users", "approvals"] if decided else ["approvals"]))
+        db.commit()
+    
+    AuditService.log_many(db, current_user.id, 'approval_decision', 'approval', audit_entries, request)
+    
+    return {
+        "results": [results[request_id] for request_id in request_ids],
+        "decided": len(decided),
+        "message": f"{len(decided)} of {len(request_ids)} requests {body.decision}"
+    }
+
+def _members_query(db: Session, include_inactive: bool, sort: str, order: str):
+    """
+    One LEFT JOIN ... GROUP BY over students and their attendance at live events.
+    The event total is a scalar subquery evaluated once; the rate is computed (and
+    sorted on) in SQL; total_members is a window count for pagination.
+    """
+    total_events = db.query(func.count(Event.id)).filter(Event.is_deleted == False).scalar_subquery()
+    attended = func.count(Event.id)
+    rate = case((total_events > 0, attended * 100.0 / total_events), else_=0.0)
+    
+    query = db.query(
+        User.id,
+        User.email,
+        User.full_name,
+        User.is_active,
+        User.created_at,
+        attended.label("attended"),
+        total_events.label("total_events"),
+        rate.label("attendance_rate"),
+        func.count().over().label("total_members")
+    ).outerjoin(
+        AttendanceRecord, AttendanceRecord.user_id == User.id
+    ).outerjoin(
+        Event, and_(Event.id == AttendanceRecord.event_id, Event.is_deleted == False)
+    ).filter(User.role == UserRole.STUDENT.value)
+    
+    if not include_inactive:
+        query = query.filter(User.is_active == True)
+    
+    query = query.group_by(User.id, User.email, User.full_name, User.is_active, User.created_at)
+    
+    sort_column = {
+        "name": User.full_name,
+        "email": User.email,
+        "attended": attended,
+        "rate": rate,
+        "joined": User.created_at
+    }[sort]
+    sort_column = sort_column.desc() if order == "desc" else sort_column.asc()
+    return query.order_by(sort_column, User.full_name, User.id)
+
+def _member_row(row) -> dict:
+    return {
+        "id": row.id,
+        "email": row.email,
+        "full_name": row.full_name,
+        "is_active": row.is_active,
+        "attended": row.attended,
+        "total_events": row.total_events,
+        "attendance_rate": round(float(row.attendance_rate), 1)
+    }
+
 @router.get("/members")
 def get_all_members(
+    response: Response,
+    include_inactive: bool = False,
+    sort: Literal["name", "email", "attended", "rate", "joined"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    page: int = Query(1, ge=1),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    stream: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Get list of all active members with attendance statistics."""
-    members = db.query(User).filter(
-        User.role == UserRole.STUDENT,
-        User.is_active == True
-    ).all()
+    """
+    Get members with attendance statistics in a single query.
     
-    result = []
-    for member in members:
-        total_events = db.query(Event).filter(Event.is_deleted == False).count()
-        attended = db.query(AttendanceRecord).filter(
-            AttendanceRecord.user_id == member.id
-        ).count()
+    Sorting (including by attendance rate) happens in SQL. With `limit` the roster is
+    paginated by `page` and the total is returned in X-Total-Count. `stream=true`
+    serializes the JSON array row by row from a server-side cursor, for large rosters.
+    """
+    query = _members_query(db, include_inactive, sort, order)
+    if limit is not None:
+        query = query.offset((page - 1) * limit).limit(limit)
+    
+    if stream:
+        statement = query.statement
         
-        result.append({
-            "id": member.id,
-            "email": member.email,
-            "full_name": member.full_name,
-            "is_active": member.is_active,
-            "attended": attended,
-            "total_events": total_events,
-            "attendance_rate": round((attended / total_events * 100) if total_events > 0 else 0, 1)
-        })
+        def generate():
+            # Own session: the request-scoped one is closed before the body is sent
+            stream_db = SessionLocal()
+            try:
+                result = stream_db.execute(statement, execution_options={"stream_results": True, "yield_per": 500})
+                yield "["
+                first = True
+                for row in result:
+                    yield ("" if first else ",") + json.dumps(_member_row(row))
+                    first = False
+                yield "]"
+            finally:
+                stream_db.close()
+        
+        return StreamingResponse(generate(), media_type="application/json")
     
-    return result
+    rows = query.all()
+    response.headers["X-Total-Count"] = str(rows[0].total_members if rows else 0)
+    return [_member_row(row) for row in rows]
+
+@router.get("/members/search")
+def search_members(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    include_inactive: bool = True,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Ranked search over member name, email, branch, section and skills.
+    
+    Prefix matches on name / email rank first, then word prefixes, substrings and
+    fuzzy (trigram) matches. Returns one page of /members rows plus a score; the
+    total number of matches is in X-Total-Count.
+    """
+    matches, total = MemberSearchService.search(db, q, include_inactive, (page - 1) * limit, limit)
+    response.headers["X-Total-Count"] = str(total)
+    if not matches:
+        return []
+    
+    rows = {
+        row.id: row
+        for row in _members_query(db, True, "name", "asc").filter(
+            User.id.in_([user_id for user_id, _ in matches])
+        ).all()
+    }
+    return [
+        {**_member_row(rows[user_id]), "score": round(score, 3)}
+        for user_id, score in matches
+        if user_id in rows
+    ]
+
+@router.get("/skills")
+def get_skills(
+    prefix: Optional[str] = Query(None, max_length=50),
+    include_inactive: bool = True,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Skill directory: skills with their member counts, most common first (filter by name prefix)."""
+    return SkillService.directory(db, prefix, include_inactive, limit)
+
+@router.get("/members/skills")
+def find_members_by_skills(
+    skill: List[str] = Query(..., min_length=1, max_length=10),
+    include_inactive: bool = True,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    facets: int = Query(20, ge=0, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Members having every requested skill (?skill=pytorch&skill=pandas).
+    
+    Returns one page of /members rows by name, the total number of matches, and
+    `facets`: the other skills of the matching members with member counts, for
+    narrowing the search further. Unknown skills are listed in `unknown` (and
+    match nobody).
+    """
+    result = SkillService.find_members(db, skill, include_inactive, (page - 1) * limit, limit, facets)
+    
+    members = []
+    if result["user_ids"]:
+        rows = {
+            row.id: row
+            for row in _members_query(db, True, "name", "asc").filter(
+                User.id.in_(result["user_ids"])
+            ).all()
+        }
+        members = [_member_row(rows[user_id]) for user_id in result["user_ids"] if user_id in rows]
+    
+    return {
+        "skills": result["skills"],
+        "unknown": result["unknown"],
+        "total": result["total"],
+        "members": members,
+        "facets": result["facets"]
+    }
 
 @router.post("/toggle-member/{user_id}")
 def toggle_member_status(
@@ -238,7 +546,10 @@ def toggle_member_status(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    was_eligible = AttendanceSummaryService.is_eligible(user)
     user.is_active = not user.is_active
+    AttendanceSummaryService.eligibility_changed(db, was_eligible, AttendanceSummaryService.is_eligible(user))
+    ChangeVersionService.bump(db, "users")
     db.commit()
     
     return {
@@ -262,65 +573,164 @@ def remove_member(
         raise HTTPException(status_code=403, detail="Cannot remove admin users")
     
     # Soft delete
+    was_eligible = AttendanceSummaryService.is_eligible(user)
     user.is_active = False
+    AttendanceSummaryService.eligibility_changed(db, was_eligible, False)
+    ChangeVersionService.bump(db, "users")
     db.commit()
     
     return {"message": "Member removed successfully"}
 
-@router.get("/stats")
-def get_admin_stats(
+def _apply_member_status(db: Session, users: list[User], targets: dict[str, bool]):
+    """Set-based is_active updates (one UPDATE per target value) plus the summary delta."""
+    was_eligible = sum(AttendanceSummaryService.is_eligible(u) for u in users)
+    is_eligible = sum(u.role == UserRole.STUDENT.value and targets[u.id] for u in users)
+    
+    for value in (True, False):
+        ids = [u.id for u in users if targets[u.id] == value and bool(u.is_active) != value]
+        if ids:
+            db.query(User).filter(User.id.in_(ids)).update(
+                {User.is_active: value}, synchronize_session=False
+            )
+    
+    AttendanceSummaryService.eligibility_delta(db, is_eligible - was_eligible)
+
+@router.post("/toggle-members")
+def bulk_toggle_members(
+    body: BulkMemberStatusRequest,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Get dashboard statistics for admin."""
-    total_users = db.query(User).count()
-    students = db.query(User).filter(User.role == UserRole.STUDENT.value).count()
-    admins = db.query(User).filter(User.role == UserRole.ADMIN.value).count()
-    pending_approvals = db.query(ApprovalRequest).filter(
-        ApprovalRequest.status == ApprovalStatus.PENDING.value
-    ).count()
-    inactive_users = db.query(User).filter(User.is_active == False).count()
-    
-    total_events = db.query(Event).count()
-    upcoming_events = db.query(Event).filter(
-        Event.scheduled_at > utc_now(),
-        Event.is_deleted == False
-    ).count()
-    past_events = db.query(Event).filter(
-        Event.scheduled_at <= utc_now(),
-        Event.is_deleted == False
-    ).count()
-    
-    total_attendance = db.query(AttendanceRecord).count()
-    
-    # Calculate average attendance rate
-    events_with_attendance = db.query(
-        Event.id,
-        func.count(AttendanceRecord.id).label('count')
-    ).outerjoin(AttendanceRecord).filter(
-        Event.is_deleted == False
-    ).group_by(Event.id).all()
-    
-    if events_with_attendance and students > 0:
-        avg_rate = sum(count / students * 100 for _, count in events_with_attendance) / len(events_with_attendance)
-    else:
-        avg_rate = 0
+    """
+    Activate or deactivate many members in one transaction.
+    With `is_active` every member is set to it; without it each member is flipped.
+    """
+    user_ids = list(dict.fromkeys(body.user_ids))
+    users = db.query(User).filter(User.id.in_(user_ids)).all()
+    targets = {
+        u.id: (not u.is_active) if body.is_active is None else body.is_active
+        for u in users
+    }
+    
+    audit_entries = [(u.id, {'is_active': targets[u.id]}) for u in users]
+    if users:
+        _apply_member_status(db, users, targets)
+        ChangeVersionService.bump(db, "users")
+        db.commit()
+    
+    AuditService.log_many(db, current_user.id, 'member_status_changed', 'user', audit_entries, request)
+    
+    return {
+        "results": [
+            {"id": uid, "status": "ok", "is_active": targets[uid]} if uid in targets
+            else {"id": uid, "status": "not_found"}
+            for uid in user_ids
+        ],
+        "updated": len(targets)
+    }
+
+@router.post("/remove-members")
+def bulk_remove_members(
+    body: BulkMemberRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Soft delete many members in one transaction; admins are skipped."""
+    user_ids = list(dict.fromkeys(body.user_ids))
+    found = db.query(User).filter(User.id.in_(user_ids)).all()
+    roles = {u.id: u.role for u in found}
+    users = [u for u in found if u.role != UserRole.ADMIN.value]
+    audit_entries = [(u.id, None) for u in users]
+    
+    if users:
+        _apply_member_status(db, users, {u.id: False for u in users})
+        ChangeVersionService.bump(db, "users")
+        db.commit()
+    
+    AuditService.log_many(db, current_user.id, 'member_removed', 'user', audit_entries, request)
+    
+    def result(uid):
+        if uid not in roles:
+            return {"id": uid, "status": "not_found"}
+        if roles[uid] == UserRole.ADMIN.value:
+            return {"id": uid, "status": "forbidden", "detail": "Cannot remove admin users"}
+        return {"id": uid, "status": "removed"}
+    
+    return {
+        "results": [result(uid) for uid in user_ids],
+        "removed": len(users)
+    }
+
+def _compute_admin_stats(db: Session) -> dict:
+    """Dashboard statistics in two scans: users (+ pending approvals) and events (+ summaries)."""
+    is_student = User.role == UserRole.STUDENT.value
+    
+    users = db.query(
+        func.count(User.id).label("total"),
+        func.count(User.id).filter(is_student).label("students"),
+        func.count(User.id).filter(User.role == UserRole.ADMIN.value).label("admins"),
+        func.count(User.id).filter(User.is_active == False).label("inactive"),
+        db.query(func.count(ApprovalRequest.id)).filter(
+            ApprovalRequest.status == ApprovalStatus.PENDING.value
+        ).scalar_subquery().label("pending_approvals")
+    ).one()
+    
+    now = utc_now()
+    live = Event.is_deleted == False
+    # Rate per live event against the students eligible at event time; events without a
+    # summary row yet fall back to the current student count
+    eligible = func.coalesce(EventAttendanceSummary.eligible_count, users.students)
+    rate = case(
+        (eligible > 0, func.coalesce(EventAttendanceSummary.attended_count, 0) * 100.0 / eligible),
+        else_=0.0
+    )
+    
+    events = db.query(
+        func.count(Event.id).label("total"),
+        func.count(Event.id).filter(and_(live, Event.scheduled_at > now)).label("upcoming"),
+        func.count(Event.id).filter(and_(live, Event.scheduled_at <= now)).label("past"),
+        func.coalesce(func.sum(EventAttendanceSummary.attended_count), 0).label("total_attendance"),
+        func.avg(case((live, rate))).label("average_rate")
+    ).outerjoin(
+        EventAttendanceSummary, EventAttendanceSummary.event_id == Event.id
+    ).one()
     
     return {
         "users": {
-            "total": total_users,
-            "students": students,
-            "admins": admins,
-            "pending_approvals": pending_approvals,
-            "inactive": inactive_users
+            "total": users.total,
+            "students": users.students,
+            "admins": users.admins,
+            "pending_approvals": users.pending_approvals,
+            "inactive": users.inactive
         },
         "events": {
-            "total": total_events,
-            "upcoming": upcoming_events,
-            "past": past_events
+            "total": events.total,
+            "upcoming": events.upcoming,
+            "past": events.past
         },
         "attendance": {
-            "total_records": total_attendance,
-            "average_attendance_rate": round(avg_rate, 1)
+            "total_records": int(events.total_attendance),
+            "average_attendance_rate": round(float(events.average_rate or 0), 1)
         }
     }
+
+@router.get("/stats")
+def get_admin_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get dashboard statistics for admin.
+    
+    Cached for ADMIN_STATS_CACHE_SECONDS and shared by all workers; user, approval,
+    event and attendance writes invalidate it through their change versions.
+    """
+    return SharedCache.get_or_compute(
+        db,
+        "admin:stats",
+        ["users", "approvals", "events", "attendance"],
+        get_settings().ADMIN_STATS_CACHE_SECONDS,
+        lambda: _compute_admin_stats(db)
+    )
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal
+from ..database import get_db
+from ..models.user import User
+from ..middleware.auth_middleware import require_admin
+from ..services.analytics import AnalyticsService
+
+router = APIRouter(prefix="/api/admin/analytics", tags=["analytics"])
+
+
+def _envelope(matrix, **body) -> dict:
+    students, events = matrix.shape
+    return {
+        "as_of": matrix.as_of.isoformat(),
+        "students": students,
+        "events": events,
+        **body
+    }
+
+@router.get("/rates")
+def get_group_rates(
+    by: Literal['branch', 'year'] = 'branch',
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Attendance rate per branch or year of study (admin only).
+    Rate = check-ins / (student, past event) pairs the students were signed up for.
+    """
+    matrix, groups = AnalyticsService.metric(db, 'group_rates', by)
+    return _envelope(matrix, by=by, groups=groups)
+
+@router.get("/retention")
+def get_retention(
+    periods: int = Query(12, ge=1, le=60),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Retention curve (admin only): share of students attending at least one event
+    in month k after signing up, over the students that have reached month k.
+    """
+    matrix, curve = AnalyticsService.metric(db, 'retention', periods)
+    return _envelope(matrix, retention=curve)
+
+@router.get("/cohorts")
+def get_cohorts(
+    periods: int = Query(6, ge=1, le=60),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Retention per signup-month cohort (admin only)."""
+    matrix, cohorts = AnalyticsService.metric(db, 'cohorts', periods)
+    return _envelope(matrix, cohorts=cohorts)
+
+@router.get("/streaks")
+def get_streaks(
+    top: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Current and longest consecutive-event attendance streaks (admin only)."""
+    matrix, streaks = AnalyticsService.metric(db, 'streaks', top)
+    return _envelope(matrix, **streaks)
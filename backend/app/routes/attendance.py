@@ -6,13 +6,16 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 from ..database import get_db
-from ..models.attendance import QRSession, AttendanceRecord, UsedNonce
+from ..models.attendance import QRSession, AttendanceRecord, UsedNonce, EventAttendanceSummary
 from ..models.event import Event
-from ..models.user import User, UserRole
+from ..models.user import User
 from ..middleware.auth_middleware import get_current_user, require_admin, require_active_member
 from ..services.qr_service import QRService
 from ..services.audit_service import AuditService
 from ..services.notification_service import NotificationService
+from ..services.change_versions import ChangeVersionService, user_scope
+from ..services.attendance_summary import AttendanceSummaryService
+from ..services.achievements import AchievementService
 from ..utils import utc_now, ensure_utc
 
 router = APIRouter(prefix="/api/attendance", tags=["attendance"])
@@ -121,6 +124,10 @@ def get_active_session(
     Check if there's an active QR session for attendance.
     Returns the most recent non-expired, non-revoked session.
     """
+    return active_session_payload(db)
+
+def active_session_payload(db: Session) -> dict:
+    """Most recent non-expired, non-revoked QR session (shared with the member dashboard)."""
     session = db.query(QRSession).filter(
         QRSession.is_revoked == False,
         QRSession.expires_at > utc_now()
@@ -277,6 +284,13 @@ def mark_attendance(
         )
         db.add(used_nonce)
         
+        # Keep the per-event summary and the member's streak in step, then invalidate
+        # listings that show attendance
+        AttendanceSummaryService.record_check_in(db, event_id, attendance.marked_at)
+        event = db.query(Event).filter(Event.id == event_id).first()
+        badges_awarded = AchievementService.record_check_in(db, current_user.id, event, attendance.marked_at)
+        ChangeVersionService.bump(db, "attendance", user_scope("attendance", current_user.id))
+        
         # Commit transaction
         db.commit()
         db.refresh(attendance)
@@ -287,7 +301,6 @@ def mark_attendance(
         )
         
         # Step 11: Notify admins
-        event = db.query(Event).filter(Event.id == event_id).first()
         attendance_count = db.query(AttendanceRecord).filter(
             AttendanceRecord.event_id == event_id
         ).count()
@@ -304,6 +317,7 @@ def mark_attendance(
                 "scheduled_at": event.scheduled_at.isoformat()
             },
             "marked_at": attendance.marked_at.isoformat(),
+            "badges_awarded": AchievementService.describe(badges_awarded),
             "message": "Attendance marked successfully"
         }
         
@@ -381,10 +395,14 @@ def get_event_attendance(
             "ip_address": record.ip_address
         })
     
-    total_students = db.query(User).filter(
-        User.role == UserRole.STUDENT,
-        User.is_active == True
-    ).count()
+    # Eligible students at event time, from the maintained summary
+    summary = db.query(EventAttendanceSummary).filter(
+        EventAttendanceSummary.event_id == event_id
+    ).first()
+    if summary:
+        total_students = summary.eligible_count
+    else:
+        total_students = AttendanceSummaryService.active_student_count(db)
     
     return {
         "event": {
@@ -395,7 +413,9 @@ def get_event_attendance(
         "attendance": attendance_list,
         "total_attended": len(attendance_list),
         "total_students": total_students,
-        "attendance_rate": round((len(attendance_list) / total_students * 100) if total_students > 0 else 0, 2)
+        "attendance_rate": round((len(attendance_list) / total_students * 100) if total_students > 0 else 0, 2),
+        "first_check_in": summary.first_check_in.isoformat() if summary and summary.first_check_in else None,
+        "last_check_in": summary.last_check_in.isoformat() if summary and summary.last_check_in else None
     }
 
 @router.get("/stats")
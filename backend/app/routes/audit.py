@@ -0,0 +1,193 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, and_
+from datetime import datetime
+from typing import Optional, Literal
+import json
+from ..database import get_db, SessionLocal
+from ..models.user import User
+from ..models.audit_log import AuditLog, SecurityEventRollup
+from ..middleware.auth_middleware import require_admin
+from ..utils.pagination import encode_cursor, decode_cursor
+
+router = APIRouter(prefix="/api/admin/audit", tags=["audit"])
+
+@router.get("/security-events")
+def get_security_events(
+    user_id: Optional[str] = None,
+    reason: Optional[str] = None,
+    action: str = 'attendance_failed',
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Per-minute rollups of rejected security events (admin only).
+    Returns the most recent windows plus totals per reason and the noisiest users.
+
+    Each worker writes a minute's counts once the minute has closed, so the newest
+    windows appear up to one minute plus AUDIT_ROLLUP_FLUSH_SECONDS late.
+    """
+    filters = [SecurityEventRollup.action == action]
+    if user_id:
+        filters.append(SecurityEventRollup.user_id == user_id)
+    if reason:
+        filters.append(SecurityEventRollup.reason == reason)
+    if since:
+        filters.append(SecurityEventRollup.window_start >= since)
+    if until:
+        filters.append(SecurityEventRollup.window_start < until)
+
+    windows = db.query(SecurityEventRollup).filter(*filters).order_by(
+        SecurityEventRollup.window_start.desc()
+    ).limit(limit).all()
+
+    by_reason = db.query(
+        SecurityEventRollup.reason,
+        func.sum(SecurityEventRollup.count).label('attempts'),
+        func.count(func.distinct(SecurityEventRollup.user_id)).label('users')
+    ).filter(*filters).group_by(SecurityEventRollup.reason).all()
+
+    top_users = db.query(
+        SecurityEventRollup.user_id,
+        func.sum(SecurityEventRollup.count).label('attempts')
+    ).filter(*filters).group_by(SecurityEventRollup.user_id).order_by(
+        func.sum(SecurityEventRollup.count).desc()
+    ).limit(10).all()
+
+    return {
+        "windows": [
+            {
+                "user_id": w.user_id,
+                "reason": w.reason,
+                "window_start": w.window_start.isoformat(),
+                "count": w.count,
+                "first_seen": w.first_seen.isoformat(),
+                "last_seen": w.last_seen.isoformat(),
+                "ip_address": w.ip_address
+            }
+            for w in windows
+        ],
+        "by_reason": [
+            {"reason": r.reason, "attempts": int(r.attempts), "users": r.users}
+            for r in by_reason
+        ],
+        "top_users": [
+            {"user_id": u.user_id, "attempts": int(u.attempts)}
+            for u in top_users
+        ]
+    }
+
+
+def _meta_field(db: Session, key: str):
+    """meta_data->>'key' on PostgreSQL (matches the expression indexes), json_extract elsewhere."""
+    if db.bind.dialect.name == 'postgresql':
+        return AuditLog.meta_data.op('->>')(key)
+    return func.json_extract(AuditLog.meta_data, f'$.{key}')
+
+def _audit_to_dict(log: AuditLog) -> dict:
+    meta_data = log.meta_data
+    if isinstance(meta_data, str):
+        try:
+            meta_data = json.loads(meta_data)
+        except ValueError:
+            pass
+    return {
+        "id": log.id,
+        "user_id": log.user_id,
+        "action": log.action,
+        "resource_type": log.resource_type,
+        "resource_id": log.resource_id,
+        "metadata": meta_data,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        "created_at": log.created_at.isoformat()
+    }
+
+@router.get("/logs")
+def query_audit_logs(
+    action: Optional[str] = None,
+    user_id: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[str] = None,
+    event_id: Optional[str] = None,
+    qr_session_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    format: Literal['json', 'ndjson'] = 'json',
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Query audit logs (admin only), newest first.
+
+    Filters map onto the audit_logs indexes; since/until let PostgreSQL prune to the
+    matching monthly partitions. JSON responses are keyset-paginated via next_cursor.
+    format=ndjson streams every matching row (limit and cursor are ignored) for
+    forensic exports.
+
+    Audit rows are written in batches by each worker's buffer, so the newest rows
+    appear up to AUDIT_FLUSH_INTERVAL_SECONDS after the action.
+    """
+    filters = []
+    if action:
+        filters.append(AuditLog.action == action)
+    if user_id:
+        filters.append(AuditLog.user_id == user_id)
+    if resource_type:
+        filters.append(AuditLog.resource_type == resource_type)
+    if resource_id:
+        filters.append(AuditLog.resource_id == resource_id)
+    if event_id:
+        filters.append(_meta_field(db, 'event_id') == event_id)
+    if qr_session_id:
+        filters.append(_meta_field(db, 'qr_session_id') == qr_session_id)
+    if since:
+        filters.append(AuditLog.created_at >= since)
+    if until:
+        filters.append(AuditLog.created_at < until)
+
+    order = (AuditLog.created_at.desc(), AuditLog.id.desc())
+
+    if format == 'ndjson':
+        def stream():
+            # Own session: the request-scoped one is closed before the body is sent
+            stream_db = SessionLocal()
+            try:
+                rows = stream_db.query(AuditLog).filter(*filters).order_by(*order).yield_per(1000)
+                for log in rows:
+                    yield json.dumps(_audit_to_dict(log)) + "\n"
+            finally:
+                stream_db.close()
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    if cursor:
+        try:
+            after_created, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        filters.append(or_(
+            AuditLog.created_at < after_created,
+            and_(AuditLog.created_at == after_created, AuditLog.id < after_id)
+        ))
+
+    logs = db.query(AuditLog).filter(*filters).order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1].created_at, logs[-1].id)
+
+    return {
+        "logs": [_audit_to_dict(log) for log in logs],
+        "next_cursor": next_cursor
+    }
@@ -18,6 +18,7 @@ from ..utils.security import (
 from ..utils import utc_now
 from ..middleware.auth_middleware import get_current_user
 from ..services.audit_service import AuditService
+from ..services.change_versions import ChangeVersionService
 from ..services.notification_service import NotificationService
 from ..config import get_settings
 
@@ -77,6 +78,7 @@ def signup(request: SignupRequest, req: Request, db: Session = Depends(get_db)):
         expires_at=utc_now() + timedelta(minutes=settings.APPROVAL_TIMEOUT_MINUTES)
     )
     db.add(approval_request)
+    ChangeVersionService.bump(db, "users", "approvals")
     db.commit()
     
     # Log signup
@@ -122,6 +124,7 @@ def login(
                 # Mark as timed out
                 pending_approval.status = ApprovalStatus.TIMEOUT.value
                 pending_approval.decided_at = utc_now()
+                ChangeVersionService.bump(db, "approvals")
                 db.commit()
                 raise HTTPException(
                     status_code=403,
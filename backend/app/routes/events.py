@@ -1,19 +1,33 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 from ..database import get_db
 from ..models.event import Event
-from ..models.attendance import AttendanceRecord
+from ..models.attendance import AttendanceRecord, EventAttendanceSummary
 from ..models.user import User, UserRole
 from ..middleware.auth_middleware import get_current_user, require_admin
 from ..services.audit_service import AuditService
+from ..services.change_versions import ChangeVersionService, user_scope
+from ..services.event_service import EventService
+from ..services.attendance_summary import AttendanceSummaryService
+from ..utils.conditional import etag_matches, not_modified, set_etag
 from ..utils import utc_now
+from ..utils.pagination import decode_cursor
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+def parse_event_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 class EventCreate(BaseModel):
     title: str
     description: Optional[str] = None
@@ -44,6 +58,9 @@ def create_event(
         is_deleted=False
     )
     db.add(new_event)
+    db.flush()
+    AttendanceSummaryService.init_event(db, new_event.id)
+    ChangeVersionService.bump(db, "events")
     db.commit()
     db.refresh(new_event)
     
@@ -64,21 +81,66 @@ def create_event(
 
 @router.get("/")
 def get_events(
+    request: Request,
+    response: Response,
     include_deleted: bool = False,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all events. Students see own attendance status, admins see attendance counts."""
-    query = db.query(Event)
+    """
+    Get events, newest first. Students see own attendance status, admins see attendance counts.
+    
+    Optional `from` (inclusive) and `to` (exclusive) bound scheduled_at, e.g. the visible
+    calendar month. With `limit`, results are keyset-paginated: pass `next_cursor` back
+    as `cursor` for the next page. Without it every matching event is returned.
+    
+    Attendance info is LEFT JOINed onto the event list, so this is a single query
+    regardless of the number of events. Supports If-None-Match: an unchanged list
+    is answered with 304 before any list query runs.
+    """
+    is_admin = current_user.role == UserRole.ADMIN.value
+    after = parse_event_cursor(cursor)
+    window = (start, end, limit, cursor)
+    
+    if is_admin:
+        etag = ChangeVersionService.etag(
+            db, "events:list", ["events", "attendance"], "admin", include_deleted, *window
+        )
+    else:
+        etag = ChangeVersionService.etag(
+            db, "events:list", ["events", user_scope("attendance", current_user.id)], current_user.id, *window
+        )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    if is_admin:
+        # Attendance counts from the maintained per-event summary
+        query = db.query(Event, func.coalesce(EventAttendanceSummary.attended_count, 0)).outerjoin(
+            EventAttendanceSummary, EventAttendanceSummary.event_id == Event.id
+        )
+    else:
+        # Events the current user attended
+        attendance = db.query(
+            AttendanceRecord.event_id.label("event_id")
+        ).filter(AttendanceRecord.user_id == current_user.id).distinct().subquery()
+        query = db.query(Event, attendance.c.event_id).outerjoin(
+            attendance, attendance.c.event_id == Event.id
+        )
     
     # Only admins can see deleted events
-    if not include_deleted or current_user.role != UserRole.ADMIN.value:
+    if not include_deleted or not is_admin:
         query = query.filter(Event.is_deleted == False)
     
-    events = query.order_by(Event.scheduled_at.desc()).all()
+    query = EventService.filter_window(query, start, end, after)
+    rows, next_cursor = EventService.fetch_page(query, limit)
     
     result = []
-    for event in events:
+    for event, attendance_info in rows:
         event_data = {
             "id": event.id,
             "title": event.title,
@@ -90,24 +152,14 @@ def get_events(
         }
         
         # Add attendance info based on role
-        if current_user.role == UserRole.STUDENT.value:
-            # Check if user attended this event
-            attendance = db.query(AttendanceRecord).filter(
-                AttendanceRecord.user_id == current_user.id,
-                AttendanceRecord.event_id == event.id
-            ).first()
-            event_data["user_attended"] = attendance is not None
-            
-        elif current_user.role == UserRole.ADMIN.value:
-            # Show attendance count for admins
-            attendance_count = db.query(AttendanceRecord).filter(
-                AttendanceRecord.event_id == event.id
-            ).count()
-            event_data["attendance_count"] = attendance_count
+        if is_admin:
+            event_data["attendance_count"] = attendance_info
+        else:
+            event_data["user_attended"] = attendance_info is not None
         
         result.append(event_data)
     
-    return {"events": result}
+    return {"events": result, "next_cursor": next_cursor}
 
 @router.get("/{event_id}")
 def get_event(
@@ -157,9 +209,13 @@ def update_event(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    for key, value in event_update.dict(exclude_unset=True).items():
+    changes = event_update.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(event, key, value)
     
+    if changes.get("scheduled_at") is not None:
+        AttendanceSummaryService.event_rescheduled(db, event)
+    ChangeVersionService.bump(db, "events")
     db.commit()
     db.refresh(event)
     return {
@@ -192,6 +248,7 @@ def delete_event(
     # Soft delete
     event.is_deleted = True
     event.deleted_at = utc_now()
+    ChangeVersionService.bump(db, "events")
     db.commit()
     
     # Log audit event
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional, Literal
+from ..database import SessionLocal
+from ..models.user import User
+from ..middleware.auth_middleware import require_admin
+from ..services.exports import ExportService, ARROW_MEDIA_TYPE
+from ..config import get_settings
+from ..utils import utc_now
+
+router = APIRouter(prefix="/api/admin/export", tags=["export"])
+
+
+def _stream(export, fmt: str, filename: str, *args, **kwargs) -> StreamingResponse:
+    def generate():
+        # Own session: the request-scoped one is closed before the body is sent
+        stream_db = SessionLocal()
+        try:
+            yield from export(stream_db, fmt, get_settings().EXPORT_CHUNK_ROWS, *args, **kwargs)
+        finally:
+            stream_db.close()
+
+    extension = "arrows" if fmt == "arrow" else "csv"
+    stamp = utc_now().strftime("%Y%m%d-%H%M%S")
+    return StreamingResponse(
+        generate(),
+        media_type=ARROW_MEDIA_TYPE if fmt == "arrow" else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}-{stamp}.{extension}"'}
+    )
+
+@router.get("/attendance")
+def export_attendance_records(
+    format: Literal['csv', 'arrow'] = 'csv',
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    event_id: Optional[str] = None,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream attendance records with event and member details (admin only).
+
+    format=arrow returns an Arrow IPC stream (pyarrow.ipc.open_stream /
+    pandas via .read_pandas()); records are read and encoded in chunks of
+    EXPORT_CHUNK_ROWS from a server-side cursor.
+    """
+    return _stream(ExportService.attendance_records, format, "attendance", since, until, event_id)
+
+@router.get("/matrix")
+def export_attendance_matrix(
+    format: Literal['csv', 'arrow'] = 'csv',
+    include_inactive: bool = True,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream the members × events attendance matrix (admin only).
+    One row per student, one boolean column per event id, oldest event first.
+    """
+    return _stream(ExportService.attendance_matrix, format, "attendance-matrix", include_inactive)
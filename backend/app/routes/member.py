@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -8,8 +9,19 @@ from ..database import get_db
 from ..models.user import User
 from ..models.event import Event
 from ..models.attendance import AttendanceRecord
+from ..models.notification import NotificationCounter
 from ..middleware.auth_middleware import get_current_user, require_active_member
+from ..services.change_versions import ChangeVersionService, user_scope
+from ..services.shared_cache import SharedCache
+from ..services.notification_service import NotificationService
+from ..services.event_service import EventService
+from ..services.achievements import AchievementService
+from ..services.skills import SkillService, split_skills
+from .events import parse_event_cursor
+from .attendance import active_session_payload
+from ..config import get_settings
 from ..utils import utc_now
+from ..utils.conditional import etag_matches, not_modified, set_etag
 
 router = APIRouter(prefix="/api/member", tags=["member"])
 
@@ -70,14 +82,6 @@ def get_profile(
     db: Session = Depends(get_db)
 ):
     """Get the current member's profile"""
-    # Convert skills from comma-separated string to list if needed
-    skills = []
-    if hasattr(current_user, 'skills') and current_user.skills:
-        if isinstance(current_user.skills, str):
-            skills = [s.strip() for s in current_user.skills.split(',') if s.strip()]
-        else:
-            skills = current_user.skills
-
     return ProfileResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -86,7 +90,7 @@ def get_profile(
         branch=getattr(current_user, 'branch', None),
         year=getattr(current_user, 'year', None),
         bio=getattr(current_user, 'bio', None),
-        skills=skills,
+        skills=split_skills(current_user.skills),
         created_at=getattr(current_user, 'created_at', None)
     )
 
@@ -121,21 +125,24 @@ def update_profile(
             current_user.bio = profile_data.bio
     
     if profile_data.skills is not None:
-        if hasattr(current_user, 'skills'):
-            # Store as comma-separated string
-            current_user.skills = ','.join(profile_data.skills)
+        # Normalized tags for skill discovery, plus the comma-separated display copy
+        try:
+            SkillService.set_user_skills(db, current_user, profile_data.skills)
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if any(value is not None for value in (
+        profile_data.full_name, profile_data.section, profile_data.branch,
+        profile_data.year, profile_data.skills
+    )):
+        # Names are shown in resource listings; these fields also feed member search
+        # and the analytics groups
+        ChangeVersionService.bump(db, "users")
     
     db.commit()
     db.refresh(current_user)
     
-    # Convert skills for response
-    skills = []
-    if hasattr(current_user, 'skills') and current_user.skills:
-        if isinstance(current_user.skills, str):
-            skills = [s.strip() for s in current_user.skills.split(',') if s.strip()]
-        else:
-            skills = current_user.skills
-
     return ProfileResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -144,78 +151,205 @@ def update_profile(
         branch=getattr(current_user, 'branch', None),
         year=getattr(current_user, 'year', None),
         bio=getattr(current_user, 'bio', None),
-        skills=skills,
+        skills=split_skills(current_user.skills),
         created_at=getattr(current_user, 'created_at', None)
     )
 
 
 @router.get("/events", response_model=List[EventItem])
 def get_member_events(
+    request: Request,
+    response: Response,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
     current_user: User = Depends(require_active_member),
     db: Session = Depends(get_db)
 ):
-    """Get all events for the current member"""
-    events = db.query(Event).filter(Event.is_deleted == False).order_by(Event.scheduled_at.desc()).all()
-    
-    return [
-        EventItem(
-            id=str(event.id),
-            title=event.title,
-            description=event.description,
-            date=str(event.scheduled_at) if event.scheduled_at else '',
-            time=None,
-            location=getattr(event, 'location', None),
-            event_type=getattr(event, 'event_type', 'Other')
-        )
-        for event in events
-    ]
+    """
+    Get events for the current member, newest first (supports If-None-Match).
+    
+    `from`/`to` bound scheduled_at (e.g. the visible calendar month). With `limit`
+    the list is keyset-paginated; the next page's cursor is sent in X-Next-Cursor.
+    """
+    after = parse_event_cursor(cursor)
+    etag = ChangeVersionService.etag(db, "member:events", ["events"], start, end, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    query = EventService.filter_window(db.query(Event).filter(Event.is_deleted == False), start, end, after)
+    events, next_cursor = EventService.fetch_page(query, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return [_event_item(event) for event in events]
+
+
+def _event_item(event: Event) -> EventItem:
+    return EventItem(
+        id=str(event.id),
+        title=event.title,
+        description=event.description,
+        date=str(event.scheduled_at) if event.scheduled_at else '',
+        time=None,
+        location=getattr(event, 'location', None),
+        event_type=getattr(event, 'event_type', 'Other')
+    )
+
+
+def _attendance_history_page(db: Session, user_id: str, after, limit: Optional[int]) -> dict:
+    """
+    One query: the user's records joined to their events (present) plus past live
+    events without a record for the user (absent, via the outer join's anti-join),
+    ordered newest first and keyset-paginated like the event listings.
+    """
+    query = db.query(
+        Event,
+        AttendanceRecord.id.label("record_id"),
+        AttendanceRecord.marked_at.label("marked_at")
+    ).outerjoin(
+        AttendanceRecord,
+        and_(AttendanceRecord.event_id == Event.id, AttendanceRecord.user_id == user_id)
+    ).filter(or_(
+        AttendanceRecord.id.isnot(None),
+        and_(Event.is_deleted == False, Event.scheduled_at < utc_now())
+    ))
+    rows, next_cursor = EventService.fetch_page(EventService.filter_window(query, after=after), limit)
+    
+    return {
+        "items": [
+            AttendanceHistoryItem(
+                id=row.record_id or "",  # No record ID for absent
+                event_id=row.Event.id,
+                event_title=row.Event.title,
+                event_date=str(row.Event.scheduled_at) if row.Event.scheduled_at else '',
+                event_type=getattr(row.Event, 'event_type', 'Other'),
+                check_in_time=str(row.marked_at) if row.marked_at else None,
+                status='present' if row.record_id else 'absent'
+            ).model_dump()
+            for row in rows
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+def _cached_history_first_page(db: Session, user_id: str, limit: Optional[int]) -> dict:
+    return SharedCache.get_or_compute(
+        db,
+        f"member:history:{user_id}:{limit}",
+        [user_scope("attendance", user_id), "events"],
+        get_settings().MEMBER_HISTORY_CACHE_SECONDS,
+        lambda: _attendance_history_page(db, user_id, None, limit)
+    )
 
 
 @router.get("/attendance-history", response_model=List[AttendanceHistoryItem])
 def get_attendance_history(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(require_active_member),
+    db: Session = Depends(get_db)
+):
+    """
+    Get attendance history for the current member, newest event first.
+    
+    With `limit` the list is keyset-paginated; the next page's cursor is sent in
+    X-Next-Cursor. The first page is cached per user until their next check-in or
+    an event change (and at most MEMBER_HISTORY_CACHE_SECONDS, as events move
+    into the past).
+    """
+    after = parse_event_cursor(cursor)
+    if cursor is None:
+        page = _cached_history_first_page(db, current_user.id, limit)
+    else:
+        page = _attendance_history_page(db, current_user.id, after, limit)
+    
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+
+@router.get("/dashboard")
+def get_dashboard(
+    limit: int = Query(5, ge=1, le=20),
+    current_user: User = Depends(require_active_member),
+    db: Session = Depends(get_db)
+):
+    """
+    Everything the member dashboard shows, in one round trip: attendance stats,
+    the active QR session, upcoming events, recent attendance and the unread
+    notification count.
+    
+    One principal and one session for the whole response. The independent counts
+    are scalar subqueries of a single SELECT, so the database evaluates them in one
+    statement; recent attendance comes from the per-member history cache.
+    """
+    now = utc_now()
+    counts = db.query(
+        db.query(func.count(Event.id)).filter(Event.is_deleted == False).scalar_subquery().label("total_events"),
+        db.query(func.count(AttendanceRecord.id)).filter(
+            AttendanceRecord.user_id == current_user.id
+        ).scalar_subquery().label("attended"),
+        db.query(NotificationCounter.unread_count).filter(
+            NotificationCounter.user_id == current_user.id
+        ).scalar_subquery().label("unread")
+    ).one()
+    
+    unread = counts.unread
+    if unread is None:
+        # No counter row yet
+        unread = NotificationService.get_unread_count(db, current_user.id)
+    
+    upcoming = db.query(Event).filter(
+        Event.is_deleted == False,
+        Event.scheduled_at >= now
+    ).order_by(Event.scheduled_at, Event.id).limit(limit).all()
+    
+    total_events, attended = counts.total_events, counts.attended
+    return {
+        "stats": {
+            "total_events": total_events,
+            "attended": attended,
+            "attendance_rate": round((attended / total_events * 100) if total_events > 0 else 0, 1)
+        },
+        "active_session": active_session_payload(db),
+        "upcoming_events": [_event_item(event).model_dump() for event in upcoming],
+        "recent_attendance": _cached_history_first_page(db, current_user.id, limit)["items"],
+        "unread_notifications": unread
+    }
+
+
+@router.get("/badges")
+def get_badges(
+    current_user: User = Depends(require_active_member),
+    db: Session = Depends(get_db)
+):
+    """
+    Every badge with whether the member has earned it and when.
+    Badges are awarded at check-in time, so this reads the member's award rows only.
+    """
+    badges = AchievementService.get_badges(db, current_user.id)
+    return {
+        "badges": badges,
+        "earned": sum(badge["earned"] for badge in badges)
+    }
+
+
+@router.get("/activity")
+def get_activity(
     current_user: User = Depends(require_active_member),
     db: Session = Depends(get_db)
 ):
-    """Get attendance history for the current member"""
-    # Get all attendance records for this user
-    records = db.query(AttendanceRecord).filter(
-        AttendanceRecord.user_id == current_user.id
-    ).all()
-    
-    # Get event details for each record
-    result = []
-    for record in records:
-        event = db.query(Event).filter(Event.id == record.event_id).first()
-        if event:
-            result.append(AttendanceHistoryItem(
-                id=record.id,
-                event_id=event.id,
-                event_title=event.title,
-                event_date=str(event.scheduled_at) if event.scheduled_at else '',
-                event_type=getattr(event, 'event_type', 'Other'),
-                check_in_time=str(record.marked_at) if record.marked_at else None,
-                status='present'
-            ))
-    
-    # Also get events where user was absent (no attendance record)
-    all_events = db.query(Event).filter(Event.is_deleted == False).all()
-    attended_event_ids = {r.event_id for r in records}
-    
-    for event in all_events:
-        if event.id not in attended_event_ids:
-            # Check if event has passed (basic check using scheduled_at)
-            if event.scheduled_at and event.scheduled_at < utc_now():
-                result.append(AttendanceHistoryItem(
-                    id="",  # No record ID for absent
-                    event_id=event.id,
-                    event_title=event.title,
-                    event_date=str(event.scheduled_at),
-                    event_type=getattr(event, 'event_type', 'Other'),
-                    check_in_time=None,
-                    status='absent'
-                ))
-    
-    # Sort by date descending
-    result.sort(key=lambda x: x.event_date, reverse=True)
-    
-    return result
+    """
+    The member's attendance totals and streaks (maintained at check-in time), plus
+    their most recently earned badges.
+    """
+    badges = [badge for badge in AchievementService.get_badges(db, current_user.id) if badge["earned"]]
+    badges.sort(key=lambda badge: badge["awarded_at"], reverse=True)
+    return {
+        **AchievementService.get_streaks(db, current_user.id),
+        "recent_badges": badges[:5]
+    }
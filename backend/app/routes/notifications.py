@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import List, Optional
+import json
+from ..database import get_db
+from ..models.user import User
+from ..middleware.auth_middleware import get_current_user
+from ..services.notification_service import NotificationService
+from ..utils.pagination import encode_cursor, decode_cursor
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+class MarkReadRequest(BaseModel):
+    ids: Optional[List[str]] = None  # Explicit notification ids
+    before: Optional[str] = None  # Cursor: mark everything at or older than this position
+    # If neither is given, every unread notification is marked
+
+def _parse_cursor(cursor: str):
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _serialize(notification):
+    data = notification.notification_data
+    if isinstance(data, str):
+        data = json.loads(data)
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "data": data,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at.isoformat(),
+        "read_at": notification.read_at.isoformat() if notification.read_at else None
+    }
+
+@router.get("/")
+def list_notifications(
+    unread_only: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List the current user's notifications, newest first.
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next page.
+    """
+    after = _parse_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to know whether another page exists
+    rows = NotificationService.get_user_notifications(
+        db, current_user.id, unread_only=unread_only, limit=limit + 1, after=after
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "notifications": [_serialize(n) for n in rows],
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+        "unread_count": NotificationService.get_unread_count(db, current_user.id)
+    }
+
+@router.get("/unread-count")
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Unread badge count (single primary key lookup, safe to poll)."""
+    return {"unread_count": NotificationService.get_unread_count(db, current_user.id)}
+
+@router.post("/mark-read")
+def mark_read(
+    body: MarkReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark many notifications as read in one statement (by ids, by cursor, or all)."""
+    before = _parse_cursor(body.before) if body.before else None
+
+    marked = NotificationService.mark_many_as_read(
+        db, current_user.id, notification_ids=body.ids, before=before
+    )
+
+    return {
+        "marked": marked,
+        "unread_count": NotificationService.get_unread_count(db, current_user.id)
+    }
+
+@router.post("/{notification_id}/read")
+def mark_one_read(
+    notification_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark a single notification as read."""
+    marked = NotificationService.mark_many_as_read(
+        db, current_user.id, notification_ids=[notification_id]
+    )
+
+    return {
+        "marked": marked,
+        "unread_count": NotificationService.get_unread_count(db, current_user.id)
+    }
@@ -1,59 +1,424 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+import anyio
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 import os
-import shutil
 from ..database import get_db
-from ..models.material import StudyMaterial
+from ..models.material import StudyMaterial, MaterialUpload
 from ..models.user import User
 from ..middleware.auth_middleware import get_current_user, require_admin
+from ..services.change_versions import ChangeVersionService
+from ..services.uploads import (
+    ChunkWriter, ReceivedFile, UploadBusy, UploadTooLarge, receive_chunk, receive_multipart,
+    discard_file, safe_file_name
+)
+from ..services.resumable_uploads import ResumableUploadService, upload_path
+from ..services.blob_store import BlobStore, UPLOAD_DIR, BLOB_DIR, blob_path, compressed_path
+from ..services.signed_urls import SignedURLService
+from ..services.downloads import (
+    FileSliceResponse, RangeNotSatisfiable, accepts_gzip, content_disposition,
+    is_compressible, media_type, parse_range
+)
+from ..config import get_settings
+from ..utils import ensure_utc
+from ..utils.conditional import etag_matches, not_modified, set_etag
 
 router = APIRouter(prefix="/api/resources", tags=["resources"])
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(BLOB_DIR, exist_ok=True)
+
+# A material's file never changes, so browsers may keep it (revalidated by ETag after a year)
+DOWNLOAD_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Signed URLs carry their own authorization: shared caches may store them until expiry
+SIGNED_CACHE_CONTROL = "public, max-age={max_age}, immutable"
 
 class MaterialCreate(BaseModel):
     title: str
     description: Optional[str] = None
     event_id: Optional[int] = None
 
+class MaterialFromBlob(BaseModel):
+    sha256: str = Field(..., min_length=64, max_length=64, pattern="^[0-9a-f]{64}$")
+    file_name: str = Field(..., min_length=1, max_length=255)
+    title: str = Field(..., min_length=1)
+    description: Optional[str] = None
+    event_id: Optional[str] = None
+
+class UploadCreate(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    title: str = Field(..., min_length=1)
+    size: int = Field(..., ge=0)
+    sha256: Optional[str] = Field(None, min_length=64, max_length=64, pattern="^[0-9a-f]{64}$")
+    description: Optional[str] = None
+    event_id: Optional[str] = None
+
+def _upload_item(upload: MaterialUpload) -> dict:
+    return {
+        "id": upload.id,
+        "file_name": upload.file_name,
+        "size": upload.size,
+        "offset": upload.received,
+        "max_chunk_bytes": get_settings().RESUMABLE_MAX_CHUNK_BYTES,
+        "expires_at": ensure_utc(upload.expires_at).isoformat()
+    }
+
+def _offset_conflict(offset: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Upload is at offset {offset}",
+        headers={"Upload-Offset": str(offset)}
+    )
+
+def _material_item(m: StudyMaterial, uploader_name: str) -> dict:
+    # Signed URLs resolve to blob_path(sha256): files not yet moved into the blob store
+    # (blobs-import) have no URL and are fetched via the authenticated /{id}/download
+    download_url = download_expires_at = None
+    if m.content_sha256 and m.file_path.startswith(BLOB_DIR + os.sep):
+        signed = SignedURLService.sign(m.content_sha256, m.file_name)
+        download_url, download_expires_at = signed["url"], signed["expires_at"].isoformat()
+    return {
+        "id": m.id,
+        "title": m.title,
+        "description": m.description,
+        "file_name": m.file_name,
+        "file_path": m.file_path,
+        "file_size": m.file_size,
+        "content_sha256": m.content_sha256,
+        "event_id": m.event_id,
+        "uploaded_by": m.uploaded_by,
+        "uploaded_by_name": uploader_name,
+        "uploaded_at": m.uploaded_at.isoformat() if m.uploaded_at else None,
+        "download_url": download_url,
+        "download_expires_at": download_expires_at
+    }
+
+def _store_material(db: Session, received: ReceivedFile, fields: dict, uploader: User) -> dict:
+    """Store the content (or reference the existing blob) and record the material (thread pool)."""
+    file_path, deduplicated = BlobStore.add(db, received)
+    
+    material = StudyMaterial(
+        title=fields["title"],
+        file_name=received.file_name,
+        file_path=file_path,
+        file_size=received.size,
+        content_sha256=received.sha256,
+        description=fields.get("description") or None,
+        event_id=fields.get("event_id") or None,
+        uploaded_by=uploader.id
+    )
+    db.add(material)
+    ChangeVersionService.bump(db, "resources")
+    db.commit()
+    db.refresh(material)
+    return {**_material_item(material, uploader.full_name), "deduplicated": deduplicated}
+
+def _download_response(request: Request, path: str, sha256: Optional[str], file_name: str,
+                       cache_control: str) -> Response:
+    """
+    A stored file with a strong ETag (its SHA-256), single-range support and the
+    gzip copy for clients that accept it (whole-file requests only).
+    """
+    settings = get_settings()
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+        "Content-Disposition": content_disposition(file_name)
+    }
+    etag = f'"{sha256}"' if sha256 else None
+    if sha256 and is_compressible(file_name):
+        headers["Vary"] = "Accept-Encoding"
+        if "range" not in request.headers and accepts_gzip(request) and os.path.exists(compressed_path(sha256)):
+            path, etag = compressed_path(sha256), f'"{sha256}-gzip"'
+            headers["Content-Encoding"] = "gzip"
+    
+    if etag:
+        headers["ETag"] = etag
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={
+                key: value for key, value in headers.items() if key in ("ETag", "Cache-Control", "Vary")
+            })
+    
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    if settings.DOWNLOAD_ACCEL_PREFIX:
+        # nginx sends the file (sendfile, Range) from its internal location
+        relative = os.path.relpath(path, UPLOAD_DIR).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = settings.DOWNLOAD_ACCEL_PREFIX.rstrip("/") + "/" + relative
+        return Response(headers=headers, media_type=media_type(file_name))
+    
+    range_header = request.headers.get("range")
+    # If-Range: resume only if the client's copy is this exact representation
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    return FileSliceResponse(
+        path, size, byte_range, headers=headers, media_type=media_type(file_name),
+        chunk_bytes=settings.DOWNLOAD_CHUNK_BYTES
+    )
+
 @router.post("/upload")
 async def upload_material(
-    file: UploadFile = File(...),
-    title: str = Form(...),
-    description: Optional[str] = Form(None),
-    event_id: Optional[str] = Form(None),
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    # Save file
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    """
+    Upload a study material (admin only): multipart form with `file`, `title` and
+    optional `description` / `event_id`.
+    
+    The body is streamed straight to a temp file in the blob store; disk writes and
+    the SHA-256 run in worker threads, so a large upload never stalls other requests
+    on the worker. Files over UPLOAD_MAX_BYTES are rejected (413) as soon as they
+    pass the limit. Complete files are stored once per content hash: a duplicate
+    only adds the material row (`deduplicated: true`). Text formats get a gzip copy
+    for downloads, written after the response is sent.
+    """
+    settings = get_settings()
+    # Auth is done; hand the pooled connection back while the body streams in
+    await run_in_threadpool(db.rollback)
+    
+    try:
+        fields, received = await receive_multipart(
+            request, BLOB_DIR, settings.UPLOAD_MAX_BYTES, settings.UPLOAD_CHUNK_BYTES
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if received is None or not fields.get("title"):
+        await run_in_threadpool(discard_file, received)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A file and a title are required")
+    
+    try:
+        material = await run_in_threadpool(_store_material, db, received, fields, current_user)
+    except BaseException:
+        await run_in_threadpool(discard_file, received)
+        raise
+    
+    if is_compressible(material["file_name"]):
+        background_tasks.add_task(BlobStore.precompress, material["content_sha256"])
+    return material
+
+@router.post("/from-blob")
+def create_material_from_blob(
+    body: MaterialFromBlob,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Add a material for content that is already stored, by SHA-256, without
+    uploading it again (admin only). 404 if the hash is unknown: upload the file.
+    """
+    blob = BlobStore.reference(db, body.sha256)
+    if blob is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="No stored file with this SHA-256")
     
-    # Create database entry
     material = StudyMaterial(
-        title=title,
-        file_name=file.filename,
-        file_path=file_path,
-        description=description,
-        event_id=event_id,
+        title=body.title,
+        file_name=safe_file_name(body.file_name),
+        file_path=blob_path(blob.sha256),
+        file_size=blob.size,
+        content_sha256=blob.sha256,
+        description=body.description,
+        event_id=body.event_id or None,
         uploaded_by=current_user.id
     )
     db.add(material)
+    ChangeVersionService.bump(db, "resources")
     db.commit()
     db.refresh(material)
+    if is_compressible(material.file_name):
+        background_tasks.add_task(BlobStore.precompress, material.content_sha256)
+    return {**_material_item(material, current_user.full_name), "deduplicated": True}
+
+@router.post("/uploads", status_code=status.HTTP_201_CREATED)
+def create_upload(
+    body: UploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Start a resumable upload (admin only). The file is preallocated at full size;
+    send it with PUT /uploads/{id}?offset=N chunks, then POST /uploads/{id}/finalize.
+    Pass `sha256` to have the whole file checked on finalize.
+    """
+    settings = get_settings()
+    if body.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.UPLOAD_MAX_BYTES} byte upload limit"
+        )
+    try:
+        upload = ResumableUploadService.create(
+            db, current_user.id, body.file_name, body.title, body.size,
+            description=body.description, event_id=body.event_id, expected_sha256=body.sha256
+        )
+    except OSError:
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail="Not enough disk space for this upload")
+    return _upload_item(upload)
+
+@router.get("/uploads/{upload_id}")
+def get_upload(
+    upload_id: str,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Current offset of a resumable upload: resume by sending the chunk that starts there."""
+    upload = ResumableUploadService.get(db, upload_id, current_user.id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    response.headers["Upload-Offset"] = str(upload.received)
+    response.headers["Cache-Control"] = "no-store"
+    return _upload_item(upload)
+
+@router.put("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    chunk_sha256: str = Header(..., alias="X-Chunk-SHA256", pattern="^[0-9a-fA-F]{64}$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Write the raw request body at `offset`, which must be the upload's current
+    offset (409 with `Upload-Offset` otherwise). `X-Chunk-SHA256` is the hex
+    SHA-256 of the body; on mismatch (422) the offset does not move. The body is
+    written straight into the preallocated file from worker threads.
+    """
+    settings = get_settings()
+    # Auth is done; hand the pooled connection back while the body streams in
+    await run_in_threadpool(db.rollback)
+    
+    try:
+        writer = await anyio.to_thread.run_sync(ChunkWriter, upload_path(upload_id), offset)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    except UploadBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
+    try:
+        # Checked while holding the file lock, so no other chunk can move the offset meanwhile
+        def current_state():
+            try:
+                upload = ResumableUploadService.get(db, upload_id, current_user.id)
+                return (upload.received, upload.size) if upload else None
+            finally:
+                db.rollback()
+        
+        state = await run_in_threadpool(current_state)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Upload not found or expired")
+        received, size = state
+        if offset != received:
+            raise _offset_conflict(received)
+        
+        try:
+            written, digest = await receive_chunk(
+                request, writer, min(size - offset, settings.RESUMABLE_MAX_CHUNK_BYTES), settings.UPLOAD_CHUNK_BYTES
+            )
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        if digest != chunk_sha256.lower():
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Chunk SHA-256 mismatch; resend the chunk",
+                headers={"Upload-Offset": str(offset)}
+            )
+        
+        # Durable before the offset moves past it
+        await anyio.to_thread.run_sync(writer.sync)
+        new_offset = await run_in_threadpool(ResumableUploadService.advance, db, upload_id, offset, written)
+        if new_offset is None:
+            raise HTTPException(status_code=404, detail="Upload not found or expired")
+    finally:
+        # Shielded so a client disconnect (cancellation) still releases the lock
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(writer.close)
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={"Upload-Offset": str(new_offset)})
+
+@router.post("/uploads/{upload_id}/finalize")
+def finalize_upload(
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Complete a resumable upload: hash the file, move it into the blob store and
+    create the study material (same response as /upload). 409 until every byte
+    has been received; 422 if the file doesn't match the `sha256` given at creation.
+    """
+    upload = ResumableUploadService.get(db, upload_id, current_user.id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    if upload.received != upload.size:
+        raise _offset_conflict(upload.received)
+    
+    fields = {"title": upload.title, "description": upload.description, "event_id": upload.event_id}
+    file_name, size, expected = upload.file_name, upload.size, upload.expected_sha256
+    # Hashing a large file takes a while: don't hold a connection for it
+    db.rollback()
+    try:
+        received = ResumableUploadService.verify(upload_id, file_name, size, expected)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    
+    if ResumableUploadService.claim(db, upload_id, current_user.id) is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Upload not found or already finalized")
+    material = _store_material(db, received, fields, current_user)
+    
+    if is_compressible(material["file_name"]):
+        background_tasks.add_task(BlobStore.precompress, material["content_sha256"])
     return material
 
+@router.delete("/uploads/{upload_id}")
+def abort_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Cancel a resumable upload and delete what was received."""
+    if not ResumableUploadService.abort(db, upload_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return {"message": "Upload cancelled"}
+
 @router.get("/")
 def get_materials(
+    request: Request,
+    response: Response,
     event_id: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # Uploader names come from users, so profile renames change the listing too
+    # The signed download URLs change with the expiry window
+    etag = ChangeVersionService.etag(
+        db, "resources:list", ["resources", "users"], event_id, SignedURLService.window()
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     query = db.query(StudyMaterial)
     if event_id:
         query = query.filter(StudyMaterial.event_id == event_id)
@@ -64,20 +429,50 @@ def get_materials(
     result = []
     for m in materials:
         uploader = db.query(User).filter(User.id == m.uploaded_by).first()
-        result.append({
-            "id": m.id,
-            "title": m.title,
-            "description": m.description,
-            "file_name": m.file_name,
-            "file_path": m.file_path,
-            "event_id": m.event_id,
-            "uploaded_by": m.uploaded_by,
-            "uploaded_by_name": uploader.full_name if uploader else "Unknown",
-            "uploaded_at": m.uploaded_at.isoformat() if m.uploaded_at else None
-        })
+        result.append(_material_item(m, uploader.full_name if uploader else "Unknown"))
     
     return result
 
+@router.api_route("/{material_id}/download", methods=["GET", "HEAD"])
+def download_material(
+    material_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download a material's file. Supports If-None-Match (304), Range / If-Range (206,
+    416) and, for text formats, `Accept-Encoding: gzip` from the stored gzip copy.
+    Listings hand out signed URLs instead (see download_signed_file).
+    """
+    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    if not material:
+        raise HTTPException(status_code=404, detail="Material not found")
+    return _download_response(
+        request, material.file_path, material.content_sha256, material.file_name, DOWNLOAD_CACHE_CONTROL
+    )
+
+@router.api_route("/files/{sha256}/{file_name}", methods=["GET", "HEAD"])
+async def download_signed_file(
+    request: Request,
+    sha256: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    file_name: str = Path(..., max_length=255),
+    expires: int = Query(...),
+    signature: str = Query(..., max_length=128)
+):
+    """
+    Download through a signed URL from the material listing. Checked by signature
+    and expiry only (no bearer token, no database), and cacheable by shared caches
+    until the URL expires. Same Range / ETag / gzip handling as the endpoint above.
+    """
+    try:
+        remaining = SignedURLService.verify(sha256, file_name, expires, signature)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    return _download_response(
+        request, blob_path(sha256), sha256, file_name, SIGNED_CACHE_CONTROL.format(max_age=remaining)
+    )
+
 @router.delete("/{material_id}")
 def delete_material(
     material_id: str,
@@ -88,11 +483,14 @@ def delete_material(
     if not material:
         raise HTTPException(status_code=404, detail="Material not found")
     
-    # Delete file
-    if os.path.exists(material.file_path):
-        os.remove(material.file_path)
-    
     db.delete(material)
+    # Drop the blob reference (the last one frees the blob); legacy files are per material
+    stale = BlobStore.release(db, material.content_sha256) if material.content_sha256 else None
+    if stale is None:
+        stale = [material.file_path]
+    ChangeVersionService.bump(db, "resources")
     db.commit()
+    # Only once the row is gone for good: a failed commit must not lose the bytes
+    BlobStore.remove_files(db, stale)
     
     return {"message": "Material deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,270 @@
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import and_, tuple_
+from sqlalchemy.orm import Session
+from ..models.achievement import MemberStreak, MemberBadge
+from ..models.attendance import AttendanceRecord
+from ..models.event import Event
+from ..utils import utc_now, ensure_utc
+
+# Badge catalogue: earned once `metric` reaches `threshold`
+# (total = live events attended, streak = longest run of consecutive live events)
+BADGES = [
+    {"id": "first_check_in", "name": "First Check-in", "description": "Attended your first event", "metric": "total", "threshold": 1},
+    {"id": "regular", "name": "Regular", "description": "Attended 5 events", "metric": "total", "threshold": 5},
+    {"id": "dedicated", "name": "Dedicated", "description": "Attended 10 events", "metric": "total", "threshold": 10},
+    {"id": "veteran", "name": "Veteran", "description": "Attended 25 events", "metric": "total", "threshold": 25},
+    {"id": "streak_3", "name": "On a Roll", "description": "Attended 3 events in a row", "metric": "streak", "threshold": 3},
+    {"id": "streak_5", "name": "Hot Streak", "description": "Attended 5 events in a row", "metric": "streak", "threshold": 5},
+    {"id": "streak_10", "name": "Unstoppable", "description": "Attended 10 events in a row", "metric": "streak", "threshold": 10},
+]
+
+
+BADGES_BY_ID = {badge["id"]: badge for badge in BADGES}
+
+
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _earned(total: int, longest: int) -> list[str]:
+    values = {"total": total, "streak": longest}
+    return [badge["id"] for badge in BADGES if values[badge["metric"]] >= badge["threshold"]]
+
+
+def _after(scheduled_at: datetime, event_id: str):
+    """Live events after (scheduled_at, id) in listing order (idx_events_active_scheduled)."""
+    return and_(
+        Event.is_deleted == False,
+        tuple_(Event.scheduled_at, Event.id) > tuple_(scheduled_at, event_id)
+    )
+
+
+def _replay(attended: list[tuple]) -> tuple[dict, dict]:
+    """
+    Rebuild one member's state from their check-ins.
+
+    Args:
+        attended: [(event position, event_id, scheduled_at, marked_at)] in event order
+
+    Returns:
+        tuple: (streak row values, {badge: awarded_at})
+    """
+    total = current = longest = 0
+    previous = None
+    awarded = {}
+    for position, _, _, marked_at in attended:
+        total += 1
+        current = current + 1 if previous is not None and position == previous + 1 else 1
+        longest = max(longest, current)
+        previous = position
+        for badge in _earned(total, longest):
+            awarded.setdefault(badge, marked_at)
+
+    last = attended[-1] if attended else None
+    return {
+        "total_attended": total,
+        "current_streak": current,
+        "longest_streak": longest,
+        "last_event_id": last[1] if last else None,
+        "last_event_at": last[2] if last else None,
+        "last_check_in": max(row[3] for row in attended) if attended else None
+    }, awarded
+
+
+class AchievementService:
+    """
+    Attendance streaks and badges, maintained incrementally on check-in.
+
+    A check-in that extends the member's latest attended event costs one indexed
+    lookup of the preceding live event plus two small writes. Anything else (first
+    check-in since the tables existed, a check-in for an older event) replays that
+    member's history. Deleting or rescheduling events is not followed; the
+    achievements-rebuild command recomputes everything.
+    """
+
+    @staticmethod
+    def record_check_in(db: Session, user_id: str, event: Event, marked_at: datetime) -> list[str]:
+        """
+        Update the member's streak and award badges, inside the caller's transaction.
+
+        Returns:
+            list: Ids of badges earned by this check-in
+        """
+        state = db.query(MemberStreak).filter(MemberStreak.user_id == user_id).with_for_update().first()
+
+        in_order = state is not None and state.last_event_id is not None and (
+            ensure_utc(event.scheduled_at), event.id
+        ) > (ensure_utc(state.last_event_at), state.last_event_id)
+
+        if not in_order:
+            return AchievementService._recompute_user(db, user_id, state)
+
+        previous = db.query(Event.id).filter(
+            Event.is_deleted == False,
+            tuple_(Event.scheduled_at, Event.id) < tuple_(event.scheduled_at, event.id)
+        ).order_by(Event.scheduled_at.desc(), Event.id.desc()).limit(1).scalar()
+
+        state.current_streak = state.current_streak + 1 if previous == state.last_event_id else 1
+        state.longest_streak = max(state.longest_streak, state.current_streak)
+        state.total_attended += 1
+        state.last_event_id = event.id
+        state.last_event_at = event.scheduled_at
+        state.last_check_in = marked_at
+
+        return AchievementService._award(
+            db, user_id, {badge: marked_at for badge in _earned(state.total_attended, state.longest_streak)}
+        )
+
+    @staticmethod
+    def _award(db: Session, user_id: str, awarded: dict) -> list[str]:
+        """Insert the badges in {badge: awarded_at} the member does not have yet."""
+        have = {row.badge for row in db.query(MemberBadge.badge).filter(MemberBadge.user_id == user_id).all()}
+        new = [badge for badge in awarded if badge not in have]
+        if new:
+            insert = _dialect_insert(db)
+            db.execute(
+                insert(MemberBadge.__table__).values([
+                    {"user_id": user_id, "badge": badge, "awarded_at": awarded[badge]} for badge in new
+                ]).on_conflict_do_nothing(index_elements=['user_id', 'badge'])
+            )
+        return new
+
+    @staticmethod
+    def _recompute_user(db: Session, user_id: str, state: MemberStreak | None) -> list[str]:
+        """Replay one member's check-ins (the new one included) and upsert their state."""
+        db.flush()
+        live = db.query(Event.id, Event.scheduled_at).filter(
+            Event.is_deleted == False
+        ).order_by(Event.scheduled_at, Event.id).all()
+        position = {row.id: i for i, row in enumerate(live)}
+
+        attended = sorted(
+            (position[row.event_id], row.event_id, live[position[row.event_id]].scheduled_at, row.marked_at)
+            for row in db.query(AttendanceRecord.event_id, AttendanceRecord.marked_at).filter(
+                AttendanceRecord.user_id == user_id
+            ).all()
+            if row.event_id in position
+        )
+        values, awarded = _replay(attended)
+
+        table = MemberStreak.__table__
+        insert = _dialect_insert(db)
+        stmt = insert(table).values(user_id=user_id, updated_at=utc_now(), **values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={**values, "updated_at": stmt.excluded.updated_at}
+        ))
+        if state is not None:
+            db.expire(state)
+        return AchievementService._award(db, user_id, awarded)
+
+    @staticmethod
+    def get_streaks(db: Session, user_id: str) -> dict:
+        """
+        The member's stored state. current_streak drops to 0 once a later live event
+        has started without their check-in (one indexed EXISTS).
+        """
+        state = db.query(MemberStreak).filter(MemberStreak.user_id == user_id).first()
+        if state is None or state.last_event_id is None:
+            return {
+                "total_attended": 0,
+                "current_streak": 0,
+                "longest_streak": 0,
+                "last_event_id": None,
+                "last_check_in": None
+            }
+
+        missed = db.query(
+            db.query(Event.id).filter(
+                _after(state.last_event_at, state.last_event_id),
+                Event.scheduled_at <= utc_now()
+            ).exists()
+        ).scalar()
+
+        return {
+            "total_attended": state.total_attended,
+            "current_streak": 0 if missed else state.current_streak,
+            "longest_streak": state.longest_streak,
+            "last_event_id": state.last_event_id,
+            "last_check_in": ensure_utc(state.last_check_in).isoformat() if state.last_check_in else None
+        }
+
+    @staticmethod
+    def describe(badge_ids: list[str]) -> list[dict]:
+        return [
+            {key: BADGES_BY_ID[badge][key] for key in ("id", "name", "description")}
+            for badge in badge_ids
+        ]
+
+    @staticmethod
+    def get_badges(db: Session, user_id: str) -> list[dict]:
+        """The full catalogue with each badge's earned flag and award time."""
+        awarded = dict(
+            db.query(MemberBadge.badge, MemberBadge.awarded_at).filter(MemberBadge.user_id == user_id).all()
+        )
+        return [
+            {
+                "id": badge["id"],
+                "name": badge["name"],
+                "description": badge["description"],
+                "earned": badge["id"] in awarded,
+                "awarded_at": ensure_utc(awarded[badge["id"]]).isoformat() if badge["id"] in awarded else None
+            }
+            for badge in BADGES
+        ]
+
+    @staticmethod
+    def rebuild(db: Session) -> dict:
+        """
+        Recompute every member's streak and badges from attendance_records and commit.
+        Badges keep their original award time when still earned.
+        """
+        live = db.query(Event.id, Event.scheduled_at).filter(
+            Event.is_deleted == False
+        ).order_by(Event.scheduled_at, Event.id).all()
+        position = {row.id: i for i, row in enumerate(live)}
+
+        previous_awards = {
+            (row.user_id, row.badge): row.awarded_at
+            for row in db.query(MemberBadge.user_id, MemberBadge.badge, MemberBadge.awarded_at).all()
+        }
+
+        records = db.query(
+            AttendanceRecord.user_id, AttendanceRecord.event_id, AttendanceRecord.marked_at
+        ).order_by(AttendanceRecord.user_id).yield_per(5000)
+
+        now = utc_now()
+        streak_rows, badge_rows = [], []
+        for user_id, rows in groupby(records, key=lambda row: row.user_id):
+            attended = sorted(
+                (position[row.event_id], row.event_id, live[position[row.event_id]].scheduled_at, row.marked_at)
+                for row in rows
+                if row.event_id in position
+            )
+            if not attended:
+                continue
+            values, awarded = _replay(attended)
+            streak_rows.append({"user_id": user_id, "updated_at": now, **values})
+            badge_rows.extend(
+                {"user_id": user_id, "badge": badge, "awarded_at": previous_awards.get((user_id, badge), awarded_at)}
+                for badge, awarded_at in awarded.items()
+            )
+
+        try:
+            db.query(MemberBadge).delete(synchronize_session=False)
+            db.query(MemberStreak).delete(synchronize_session=False)
+            if streak_rows:
+                db.execute(MemberStreak.__table__.insert(), streak_rows)
+            if badge_rows:
+                db.execute(MemberBadge.__table__.insert(), badge_rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return {"members": len(streak_rows), "badges": len(badge_rows)}
@@ -0,0 +1,363 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.attendance import AttendanceRecord
+from ..models.event import Event
+from ..models.user import User, UserRole
+from ..config import get_settings
+from ..utils import utc_now, ensure_utc
+from .change_versions import ChangeVersionService
+
+# A new check-in, event change or member change invalidates the loaded matrix
+ANALYTICS_SCOPES = ["attendance", "events", "users"]
+
+UNKNOWN_GROUP = "Unknown"
+
+# Per-worker cache: (fingerprint, AttendanceMatrix, built monotonic time)
+_cache: dict[str, tuple[str, "AttendanceMatrix", float]] = {}
+_cache_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def _to_datetime64(values) -> np.ndarray:
+    """UTC datetimes (naive or aware) -> datetime64[s]."""
+    return np.array(
+        [ensure_utc(v).replace(tzinfo=None) for v in values],
+        dtype='datetime64[s]'
+    )
+
+
+def _encode(values) -> tuple[np.ndarray, list[str]]:
+    """Integer-code a column of labels; blanks become UNKNOWN_GROUP."""
+    cleaned = np.array([(v or "").strip() or UNKNOWN_GROUP for v in values], dtype=object)
+    if len(cleaned) == 0:
+        return np.zeros(0, dtype=np.int32), []
+    labels, codes = np.unique(cleaned, return_inverse=True)
+    return codes.astype(np.int32), [str(label) for label in labels]
+
+
+def _month_index(times: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for each datetime64 value."""
+    return times.astype('datetime64[M]').astype(np.int64)
+
+
+def _month_label(month_index: int) -> str:
+    return str(np.datetime64(int(month_index), 'M'))
+
+
+def _rate(numerator, denominator):
+    """Elementwise percentage, 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros_like(numerator)
+    np.divide(numerator * 100.0, denominator, out=out, where=denominator > 0)
+    return np.round(out, 2)
+
+
+@dataclass
+class AttendanceMatrix:
+    """
+    Students × past events as dense NumPy arrays.
+
+    Rows are students (role student, active or not), columns are non-deleted events
+    that have already started, oldest first. `attended[u, e]` is True when student u
+    checked in to event e. A student is eligible for an event scheduled at or after
+    their signup. At 10k students × 500 events the boolean matrices take 5 MB each.
+    """
+    user_ids: list[str]
+    user_names: list[str]
+    joined: np.ndarray          # datetime64[s] per student
+    branch_codes: np.ndarray    # int32 per student, index into branch_labels
+    branch_labels: list[str]
+    year_codes: np.ndarray      # int32 per student, index into year_labels
+    year_labels: list[str]
+    event_ids: list[str]
+    event_times: np.ndarray     # datetime64[s] per event, ascending
+    attended: np.ndarray        # bool (students, events)
+    as_of: datetime
+    results: dict = field(default_factory=dict)  # Memoized metric results
+
+    def __post_init__(self):
+        self.eligible = self.joined[:, None] <= self.event_times[None, :]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.attended.shape
+
+    @classmethod
+    def from_codes(cls, user_ids, user_names, joined, branches, years,
+                   event_ids, event_times, record_users, record_events, as_of=None):
+        """
+        Build from per-student/per-event columns and (user index, event index) pairs.
+
+        Args:
+            joined: Signup time per student (datetime64 or datetime values)
+            branches, years: Raw branch/year labels per student
+            event_times: Scheduled time per event, ascending
+            record_users, record_events: Integer row/column of each attendance record
+        """
+        joined = np.asarray(joined, dtype='datetime64[s]')
+        event_times = np.asarray(event_times, dtype='datetime64[s]')
+        attended = np.zeros((len(user_ids), len(event_ids)), dtype=bool)
+        attended[np.asarray(record_users, dtype=np.int64), np.asarray(record_events, dtype=np.int64)] = True
+
+        branch_codes, branch_labels = _encode(branches)
+        year_codes, year_labels = _encode(years)
+        return cls(
+            user_ids=list(user_ids),
+            user_names=list(user_names),
+            joined=joined,
+            branch_codes=branch_codes,
+            branch_labels=branch_labels,
+            year_codes=year_codes,
+            year_labels=year_labels,
+            event_ids=list(event_ids),
+            event_times=event_times,
+            attended=attended,
+            as_of=as_of or utc_now()
+        )
+
+    # ---- metrics -------------------------------------------------------
+
+    def group_rates(self, by: str) -> list[dict]:
+        """Attendance rate per branch or year: check-ins / eligible (student, event) pairs."""
+        codes, labels = (
+            (self.branch_codes, self.branch_labels) if by == 'branch'
+            else (self.year_codes, self.year_labels)
+        )
+        n_groups = len(labels)
+        attended_per_user = (self.attended & self.eligible).sum(axis=1)
+        eligible_per_user = self.eligible.sum(axis=1)
+
+        members = np.bincount(codes, minlength=n_groups)
+        active = np.bincount(codes, weights=attended_per_user > 0, minlength=n_groups)
+        attended = np.bincount(codes, weights=attended_per_user, minlength=n_groups)
+        eligible = np.bincount(codes, weights=eligible_per_user, minlength=n_groups)
+        rates = _rate(attended, eligible)
+
+        rows = [
+            {
+                by: labels[g],
+                "members": int(members[g]),
+                "active_members": int(active[g]),
+                "attended": int(attended[g]),
+                "eligible": int(eligible[g]),
+                "attendance_rate": float(rates[g])
+            }
+            for g in range(n_groups)
+        ]
+        rows.sort(key=lambda row: (-row["attendance_rate"], row[by]))
+        return rows
+
+    def _monthly_activity(self, periods: int):
+        """
+        Per student: whether they attended anything in each of their first `periods`
+        months (month 0 = signup month), and whether that month has been reached.
+        """
+        n_users = self.shape[0]
+        join_month = _month_index(self.joined)
+        current_month = _month_index(np.array([ensure_utc(self.as_of).replace(tzinfo=None)], dtype='datetime64[s]'))[0]
+        base = int(join_month.min()) if n_users else int(current_month)
+        n_months = int(current_month) - base + 1
+
+        # students × calendar months; event columns are time-ordered, so each month
+        # is a contiguous block that logical_or.reduceat collapses in one pass
+        activity = np.zeros((n_users, max(n_months, 1)), dtype=bool)
+        if self.shape[1]:
+            event_month = _month_index(self.event_times) - base
+            months, starts = np.unique(event_month, return_index=True)
+            in_range = (months >= 0) & (months < n_months)
+            per_month = np.logical_or.reduceat(self.attended, starts, axis=1)
+            activity[:, months[in_range]] = per_month[:, in_range]
+
+        offsets = np.arange(periods)
+        index = (join_month - base)[:, None] + offsets[None, :]
+        reached = index < n_months
+        active = activity[np.arange(n_users)[:, None], np.minimum(index, n_months - 1)] & reached
+        return join_month, active, reached
+
+    def retention(self, periods: int) -> list[dict]:
+        """Share of students still attending k months after signing up, k = 0..periods-1."""
+        _, active, reached = self._monthly_activity(periods)
+        retained = active.sum(axis=0)
+        at_risk = reached.sum(axis=0)
+        rates = _rate(retained, at_risk)
+        return [
+            {
+                "month": k,
+                "members": int(at_risk[k]),
+                "retained": int(retained[k]),
+                "retention_rate": float(rates[k])
+            }
+            for k in range(periods)
+            if at_risk[k] > 0
+        ]
+
+    def cohorts(self, periods: int) -> list[dict]:
+        """Retention per signup-month cohort."""
+        join_month, active, reached = self._monthly_activity(periods)
+        if not len(join_month):
+            return []
+        cohort_months, cohort_codes = np.unique(join_month, return_inverse=True)
+
+        size = np.bincount(cohort_codes, minlength=len(cohort_months))
+        retained = np.zeros((len(cohort_months), periods), dtype=np.int64)
+        np.add.at(retained, cohort_codes, active)
+        # Everyone in a cohort reaches the same months
+        reached_months = np.zeros((len(cohort_months), periods), dtype=bool)
+        reached_months[cohort_codes] = reached
+        rates = _rate(retained, size[:, None])
+
+        return [
+            {
+                "cohort": _month_label(month),
+                "members": int(size[c]),
+                "retained": [int(v) for v in retained[c][reached_months[c]]],
+                "retention_rate": [float(v) for v in rates[c][reached_months[c]]]
+            }
+            for c, month in enumerate(cohort_months)
+        ]
+
+    def streaks(self, top: int) -> dict:
+        """
+        Consecutive-event attendance streaks.
+
+        Running streak length per (student, event) is cumsum minus the cumsum value at
+        the most recent missed event (carried forward with maximum.accumulate).
+        """
+        n_users, n_events = self.shape
+        if n_events == 0:
+            current = longest = np.zeros(n_users, dtype=np.int32)
+        else:
+            count = np.cumsum(self.attended, axis=1, dtype=np.int32)
+            at_last_miss = np.maximum.accumulate(np.where(self.attended, 0, count), axis=1)
+            run = count - at_last_miss
+            longest = run.max(axis=1)
+            current = run[:, -1]
+
+        def leaders(values):
+            order = np.lexsort((np.arange(n_users), -values))[:top]
+            return [
+                {
+                    "user_id": self.user_ids[i],
+                    "full_name": self.user_names[i],
+                    "current_streak": int(current[i]),
+                    "longest_streak": int(longest[i])
+                }
+                for i in order
+                if values[i] > 0
+            ]
+
+        distribution = np.bincount(longest, minlength=1)
+        return {
+            "current_leaders": leaders(current),
+            "longest_leaders": leaders(longest),
+            "members_on_streak": int((current > 0).sum()),
+            "longest_streak_distribution": [
+                {"length": length, "members": int(count)}
+                for length, count in enumerate(distribution)
+                if count
+            ]
+        }
+
+
+class AnalyticsService:
+    """
+    Vectorized attendance analytics over an in-memory students × events matrix.
+
+    The matrix is loaded with three bulk queries and kept per worker until the
+    change versions of ANALYTICS_SCOPES move (i.e. the next check-in, event or
+    member change) or ANALYTICS_MAX_AGE_SECONDS passes, since events drop into the
+    "past" window as time goes by. Metric results are memoized on the matrix.
+    """
+
+    @staticmethod
+    def load(db: Session) -> AttendanceMatrix:
+        """Bulk-load students, past events and their attendance records into a matrix."""
+        now = utc_now()
+        students = db.execute(
+            select(User.id, User.full_name, User.created_at, User.branch, User.year)
+            .where(User.role == UserRole.STUDENT.value)
+            .order_by(User.created_at, User.id)
+        ).all()
+        events = db.execute(
+            select(Event.id, Event.scheduled_at)
+            .where(Event.is_deleted == False, Event.scheduled_at <= now)
+            .order_by(Event.scheduled_at, Event.id)
+        ).all()
+        records = db.execute(
+            select(AttendanceRecord.user_id, AttendanceRecord.event_id)
+            .join(Event, Event.id == AttendanceRecord.event_id)
+            .where(Event.is_deleted == False, Event.scheduled_at <= now)
+        ).all()
+
+        user_index = {row.id: i for i, row in enumerate(students)}
+        event_index = {row.id: i for i, row in enumerate(events)}
+        pairs = np.array(
+            [(user_index.get(user_id, -1), event_index.get(event_id, -1)) for user_id, event_id in records],
+            dtype=np.int64
+        ).reshape(-1, 2)
+        # Drop records of non-students (admins testing a QR)
+        pairs = pairs[(pairs >= 0).all(axis=1)]
+
+        return AttendanceMatrix.from_codes(
+            user_ids=[row.id for row in students],
+            user_names=[row.full_name for row in students],
+            joined=_to_datetime64(row.created_at for row in students),
+            branches=[row.branch for row in students],
+            years=[row.year for row in students],
+            event_ids=[row.id for row in events],
+            event_times=_to_datetime64(row.scheduled_at for row in events),
+            record_users=pairs[:, 0],
+            record_events=pairs[:, 1],
+            as_of=now
+        )
+
+    @staticmethod
+    def get_matrix(db: Session) -> AttendanceMatrix:
+        """Cached matrix for the current change versions; loads it at most once per worker."""
+        fingerprint = ChangeVersionService.fingerprint(db, ANALYTICS_SCOPES)
+        max_age = get_settings().ANALYTICS_MAX_AGE_SECONDS
+
+        def fresh():
+            cached = _cache.get('matrix')
+            if cached is not None and cached[0] == fingerprint and time.monotonic() - cached[2] < max_age:
+                return cached[1]
+            return None
+
+        with _cache_lock:
+            matrix = fresh()
+        if matrix is not None:
+            return matrix
+
+        # Concurrent cold requests wait for one load instead of each running it
+        with _build_lock:
+            with _cache_lock:
+                matrix = fresh()
+            if matrix is None:
+                matrix = AnalyticsService.load(db)
+                with _cache_lock:
+                    _cache['matrix'] = (fingerprint, matrix, time.monotonic())
+        return matrix
+
+    @staticmethod
+    def metric(db: Session, name: str, *params):
+        """
+        Compute (or reuse) one metric on the cached matrix.
+
+        Args:
+            db: Database session
+            name: 'group_rates', 'retention', 'cohorts' or 'streaks'
+            params: Positional arguments of the AttendanceMatrix method
+        """
+        matrix = AnalyticsService.get_matrix(db)
+        key = (name,) + params
+        result = matrix.results.get(key)
+        if result is None:
+            result = getattr(matrix, name)(*params)
+            matrix.results[key] = result
+        return matrix, result
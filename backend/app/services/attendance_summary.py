@@ -0,0 +1,173 @@
+from datetime import datetime
+from sqlalchemy import func, select, update, and_
+from sqlalchemy.orm import Session
+from ..models.attendance import AttendanceRecord, EventAttendanceSummary
+from ..models.event import Event
+from ..models.user import User, UserRole
+from ..utils import utc_now
+
+
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _active_students():
+    return and_(User.role == UserRole.STUDENT.value, User.is_active == True)
+
+
+class AttendanceSummaryService:
+    """
+    Keeps event_attendance_summary in step with attendance writes and member status.
+
+    All methods run inside the caller's transaction and never commit, so a summary
+    change is only visible together with the write that caused it.
+    """
+
+    @staticmethod
+    def is_eligible(user: User) -> bool:
+        """Whether a user counts towards eligible_count (active student)."""
+        return user.role == UserRole.STUDENT.value and bool(user.is_active)
+
+    @staticmethod
+    def active_student_count(db: Session) -> int:
+        return db.query(func.count(User.id)).filter(_active_students()).scalar()
+
+    @staticmethod
+    def init_event(db: Session, event_id: str):
+        """Create the summary row for a new event, snapshotting the current eligible count."""
+        insert = _dialect_insert(db)
+        stmt = insert(EventAttendanceSummary.__table__).values(
+            event_id=event_id,
+            attended_count=0,
+            eligible_count=AttendanceSummaryService.active_student_count(db),
+            updated_at=utc_now()
+        ).on_conflict_do_nothing(index_elements=['event_id'])
+        db.execute(stmt)
+
+    @staticmethod
+    def record_check_in(db: Session, event_id: str, marked_at: datetime):
+        """
+        Count one check-in. Single upsert; creates the row if the event predates the
+        summary table and has not been backfilled yet.
+        """
+        table = EventAttendanceSummary.__table__
+        eligible = select(func.count(User.id)).where(_active_students()).scalar_subquery()
+
+        insert = _dialect_insert(db)
+        stmt = insert(table).values(
+            event_id=event_id,
+            attended_count=1,
+            eligible_count=eligible,
+            first_check_in=marked_at,
+            last_check_in=marked_at,
+            updated_at=marked_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['event_id'],
+            set_={
+                "attended_count": table.c.attended_count + 1,
+                "first_check_in": func.coalesce(table.c.first_check_in, stmt.excluded.first_check_in),
+                "last_check_in": stmt.excluded.last_check_in,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def eligibility_changed(db: Session, was_eligible: bool, is_eligible: bool):
+        """
+        Apply a member activation (+1) or deactivation (-1) to events that have not
+        started yet; past events keep their eligible count from event time.
+        """
+        AttendanceSummaryService.eligibility_delta(db, int(is_eligible) - int(was_eligible))
+
+    @staticmethod
+    def eligibility_delta(db: Session, delta: int):
+        """Apply a net change in eligible members (bulk status changes) to upcoming events."""
+        if delta == 0:
+            return
+
+        upcoming = select(Event.id).where(Event.scheduled_at > utc_now())
+        db.execute(
+            update(EventAttendanceSummary)
+            .where(EventAttendanceSummary.event_id.in_(upcoming))
+            .values(
+                eligible_count=EventAttendanceSummary.eligible_count + delta,
+                updated_at=utc_now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def event_rescheduled(db: Session, event: Event):
+        """Re-snapshot eligible_count when an event is moved into the future."""
+        scheduled_at = event.scheduled_at
+        if scheduled_at.tzinfo is None:
+            scheduled_at = scheduled_at.replace(tzinfo=utc_now().tzinfo)
+        if scheduled_at <= utc_now():
+            return
+
+        db.execute(
+            update(EventAttendanceSummary)
+            .where(EventAttendanceSummary.event_id == event.id)
+            .values(
+                eligible_count=AttendanceSummaryService.active_student_count(db),
+                updated_at=utc_now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(db: Session) -> dict:
+        """
+        Recompute every summary row from attendance_records (backfill / repair) and commit.
+
+        Historical eligible counts are approximated as students that are active now
+        and had signed up by the event's scheduled time.
+        """
+        attendance = {
+            row.event_id: row
+            for row in db.query(
+                AttendanceRecord.event_id,
+                func.count(AttendanceRecord.id).label('attended'),
+                func.min(AttendanceRecord.marked_at).label('first_check_in'),
+                func.max(AttendanceRecord.marked_at).label('last_check_in')
+            ).group_by(AttendanceRecord.event_id).all()
+        }
+
+        eligible = dict(
+            db.query(Event.id, func.count(User.id)).outerjoin(
+                User, and_(_active_students(), User.created_at <= Event.scheduled_at)
+            ).group_by(Event.id).all()
+        )
+
+        now = utc_now()
+        rows = []
+        for event_id, eligible_count in eligible.items():
+            stats = attendance.get(event_id)
+            rows.append({
+                "event_id": event_id,
+                "attended_count": stats.attended if stats else 0,
+                "eligible_count": eligible_count,
+                "first_check_in": stats.first_check_in if stats else None,
+                "last_check_in": stats.last_check_in if stats else None,
+                "updated_at": now
+            })
+
+        try:
+            db.query(EventAttendanceSummary).delete(synchronize_session=False)
+            if rows:
+                db.execute(EventAttendanceSummary.__table__.insert(), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return {
+            "events": len(rows),
+            "attendance_records": sum(row["attended_count"] for row in rows)
+        }
@@ -0,0 +1,242 @@
+import fcntl
+import glob
+import os
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError, InterfaceError
+from ..database import engine
+from ..models.audit_log import AuditLog
+from ..config import get_settings
+
+SEGMENT_COLUMNS = [
+    'id', 'user_id', 'action', 'resource_type', 'resource_id',
+    'meta_data', 'ip_address', 'user_agent', 'created_at'
+]
+
+OPEN_SUFFIX = '.open'  # Being appended to by a live writer (holds an exclusive flock)
+CLOSED_SUFFIX = '.seg'  # Rotated, waiting to be bulk-loaded
+FAILED_SUFFIX = '.failed'  # Rejected by the database; kept for manual inspection
+
+_ESCAPES = [('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r')]
+
+def _encode_field(value) -> str:
+    """Encode a value in PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    value = str(value)
+    for raw, escaped in _ESCAPES:
+        value = value.replace(raw, escaped)
+    return value
+
+def _decode_field(value: str):
+    if value == '\\N':
+        return None
+    out = []
+    chars = iter(value)
+    for ch in chars:
+        if ch == '\\':
+            nxt = next(chars, '')
+            out.append({'t': '\t', 'n': '\n', 'r': '\r'}.get(nxt, nxt))
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+def encode_record(row: dict) -> str:
+    """One audit row as a COPY text-format line (tab separated, \\N for NULL)."""
+    return '\t'.join(_encode_field(row.get(column)) for column in SEGMENT_COLUMNS) + '\n'
+
+def decode_record(line: str) -> dict:
+    row = dict(zip(SEGMENT_COLUMNS, (_decode_field(f) for f in line.rstrip('\n').split('\t'))))
+    if row['created_at']:
+        row['created_at'] = datetime.fromisoformat(row['created_at'])
+    return row
+
+def _try_lock(f) -> bool:
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class SegmentAuditSink:
+    """
+    Audit sink that appends rows to local, rotating segment files and bulk-loads
+    closed segments into audit_logs with COPY.
+
+    - Each worker appends to its own `<dir>/<ts>-<pid>-<seq>.open` file and holds an
+      exclusive flock on it, so any `.open` file that can be locked belongs to a dead
+      process and is recovered (partial trailing line dropped, then closed).
+    - Segments rotate to `.seg` after AUDIT_SEGMENT_MAX_BYTES or AUDIT_SEGMENT_MAX_AGE_SECONDS.
+    - A closed segment is loaded in one transaction (COPY into a temp table, then
+      INSERT ... ON CONFLICT DO NOTHING) and deleted afterwards, so replaying a segment
+      that was loaded just before a crash is harmless.
+    - If the database is unreachable, segments stay on disk and are retried later.
+    """
+
+    def __init__(self, directory: str | None = None):
+        settings = get_settings()
+        self.directory = directory or settings.AUDIT_SEGMENT_DIR
+        self.max_bytes = settings.AUDIT_SEGMENT_MAX_BYTES
+        self.max_age = settings.AUDIT_SEGMENT_MAX_AGE_SECONDS
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._seq = 0
+        self._retry_at = 0.0
+        self.loaded = 0
+
+        self.recover()
+
+    # -- writing ---------------------------------------------------------
+
+    def _open_segment(self):
+        self._seq += 1
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-{self._seq}{OPEN_SUFFIX}"
+        self._path = os.path.join(self.directory, name)
+        self._file = open(self._path, 'ab')
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self._opened_at = time.monotonic()
+
+    def write_batch(self, rows: list[dict]) -> None:
+        if self._file is None:
+            self._open_segment()
+
+        self._file.write(''.join(encode_record(row) for row in rows).encode('utf-8'))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        if self._file.tell() >= self.max_bytes or time.monotonic() - self._opened_at >= self.max_age:
+            self.rotate()
+
+        self.load_closed_segments()
+
+    def idle(self):
+        """Called by the writer when no rows arrived; rotates aged segments and retries loads."""
+        if self._file is not None and time.monotonic() - self._opened_at >= self.max_age:
+            self.rotate()
+        self.load_closed_segments()
+
+    def rotate(self):
+        """Close the current segment and mark it ready for loading."""
+        if self._file is None:
+            return
+        closed_path = self._path[:-len(OPEN_SUFFIX)] + CLOSED_SUFFIX
+        os.rename(self._path, closed_path)
+        self._file.close()  # Releases the flock
+        self._file = None
+        self._path = None
+
+    def close(self):
+        """Rotate the open segment and make a final attempt to load everything."""
+        self.rotate()
+        self.load_closed_segments(force=True)
+
+    # -- recovery and loading ---------------------------------------------
+
+    def recover(self) -> int:
+        """
+        Close `.open` segments left behind by crashed writers.
+
+        Returns:
+            int: Number of segments recovered
+        """
+        recovered = 0
+        for path in glob.glob(os.path.join(self.directory, f"*{OPEN_SUFFIX}")):
+            if path == self._path:
+                continue
+            try:
+                f = open(path, 'r+b')
+            except FileNotFoundError:
+                continue
+            with f:
+                if not _try_lock(f):
+                    continue  # Owner is alive
+                if not os.path.exists(path):
+                    continue
+                # Drop a torn final record (crash mid-write)
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+                os.rename(path, path[:-len(OPEN_SUFFIX)] + CLOSED_SUFFIX)
+                recovered += 1
+        return recovered
+
+    def load_closed_segments(self, force: bool = False) -> int:
+        """
+        Bulk-load every closed segment, oldest first.
+
+        Returns:
+            int: Number of segments loaded
+        """
+        if not force and time.monotonic() < self._retry_at:
+            return 0
+
+        dbapi = engine.dialect.dbapi
+        unavailable = (OperationalError, InterfaceError, dbapi.OperationalError, dbapi.InterfaceError)
+        loaded = 0
+
+        for path in sorted(glob.glob(os.path.join(self.directory, f"*{CLOSED_SUFFIX}"))):
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            with f:
+                # Another worker is loading this segment
+                if not _try_lock(f) or not os.path.exists(path):
+                    continue
+                try:
+                    self._load_segment(f)
+                except unavailable as e:
+                    # Database unavailable: keep the segment and retry later
+                    print(f"Audit segment load deferred ({os.path.basename(path)}): {str(e)}")
+                    self._retry_at = time.monotonic() + self.max_age
+                    break
+                except Exception as e:
+                    print(f"Audit segment rejected ({os.path.basename(path)}): {str(e)}")
+                    os.rename(path, path[:-len(CLOSED_SUFFIX)] + FAILED_SUFFIX)
+                    continue
+                os.remove(path)
+                loaded += 1
+
+        self.loaded += loaded
+        return loaded
+
+    def _load_segment(self, f) -> None:
+        f.seek(0)
+        if engine.dialect.name == 'postgresql':
+            self._copy_segment(f)
+            return
+
+        # Non-PostgreSQL dev databases: regular multi-row INSERT
+        rows = [decode_record(line.decode('utf-8')) for line in f if line.strip()]
+        if rows:
+            with engine.begin() as conn:
+                conn.execute(insert(AuditLog.__table__), rows)
+
+    @staticmethod
+    def _copy_segment(f) -> None:
+        columns = ', '.join(SEGMENT_COLUMNS)
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute(
+                "CREATE TEMP TABLE audit_segment_load "
+                "(LIKE audit_logs INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cursor.copy_expert(f"COPY audit_segment_load ({columns}) FROM STDIN", f)
+            cursor.execute(
+                f"INSERT INTO audit_logs ({columns}) "
+                f"SELECT {columns} FROM audit_segment_load ON CONFLICT DO NOTHING"
+            )
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
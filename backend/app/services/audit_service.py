@@ -1,8 +1,11 @@
 import json
+import uuid
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import Request
-from ..models.audit_log import AuditLog
+from .audit_writer import get_audit_writer, DatabaseAuditSink
+from .security_rollup import get_security_aggregator
+from ..config import get_settings
 from ..utils import utc_now
 
 def serialize_for_json(obj):
@@ -31,8 +34,12 @@ class AuditService:
         """
         Log an audit event.
         
+        The row is handed to the buffered audit writer and inserted in a later batch on
+        the writer's own connection; the caller's session is never flushed, committed or
+        rolled back here.
+        
         Args:
-            db: Database session
+            db: Database session (unused; kept so call sites stay unchanged)
             user_id: ID of user performing action (None for system actions)
             action: Action being performed (e.g., 'signup', 'login', 'attendance_marked')
             resource_type: Type of resource (e.g., 'event', 'user', 'approval')
@@ -41,31 +48,73 @@ class AuditService:
             request: FastAPI request object (for IP and user agent)
         """
         try:
-            ip_address = None
-            user_agent = None
+            row = AuditService._build_row(user_id, action, resource_type, resource_id, metadata, request)
             
-            if request:
-                ip_address = request.client.host if request.client else None
-                user_agent = request.headers.get('user-agent')
+            if get_settings().AUDIT_ASYNC_ENABLED:
+                get_audit_writer().submit(row)
+            else:
+                DatabaseAuditSink().write_batch([row])
             
-            audit_log = AuditLog(
-                user_id=str(user_id) if user_id else None,
-                action=action,
-                resource_type=resource_type,
-                resource_id=str(resource_id) if resource_id else None,
-                meta_data=json.dumps(serialize_for_json(metadata)) if metadata else None,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                created_at=utc_now()
-            )
+        except Exception as e:
+            # Don't fail the main operation if audit logging fails
+            print(f"Audit logging failed: {str(e)}")
+    
+    @staticmethod
+    def log_many(
+        db: Session,
+        user_id: str | None,
+        action: str,
+        resource_type: str | None,
+        entries: list[tuple[str, dict | None]],
+        request: Request | None = None
+    ):
+        """
+        Log the same action for many resources (bulk admin operations).
+        
+        Without the async writer the rows go out as one multi-row INSERT; with it they
+        join the writer's next batches.
+        
+        Args:
+            entries: (resource_id, metadata) per affected resource
+        """
+        if not entries:
+            return
+        try:
+            rows = [
+                AuditService._build_row(user_id, action, resource_type, resource_id, metadata, request)
+                for resource_id, metadata in entries
+            ]
             
-            db.add(audit_log)
-            db.commit()
+            if get_settings().AUDIT_ASYNC_ENABLED:
+                writer = get_audit_writer()
+                for row in rows:
+                    writer.submit(row)
+            else:
+                DatabaseAuditSink().write_batch(rows)
             
         except Exception as e:
-            # Don't fail the main operation if audit logging fails
             print(f"Audit logging failed: {str(e)}")
-            db.rollback()
+    
+    @staticmethod
+    def _build_row(user_id, action, resource_type, resource_id, metadata, request) -> dict:
+        ip_address = None
+        user_agent = None
+        
+        if request:
+            ip_address = request.client.host if request.client else None
+            user_agent = request.headers.get('user-agent')
+        
+        return {
+            'id': str(uuid.uuid4()),
+            'user_id': str(user_id) if user_id else None,
+            'action': action,
+            'resource_type': resource_type,
+            'resource_id': str(resource_id) if resource_id else None,
+            'meta_data': json.dumps(serialize_for_json(metadata)) if metadata else None,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'created_at': utc_now()
+        }
     
     @staticmethod
     def log_signup(db: Session, user_id: str, email: str, request: Request = None):
@@ -144,7 +193,21 @@ class AuditService:
         metadata: dict = None,
         request: Request = None
     ):
-        """Log failed attendance attempt (for security monitoring)."""
+        """
+        Log failed attendance attempt (for security monitoring).
+        
+        With AUDIT_FAILURE_ROLLUP_ENABLED, every attempt is counted in the per-minute
+        security_event_rollups table and only the first few per (user, reason, minute)
+        also get a full audit row, so scan storms do not turn into write storms.
+        """
+        if get_settings().AUDIT_FAILURE_ROLLUP_ENABLED:
+            ip_address = request.client.host if request and request.client else None
+            keep_full_row = get_security_aggregator().record(
+                user_id, 'attendance_failed', reason, ip_address
+            )
+            if not keep_full_row:
+                return
+        
         AuditService.log(
             db, user_id, 'attendance_failed', None, None,
             {'reason': reason, **(metadata or {})},
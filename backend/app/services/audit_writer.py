@@ -0,0 +1,236 @@
+import os
+import queue
+import threading
+import time
+from sqlalchemy import insert
+from ..database import engine
+from ..models.audit_log import AuditLog
+from ..config import get_settings
+
+_STOP = object()
+_WRITE_RETRIES = 3
+
+OVERFLOW_POLICIES = ('block', 'drop_newest', 'drop_oldest')
+
+
+class DatabaseAuditSink:
+    """Writes audit batches as one multi-row INSERT on a dedicated connection."""
+
+    def write_batch(self, rows: list[dict]) -> None:
+        with engine.begin() as conn:
+            conn.execute(insert(AuditLog.__table__), rows)
+
+
+def create_audit_sink():
+    """Build the sink selected by AUDIT_BACKEND."""
+    backend = get_settings().AUDIT_BACKEND
+    if backend == 'database':
+        return DatabaseAuditSink()
+    if backend == 'segments':
+        from .audit_segments import SegmentAuditSink
+        return SegmentAuditSink()
+    raise ValueError(f"Unknown AUDIT_BACKEND: {backend}")
+
+
+class BufferedAuditWriter:
+    """
+    Bounded in-process audit buffer drained by a background writer thread.
+
+    Request handlers only enqueue plain dicts; the writer flushes them in batches
+    (AUDIT_BATCH_SIZE rows or every AUDIT_FLUSH_INTERVAL_SECONDS, whichever comes first)
+    through its sink, so audit writes never share or commit the caller's session.
+
+    Overflow policies when the buffer is full:
+    - block: wait up to AUDIT_BLOCK_TIMEOUT_SECONDS for space, then drop the new row
+    - drop_newest: drop the new row immediately
+    - drop_oldest: evict the oldest buffered row to make room
+    """
+
+    def __init__(self, sink=None):
+        settings = get_settings()
+        if settings.AUDIT_OVERFLOW_POLICY not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown AUDIT_OVERFLOW_POLICY: {settings.AUDIT_OVERFLOW_POLICY}")
+
+        self.sink = sink or create_audit_sink()
+        self.batch_size = settings.AUDIT_BATCH_SIZE
+        self.flush_interval = settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self.overflow_policy = settings.AUDIT_OVERFLOW_POLICY
+        self.block_timeout = settings.AUDIT_BLOCK_TIMEOUT_SECONDS
+
+        self._queue = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _ensure_started(self):
+        # Threads do not survive fork (gunicorn workers); start lazily in each process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, row: dict) -> bool:
+        """
+        Enqueue an audit row. Never raises and never blocks longer than the block timeout.
+
+        Returns:
+            bool: False if the row was dropped because of overflow or shutdown
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+
+        self._ensure_started()
+
+        try:
+            if self.overflow_policy == 'block':
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == 'drop_oldest':
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+                self._queue.put_nowait(row)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+
+        self.dropped += 1
+        return False
+
+    def _write(self, batch: list[dict]):
+        for attempt in range(_WRITE_RETRIES):
+            try:
+                self.sink.write_batch(batch)
+                self.written += len(batch)
+                return
+            except Exception as e:
+                print(f"Audit batch write failed (attempt {attempt + 1}/{_WRITE_RETRIES}): {str(e)}")
+                time.sleep(0.5 * (attempt + 1))
+        self.failed += len(batch)
+
+    def _idle(self):
+        idle = getattr(self.sink, 'idle', None)
+        if idle is None:
+            return
+        try:
+            idle()
+        except Exception as e:
+            print(f"Audit sink maintenance failed: {str(e)}")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._idle()
+                continue
+
+            batch = []
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+
+            # Collect until the batch is full or the flush interval has elapsed
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            # On shutdown, drain whatever is left without waiting
+            while stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+
+            for start in range(0, len(batch), self.batch_size):
+                self._write(batch[start:start + self.batch_size])
+
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row has been written (or given up on)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Stop accepting rows, flush the buffer and stop the writer thread."""
+        self._closed = True
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("Audit writer shutdown: buffer still full, remaining rows may be lost")
+            return
+        self._thread.join(timeout)
+        
+        close_sink = getattr(self.sink, 'close', None)
+        if close_sink is not None:
+            try:
+                close_sink()
+            except Exception as e:
+                print(f"Audit sink shutdown failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "overflow_policy": self.overflow_policy
+        }
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_audit_writer() -> BufferedAuditWriter:
+    """Process-wide audit writer (created on first use)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = BufferedAuditWriter()
+    return _writer
+
+def shutdown_audit_writer():
+    """Flush and stop the process-wide writer (called on application shutdown)."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
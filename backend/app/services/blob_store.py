@@ -0,0 +1,311 @@
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from ..models.material import StudyMaterial, MaterialBlob
+from ..utils import utc_now
+from .uploads import ReceivedFile
+from .downloads import is_compressible
+
+UPLOAD_DIR = "uploads"
+BLOB_DIR = os.path.join(UPLOAD_DIR, "blobs")
+GC_GRACE_SECONDS = 3600  # Unreferenced files / temp files younger than this may belong to an upload in flight
+GZIP_MAX_RATIO = 0.9  # Keep a precompressed copy only if it saves at least 10%
+
+
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _lock_content(db: Session, sha256: str):
+    """
+    Serialize add() against file removal for one content hash until the transaction
+    ends: a transaction-level advisory lock on PostgreSQL. SQLite has a single writer,
+    so any write statement (here an UPDATE that changes nothing) takes the lock.
+    """
+    if db.bind.dialect.name == 'postgresql':
+        key = int(sha256[:16], 16)
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key - (1 << 64) if key >= 1 << 63 else key})
+    else:
+        db.query(MaterialBlob).filter(MaterialBlob.sha256 == sha256).update(
+            {MaterialBlob.ref_count: MaterialBlob.ref_count}, synchronize_session=False
+        )
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(BLOB_DIR, sha256[:2], sha256)
+
+
+def compressed_path(sha256: str) -> str:
+    """The optional gzip copy served to clients that accept it."""
+    return blob_path(sha256) + ".gz"
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _hash_file(path: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """
+    Content-addressed, reference-counted storage for study material files.
+
+    A file is stored once under its SHA-256, however many materials use it. Uploads
+    stream into BLOB_DIR (same filesystem), so storing a new blob is a rename and a
+    duplicate is just a dropped temp file plus ref_count + 1. Methods run in the
+    caller's transaction (blocking: call from the thread pool). Files are unlinked
+    only after the deleting transaction committed, by remove_files, which takes the
+    same per-hash lock as add and skips content whose row exists again, so an upload
+    and the deletion of the last reference to the same content cannot interleave.
+    """
+
+    @staticmethod
+    def add(db: Session, received: ReceivedFile) -> tuple[str, bool]:
+        """
+        Take a reference to the received file's content, storing it if new.
+
+        Returns:
+            tuple: (blob path, deduplicated)
+        """
+        _lock_content(db, received.sha256)
+        table = MaterialBlob.__table__
+        insert = _dialect_insert(db)
+        stmt = insert(table).values(
+            sha256=received.sha256, size=received.size, ref_count=1, created_at=utc_now()
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['sha256'],
+            set_={"ref_count": table.c.ref_count + 1}
+        ))
+
+        path = blob_path(received.sha256)
+        if os.path.exists(path):
+            _remove(received.temp_path)
+            return path, True
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(received.temp_path, path)
+        return path, False
+
+    @staticmethod
+    def reference(db: Session, sha256: str) -> MaterialBlob | None:
+        """Take another reference to a stored blob (upload by hash); None if unknown."""
+        blob = db.query(MaterialBlob).filter(MaterialBlob.sha256 == sha256).with_for_update().first()
+        if blob is None or blob.ref_count <= 0 or not os.path.exists(blob_path(sha256)):
+            return None
+        blob.ref_count += 1
+        return blob
+
+    @staticmethod
+    def release(db: Session, sha256: str) -> Optional[list[str]]:
+        """
+        Drop one reference; the last one deletes the blob row (caller commits).
+
+        Returns:
+            list: Files to remove once the transaction has committed (empty while
+                  other references remain), or None if the hash is not in the
+                  store (legacy file)
+        """
+        blob = db.query(MaterialBlob).filter(MaterialBlob.sha256 == sha256).with_for_update().first()
+        if blob is None:
+            return None
+
+        blob.ref_count -= 1
+        if blob.ref_count <= 0:
+            db.delete(blob)
+            db.flush()
+            return [blob_path(sha256), compressed_path(sha256)]
+        return []
+
+    @staticmethod
+    def remove_files(db: Session, paths: list[str]) -> int:
+        """
+        Delete files after the transaction that dropped them committed (a failed
+        commit leaves them in place). Each blob's files are removed in a short
+        transaction under the per-hash lock, and kept if an upload has recreated the
+        blob row meanwhile. Paths outside BLOB_DIR (legacy files) are just removed.
+        A failure leaves orphans for collect.
+
+        Returns:
+            int: Number of paths removed
+        """
+        by_hash: dict[str, list[str]] = {}
+        removed = 0
+        for path in paths:
+            if path.startswith(BLOB_DIR + os.sep):
+                by_hash.setdefault(os.path.basename(path).removesuffix(".gz"), []).append(path)
+            else:
+                _remove(path)
+                removed += 1
+
+        for sha256, files in by_hash.items():
+            try:
+                _lock_content(db, sha256)
+                if db.query(MaterialBlob.sha256).filter(MaterialBlob.sha256 == sha256).first() is None:
+                    for path in files:
+                        _remove(path)
+                    removed += len(files)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Blob file removal failed for {sha256}: {str(e)}")
+        return removed
+
+    @staticmethod
+    def precompress(sha256: str) -> bool:
+        """
+        Write the blob's gzip copy if it doesn't exist (blocking: background task or
+        CLI). The copy is dropped when it saves less than GZIP_MAX_RATIO.
+
+        Returns:
+            bool: True if a gzip copy exists afterwards
+        """
+        source, target = blob_path(sha256), compressed_path(sha256)
+        if os.path.exists(target) or not os.path.exists(source):
+            return os.path.exists(target)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(source), prefix=".gzip-", suffix=".part")
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+                raw.flush()
+                os.fsync(raw.fileno())
+            if os.path.getsize(temp_path) > os.path.getsize(source) * GZIP_MAX_RATIO:
+                _remove(temp_path)
+                return False
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, target)
+            return True
+        except BaseException:
+            _remove(temp_path)
+            raise
+
+    @staticmethod
+    def precompress_all(db: Session) -> dict:
+        """Write missing gzip copies for blobs used by text-format materials (backfill)."""
+        hashes = {
+            row.content_sha256
+            for row in db.query(StudyMaterial.content_sha256, StudyMaterial.file_name).filter(
+                StudyMaterial.content_sha256.isnot(None)
+            ).distinct().all()
+            if is_compressible(row.file_name)
+        }
+        compressed = sum(1 for sha256 in sorted(hashes) if BlobStore.precompress(sha256))
+        return {"text_blobs": len(hashes), "compressed": compressed}
+
+    @staticmethod
+    def collect(db: Session) -> dict:
+        """
+        Repair and sweep the store (garbage collection) and commit: reset ref_count
+        from study_materials, delete unreferenced blobs, then files without a row
+        (gzip copies included) and stale temp files older than GC_GRACE_SECONDS.
+        """
+        repaired = deleted = 0
+        try:
+            # Lock first: uploads of known content wait, so the counts below stay exact
+            blobs = db.query(MaterialBlob).with_for_update().all()
+            unreferenced = []
+            references = dict(
+                db.query(StudyMaterial.content_sha256, func.count(StudyMaterial.id)).filter(
+                    StudyMaterial.content_sha256.isnot(None)
+                ).group_by(StudyMaterial.content_sha256).all()
+            )
+            for blob in blobs:
+                count = references.get(blob.sha256, 0)
+                if count == 0:
+                    db.delete(blob)
+                    unreferenced.extend([blob_path(blob.sha256), compressed_path(blob.sha256)])
+                    deleted += 1
+                elif blob.ref_count != count:
+                    blob.ref_count = count
+                    repaired += 1
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        BlobStore.remove_files(db, unreferenced)
+
+        known = {row.sha256 for row in db.query(MaterialBlob.sha256).all()}
+        cutoff = time.time() - GC_GRACE_SECONDS
+        temp_files = 0
+        orphan_files = []
+        for root, _, files in os.walk(BLOB_DIR):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                if name.endswith(".part"):
+                    _remove(path)
+                    temp_files += 1
+                elif name.removesuffix(".gz") not in known:
+                    orphan_files.append(path)
+        # Rechecked under the per-hash lock: an upload may have re-added the content since
+        orphans = BlobStore.remove_files(db, orphan_files)
+
+        return {
+            "blobs": len(known),
+            "ref_counts_repaired": repaired,
+            "unreferenced_deleted": deleted,
+            "orphan_files_deleted": orphans,
+            "temp_files_deleted": temp_files
+        }
+
+    @staticmethod
+    def import_legacy(db: Session) -> dict:
+        """
+        Move materials stored as uploads/<file name> into the blob store and commit.
+        Materials sharing one legacy path (same name uploaded twice) share its blob.
+        """
+        legacy = {}
+        for material in db.query(StudyMaterial).all():
+            if not material.file_path.startswith(BLOB_DIR + os.sep):
+                legacy.setdefault(material.file_path, []).append(material)
+
+        imported = missing = 0
+        for path, materials in legacy.items():
+            if not os.path.exists(path):
+                missing += len(materials)
+                continue
+
+            sha256, size = _hash_file(path)
+            try:
+                received = ReceivedFile(os.path.basename(path), path, size, sha256)
+                stored, _ = BlobStore.add(db, received)
+                if len(materials) > 1:
+                    db.query(MaterialBlob).filter(MaterialBlob.sha256 == sha256).update(
+                        {MaterialBlob.ref_count: MaterialBlob.ref_count + len(materials) - 1},
+                        synchronize_session=False
+                    )
+                for material in materials:
+                    material.file_path = stored
+                    material.file_size = size
+                    material.content_sha256 = sha256
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            imported += len(materials)
+
+        return {"materials_imported": imported, "files_missing": missing}
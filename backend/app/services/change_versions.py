@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+from ..models.change_version import ChangeVersion
+from ..config import get_settings
+from ..utils import utc_now
+
+# Per-worker cache: scope -> (version, fetched_at monotonic time)
+_cache: dict[str, tuple[int, float]] = {}
+_cache_lock = threading.Lock()
+
+
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def user_scope(scope: str, user_id) -> str:
+    """Per-user sub-scope, e.g. 'attendance:user:<id>'."""
+    return f"{scope}:user:{user_id}"
+
+
+def _forget(scopes):
+    with _cache_lock:
+        for scope in scopes:
+            _cache.pop(scope, None)
+
+
+class ChangeVersionService:
+    """
+    Monotonic change versions per data scope, used to build ETags for list endpoints.
+
+    Writers call bump() right before committing, so the version moves with the data.
+    Readers call etag(); versions are cached per worker for CHANGE_VERSION_CACHE_SECONDS,
+    so a repeated If-None-Match check usually costs no query at all and otherwise one
+    primary-key lookup. Writes made by this worker drop the cached entries on commit;
+    writes from other workers become visible within the cache window.
+    """
+
+    @staticmethod
+    def bump(db: Session, *scopes: str):
+        """
+        Increment the version of each scope inside the caller's transaction.
+        Call as close to db.commit() as possible: the scope rows stay locked until then.
+        """
+        if not scopes:
+            return
+
+        insert = _dialect_insert(db)
+        stmt = insert(ChangeVersion.__table__).values([
+            {"scope": scope, "version": 1, "updated_at": utc_now()}
+            for scope in sorted(set(scopes))  # Stable lock order across concurrent writers
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['scope'],
+            set_={
+                "version": ChangeVersion.__table__.c.version + 1,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt)
+
+        # Local readers must not keep serving the old version once this commits
+        sa_event.listen(db, "after_commit", lambda session: _forget(scopes), once=True)
+
+    @staticmethod
+    def get_versions(db: Session, scopes: list[str]) -> dict[str, int]:
+        """
+        Current version per scope (0 for scopes never written).
+        Served from the per-worker cache when fresh; otherwise one query for the stale scopes.
+        """
+        ttl = get_settings().CHANGE_VERSION_CACHE_SECONDS
+        now = time.monotonic()
+        versions = {}
+        missing = []
+
+        with _cache_lock:
+            for scope in scopes:
+                cached = _cache.get(scope)
+                if cached is not None and now - cached[1] < ttl:
+                    versions[scope] = cached[0]
+                else:
+                    missing.append(scope)
+
+        if missing:
+            rows = db.query(ChangeVersion.scope, ChangeVersion.version).filter(
+                ChangeVersion.scope.in_(missing)
+            ).all()
+            fetched = {scope: 0 for scope in missing}
+            fetched.update({row.scope: row.version for row in rows})
+
+            with _cache_lock:
+                for scope, version in fetched.items():
+                    _cache[scope] = (version, now)
+            versions.update(fetched)
+
+        return versions
+
+    @staticmethod
+    def fingerprint(db: Session, scopes: list[str]) -> str:
+        """Hash of the current versions of `scopes`; changes whenever any of them is bumped."""
+        versions = ChangeVersionService.get_versions(db, scopes)
+        return hashlib.sha256(
+            "|".join(f"{scope}={versions[scope]}" for scope in scopes).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def etag(db: Session, resource: str, scopes: list[str], *vary) -> str:
+        """
+        Strong ETag for a representation of `resource` built from `scopes`.
+
+        Args:
+            db: Database session
+            resource: Endpoint identifier (e.g. 'events:list')
+            scopes: Change-version scopes the response is derived from
+            vary: Anything else the body depends on (user id, role, query parameters)
+        """
+        versions = ChangeVersionService.get_versions(db, scopes)
+        key = "|".join(
+            [resource]
+            + [f"{scope}={versions[scope]}" for scope in scopes]
+            + [str(v) for v in vary]
+        )
+        return '"' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '"'
@@ -0,0 +1,145 @@
+import mimetypes
+import os
+from typing import Optional
+from urllib.parse import quote
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Text formats worth storing a gzip copy of (see BlobStore.precompress)
+COMPRESSIBLE_EXTENSIONS = {
+    ".csv", ".tsv", ".json", ".jsonl", ".ipynb", ".txt", ".md", ".py", ".r", ".sql",
+    ".html", ".xml", ".yaml", ".yml", ".svg", ".arff"
+}
+
+mimetypes.add_type("application/x-ipynb+json", ".ipynb")
+mimetypes.add_type("application/jsonl", ".jsonl")
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def is_compressible(file_name: str) -> bool:
+    return os.path.splitext(file_name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def media_type(file_name: str) -> str:
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def content_disposition(file_name: str) -> str:
+    """attachment with an ASCII fallback plus the RFC 5987 UTF-8 name."""
+    fallback = file_name.encode("ascii", "replace").decode().replace('"', "'").replace("?", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(file_name)}"
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True if Accept-Encoding lists gzip (or *) with a non-zero q."""
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            return not params or float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    A single `bytes=` range as (start, end inclusive), clamped to the file.
+
+    Returns None when the whole file should be sent: no header, a unit other than
+    bytes, malformed syntax or several ranges (RFC 9110 lets a server ignore Range).
+
+    Raises:
+        RangeNotSatisfiable: The range starts past the end of the file (416)
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class FileSliceResponse(Response):
+    """
+    Sends a file, or the inclusive `byte_range` of it as a 206.
+
+    Uses the ASGI `http.response.zerocopysend` extension (the server calls
+    sendfile on the open descriptor) or `http.response.pathsend` when the server
+    offers one; otherwise the file is read in `chunk_bytes` pieces in a worker
+    thread, so memory stays at one chunk per download whatever the file size.
+    """
+
+    def __init__(self, path: str, size: int, byte_range: Optional[tuple[int, int]] = None,
+                 headers: Optional[dict] = None, media_type: Optional[str] = None,
+                 chunk_bytes: int = 1024 * 1024):
+        self.path = path
+        self.size = size
+        self.offset, end = byte_range if byte_range else (0, size - 1)
+        self.length = end - self.offset + 1
+        self.chunk_bytes = chunk_bytes
+        self.status_code = 206 if byte_range else 200
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {self.offset}-{end}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.pathsend" in extensions and self.length == self.size:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            if "http.response.zerocopysend" in extensions:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.wrapped,
+                    "offset": self.offset,
+                    "count": self.length
+                })
+                return
+
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_bytes, remaining))
+                if not chunk:
+                    break  # File shrank underneath us; the client sees a short body
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                await send({"type": "http.response.body", "body": b""})
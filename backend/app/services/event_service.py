@@ -0,0 +1,52 @@
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from ..models.event import Event
+from ..utils.pagination import encode_cursor
+
+
+class EventService:
+    """Shared filtering and keyset pagination for event listings (newest first)."""
+
+    @staticmethod
+    def filter_window(
+        query: Query,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        after: tuple[datetime, str] | None = None
+    ) -> Query:
+        """
+        Restrict an Event query to [start, end) and to rows after a keyset position,
+        ordered by (scheduled_at, id) descending.
+
+        Args:
+            query: Query selecting Event (possibly with joined columns)
+            start: Inclusive lower bound on scheduled_at
+            end: Exclusive upper bound on scheduled_at
+            after: Keyset position (scheduled_at, id) of the last row of the previous page
+        """
+        if start is not None:
+            query = query.filter(Event.scheduled_at >= start)
+        if end is not None:
+            query = query.filter(Event.scheduled_at < end)
+        if after is not None:
+            query = query.filter(tuple_(Event.scheduled_at, Event.id) < after)
+        return query.order_by(Event.scheduled_at.desc(), Event.id.desc())
+
+    @staticmethod
+    def fetch_page(query: Query, limit: int | None) -> tuple[list, str | None]:
+        """
+        Run a query built by filter_window and return (rows, next_cursor).
+        With no limit every row is returned and next_cursor is None.
+        """
+        if limit is None:
+            return query.all(), None
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1] if isinstance(rows[-1], Event) else rows[-1][0]
+        return rows, encode_cursor(last.scheduled_at, last.id)
@@ -0,0 +1,218 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterator
+import pyarrow as pa
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.attendance import AttendanceRecord
+from ..models.event import Event
+from ..models.user import User, UserRole
+from ..utils import ensure_utc
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MEMBER_COLUMNS = [
+    ("user_id", pa.string()),
+    ("full_name", pa.string()),
+    ("email", pa.string()),
+    ("branch", pa.string()),
+    ("year", pa.string()),
+]
+
+RECORD_COLUMNS = [
+    ("record_id", pa.string()),
+    ("event_id", pa.string()),
+    ("event_title", pa.string()),
+    ("event_scheduled_at", pa.timestamp('us', tz='UTC')),
+    ("user_id", pa.string()),
+    ("full_name", pa.string()),
+    ("email", pa.string()),
+    ("branch", pa.string()),
+    ("year", pa.string()),
+    ("marked_at", pa.timestamp('us', tz='UTC')),
+]
+
+
+class _ChunkSink:
+    """Write-only file object collecting what the Arrow writer emits between drains."""
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self.closed = False
+
+    def write(self, data) -> int:
+        return self._buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+def _csv_line(values) -> str:
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(values)
+    return out.getvalue()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return ensure_utc(value).isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _arrow_value(value):
+    if isinstance(value, datetime):
+        return ensure_utc(value)
+    return value
+
+
+def _encode_csv(columns: list[str], chunks: Iterator[list[tuple]]) -> Iterator[str]:
+    yield _csv_line(columns)
+    for rows in chunks:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield out.getvalue()
+
+
+def _encode_arrow(schema: pa.Schema, chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    """One Arrow record batch per chunk, written as an IPC stream."""
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    yield sink.drain()  # Schema message
+    for rows in chunks:
+        columns = list(zip(*rows)) if rows else [[] for _ in schema]
+        batch = pa.record_batch(
+            [
+                pa.array([_arrow_value(v) for v in values], type=field.type)
+                for values, field in zip(columns, schema)
+            ],
+            schema=schema
+        )
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()  # End-of-stream marker
+
+
+class ExportService:
+    """
+    Streaming exports of attendance data in CSV or Arrow IPC stream format.
+
+    Rows are read from a server-side cursor in chunks of `chunk_size` and encoded
+    chunk by chunk (one Arrow record batch per chunk), so memory stays flat however
+    large the history is. Generators are synchronous: Starlette iterates them in its
+    thread pool, so a long export does not hold up the event loop.
+    """
+
+    @staticmethod
+    def _records_statement(since: datetime | None, until: datetime | None, event_id: str | None):
+        statement = select(
+            AttendanceRecord.id,
+            Event.id,
+            Event.title,
+            Event.scheduled_at,
+            User.id,
+            User.full_name,
+            User.email,
+            User.branch,
+            User.year,
+            AttendanceRecord.marked_at
+        ).join(Event, Event.id == AttendanceRecord.event_id).join(
+            User, User.id == AttendanceRecord.user_id
+        ).where(Event.is_deleted == False)
+
+        if since:
+            statement = statement.where(AttendanceRecord.marked_at >= since)
+        if until:
+            statement = statement.where(AttendanceRecord.marked_at < until)
+        if event_id:
+            statement = statement.where(AttendanceRecord.event_id == event_id)
+        return statement.order_by(AttendanceRecord.marked_at, AttendanceRecord.id)
+
+    @staticmethod
+    def attendance_records(db: Session, fmt: str, chunk_size: int,
+                           since: datetime | None = None, until: datetime | None = None,
+                           event_id: str | None = None) -> Iterator:
+        """
+        Every attendance record of a non-deleted event, oldest first, joined with its
+        event and member.
+
+        Args:
+            db: Session owned by the generator (closed by the caller)
+            fmt: 'csv' or 'arrow'
+            chunk_size: Rows fetched from the cursor and encoded at a time
+            since, until: Optional marked_at window
+            event_id: Optional single event
+        """
+        statement = ExportService._records_statement(since, until, event_id)
+
+        def chunks():
+            result = db.execute(statement, execution_options={"stream_results": True, "yield_per": chunk_size})
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+        if fmt == 'arrow':
+            return _encode_arrow(pa.schema(RECORD_COLUMNS), chunks())
+        return _encode_csv([name for name, _ in RECORD_COLUMNS], chunks())
+
+    @staticmethod
+    def attendance_matrix(db: Session, fmt: str, chunk_size: int,
+                          include_inactive: bool = True) -> Iterator:
+        """
+        Members × events matrix: one row per student, one boolean column per
+        non-deleted event (named by event id, oldest first).
+
+        Members are read from a server-side cursor; each chunk of members fetches its
+        attendance with one query, so only one chunk of the matrix is in memory.
+        """
+        events = db.execute(
+            select(Event.id).where(Event.is_deleted == False).order_by(Event.scheduled_at, Event.id)
+        ).scalars().all()
+        event_position = {event_id: i for i, event_id in enumerate(events)}
+
+        members = select(User.id, User.full_name, User.email, User.branch, User.year).where(
+            User.role == UserRole.STUDENT.value
+        )
+        if not include_inactive:
+            members = members.where(User.is_active == True)
+        members = members.order_by(User.full_name, User.id)
+
+        columns = MEMBER_COLUMNS + [(event_id, pa.bool_()) for event_id in events]
+
+        def chunks():
+            result = db.execute(members, execution_options={"stream_results": True, "yield_per": chunk_size})
+            for partition in result.partitions():
+                user_ids = [row.id for row in partition]
+                attended = {}
+                for user_id, event_id in db.execute(
+                    select(AttendanceRecord.user_id, AttendanceRecord.event_id).where(
+                        AttendanceRecord.user_id.in_(user_ids)
+                    )
+                ):
+                    position = event_position.get(event_id)
+                    if position is not None:
+                        attended.setdefault(user_id, set()).add(position)
+
+                rows = []
+                for row in partition:
+                    positions = attended.get(row.id, ())
+                    rows.append(tuple(row) + tuple(i in positions for i in range(len(events))))
+                yield rows
+
+        if fmt == 'arrow':
+            return _encode_arrow(pa.schema(columns), chunks())
+        return _encode_csv([name for name, _ in columns], chunks())
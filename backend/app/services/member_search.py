@@ -0,0 +1,237 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from sqlalchemy import func, case, or_, literal, literal_column, and_
+from sqlalchemy.orm import Session
+from ..models.user import User, UserRole
+from ..config import get_settings
+from .change_versions import ChangeVersionService
+
+# Rank of the strongest match kind; the fuzzy similarity (0..1) is added on top
+NAME_PREFIX = 3.0
+EMAIL_PREFIX = 2.5
+WORD_PREFIX = 2.0
+SUBSTRING = 1.0
+
+MIN_FUZZY_LENGTH = 3  # Shorter queries only match by prefix
+
+# Per-worker fallback index: (fingerprint, _LocalIndex)
+_local_index: dict[str, tuple[str, "_LocalIndex"]] = {}
+_local_lock = threading.Lock()
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def normalize_query(q: str) -> str:
+    return " ".join(q.lower().split())
+
+
+def search_document():
+    """
+    lower(full_name || ' ' || email || ' ' || branch || ' ' || section || ' ' || skills).
+    Must stay identical to the idx_users_search_trgm expression (migration 010).
+    """
+    space = literal_column("' '")
+    parts = [func.coalesce(column, literal_column("''")) for column in (
+        User.full_name, User.email, User.branch, User.section, User.skills
+    )]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document + space + part
+    return func.lower(document)
+
+
+def _document_text(full_name, email, branch, section, skills) -> str:
+    return " ".join(v or "" for v in (full_name, email, branch, section, skills)).lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trigrams(text: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two spaces in front and one behind."""
+    grams = set()
+    for word in _WORD.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _LocalIndex:
+    """
+    In-memory search index over students for databases without pg_trgm.
+    Sorted word list for prefix lookups (bisect) plus a trigram -> rows inverted index.
+    """
+
+    def __init__(self, rows):
+        self.ids = []
+        self.names = []
+        self.emails = []
+        self.documents = []
+        self.active = []
+        words = []
+        self.postings: dict[str, list[int]] = {}
+
+        for i, row in enumerate(rows):
+            self.ids.append(row.id)
+            self.names.append((row.full_name or "").lower())
+            self.emails.append((row.email or "").lower())
+            document = _document_text(row.full_name, row.email, row.branch, row.section, row.skills)
+            self.documents.append(document)
+            self.active.append(bool(row.is_active))
+            words.extend((word, i) for word in set(_WORD.findall(document)))
+            for gram in _trigrams(document):
+                self.postings.setdefault(gram, []).append(i)
+
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_rows = [i for _, i in words]
+
+    def _prefix_rows(self, q: str) -> set[int]:
+        rows = set()
+        # Multi-word queries match on their first word, then get checked as a substring
+        first = q.split(" ")[0]
+        start = bisect_left(self.words, first)
+        for position in range(start, len(self.words)):
+            if not self.words[position].startswith(first):
+                break
+            rows.add(self.word_rows[position])
+        return rows
+
+    def search(self, q: str, include_inactive: bool, threshold: float) -> list[tuple[int, float]]:
+        candidates = self._prefix_rows(q)
+
+        similarity = {}
+        grams = _trigrams(q)
+        if len(q) >= MIN_FUZZY_LENGTH and grams:
+            counts = Counter()
+            for gram in grams:
+                counts.update(self.postings.get(gram, ()))
+            similarity = {i: count / len(grams) for i, count in counts.items()}
+            candidates.update(i for i, score in similarity.items() if score >= threshold)
+
+        prefix = q
+        word_prefix = " " + q
+        results = []
+        for i in candidates:
+            if not include_inactive and not self.active[i]:
+                continue
+            document = self.documents[i]
+            if self.names[i].startswith(prefix):
+                rank = NAME_PREFIX
+            elif self.emails[i].startswith(prefix):
+                rank = EMAIL_PREFIX
+            elif document.startswith(prefix) or word_prefix in document:
+                rank = WORD_PREFIX
+            elif q in document:
+                rank = SUBSTRING
+            else:
+                rank = 0.0
+            score = rank + similarity.get(i, 0.0)
+            if rank or similarity.get(i, 0.0) >= threshold:
+                results.append((i, score))
+        return results
+
+
+class MemberSearchService:
+    """
+    Ranked member (student) search over name, email, branch, section and skills.
+
+    PostgreSQL uses the pg_trgm GIN index on search_document() plus the lower(name)
+    / lower(email) prefix indexes (migration 010). Other databases use a per-worker
+    in-memory index rebuilt when the "users" change version moves.
+
+    Ranking: name prefix > email prefix > word prefix > substring, then trigram
+    word similarity, then name.
+    """
+
+    @staticmethod
+    def search(db: Session, q: str, include_inactive: bool, offset: int, limit: int) -> tuple[list[tuple[str, float]], int]:
+        """
+        Returns:
+            tuple: ([(user_id, score), ...] for the requested page, total matches)
+        """
+        q = normalize_query(q)
+        if not q:
+            return [], 0
+
+        if db.bind.dialect.name == 'postgresql':
+            return MemberSearchService._search_postgres(db, q, include_inactive, offset, limit)
+        return MemberSearchService._search_local(db, q, include_inactive, offset, limit)
+
+    @staticmethod
+    def _search_postgres(db: Session, q: str, include_inactive: bool, offset: int, limit: int):
+        threshold = get_settings().MEMBER_SEARCH_SIMILARITY
+        document = search_document()
+        name = func.lower(User.full_name)
+        email = func.lower(User.email)
+        escaped = _escape_like(q)
+
+        rank = case(
+            (name.like(escaped + "%", escape="\\"), NAME_PREFIX),
+            (email.like(escaped + "%", escape="\\"), EMAIL_PREFIX),
+            (or_(
+                document.like(escaped + "%", escape="\\"),
+                document.like("% " + escaped + "%", escape="\\")
+            ), WORD_PREFIX),
+            (document.like("%" + escaped + "%", escape="\\"), SUBSTRING),
+            else_=0.0
+        )
+
+        if len(q) >= MIN_FUZZY_LENGTH:
+            # <% uses pg_trgm.word_similarity_threshold; set it for this transaction only
+            db.execute(
+                func.set_config('pg_trgm.word_similarity_threshold', str(threshold), True).select()
+            )
+            similarity = func.word_similarity(literal(q), document)
+            match = or_(
+                document.like("%" + escaped + "%", escape="\\"),
+                literal(q).op('<%')(document)
+            )
+        else:
+            similarity = literal(0.0)
+            match = or_(
+                name.like(escaped + "%", escape="\\"),
+                email.like(escaped + "%", escape="\\"),
+                document.like("% " + escaped + "%", escape="\\")
+            )
+
+        filters = [User.role == UserRole.STUDENT.value, match]
+        if not include_inactive:
+            filters.append(User.is_active == True)
+
+        score = (rank + similarity).label("score")
+        rows = db.query(
+            User.id, score, func.count().over().label("total")
+        ).filter(and_(*filters)).order_by(
+            score.desc(), User.full_name, User.id
+        ).offset(offset).limit(limit).all()
+
+        total = rows[0].total if rows else 0
+        return [(row.id, float(row.score)) for row in rows], total
+
+    @staticmethod
+    def _get_local_index(db: Session) -> _LocalIndex:
+        fingerprint = ChangeVersionService.fingerprint(db, ["users"])
+        with _local_lock:
+            cached = _local_index.get('students')
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        rows = db.query(
+            User.id, User.full_name, User.email, User.branch, User.section, User.skills, User.is_active
+        ).filter(User.role == UserRole.STUDENT.value).all()
+        index = _LocalIndex(rows)
+        with _local_lock:
+            _local_index['students'] = (fingerprint, index)
+        return index
+
+    @staticmethod
+    def _search_local(db: Session, q: str, include_inactive: bool, offset: int, limit: int):
+        index = MemberSearchService._get_local_index(db)
+        matches = index.search(q, include_inactive, get_settings().MEMBER_SEARCH_SIMILARITY)
+        matches.sort(key=lambda match: (-match[1], index.names[match[0]], index.ids[match[0]]))
+        page = matches[offset:offset + limit]
+        return [(index.ids[i], round(score, 4)) for i, score in page], len(matches)
@@ -0,0 +1,272 @@
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text, insert, select, delete
+from sqlalchemy.orm import Session
+from ..models.notification import Notification, NotificationArchive
+from ..config import get_settings
+from ..utils import utc_now
+from ..utils.partitions import add_months, is_partitioned, list_monthly_partitions, ensure_monthly_partitions
+
+ARCHIVE_BATCH_SIZE = 5000
+
+_ARCHIVED_COLUMNS = [
+    'id', 'recipient_id', 'type', 'title', 'message',
+    'notification_data', 'is_read', 'created_at', 'read_at'
+]
+
+def _row_to_dict(row) -> dict:
+    data = dict(zip(_ARCHIVED_COLUMNS, row))
+    # JSONB comes back from psycopg2 already decoded; keep the archive format uniform
+    if data['notification_data'] is not None and not isinstance(data['notification_data'], str):
+        data['notification_data'] = json.dumps(data['notification_data'])
+    return data
+
+
+class _FileArchive:
+    """
+    Writes rows as gzip-compressed JSON lines, one segment file per batch and creation
+    month (notifications-YYYY-MM-<segment>.jsonl.gz).
+
+    A segment is written and fsynced as a .part file before the source rows are
+    deleted, and renamed into place only once that transaction has committed, so a
+    failed commit followed by a retry never archives a row twice. recover() settles
+    .part files left by a crash between the commit and the rename.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._staged: list[str] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, db: Session, rows: list) -> None:
+        by_month: dict[str, list] = {}
+        for row in rows:
+            created_at = row[_ARCHIVED_COLUMNS.index('created_at')]
+            by_month.setdefault(created_at.strftime('%Y-%m'), []).append(row)
+
+        for month, month_rows in by_month.items():
+            path = os.path.join(self.directory, f"notifications-{month}-{uuid.uuid4().hex[:12]}.jsonl.gz.part")
+            self._staged.append(path)
+            with open(path, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as out:
+                    for row in month_rows:
+                        out.write(json.dumps(_row_to_dict(row), separators=(',', ':'), default=str).encode('utf-8'))
+                        out.write(b'\n')
+                # Archive must be durable before the source rows are deleted
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    def commit(self) -> None:
+        """Publish the staged segments (the source rows are gone for good)."""
+        for path in self._staged:
+            os.replace(path, path.removesuffix('.part'))
+        self._staged = []
+
+    def rollback(self) -> None:
+        """Discard the staged segments (the source rows are still there)."""
+        for path in self._staged:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._staged = []
+
+    def recover(self, db: Session) -> int:
+        """
+        Settle .part segments left by a crash: publish those whose rows are no longer
+        in notifications (the delete committed), remove the others.
+
+        Returns:
+            int: Number of segments published
+        """
+        published = 0
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith('.jsonl.gz.part'):
+                continue
+            path = os.path.join(self.directory, name)
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                ids = [json.loads(line)['id'] for line in f if line.strip()]
+            remaining = db.execute(
+                select(Notification.id).where(Notification.id.in_(ids)).limit(1)
+            ).first() if ids else None
+            if remaining is None:
+                os.replace(path, path.removesuffix('.part'))
+                published += 1
+            else:
+                os.remove(path)
+        return published
+
+
+class _TableArchive:
+    """Copies rows into notifications_archive inside the caller's transaction."""
+
+    def write(self, db: Session, rows: list) -> None:
+        if not rows:
+            return
+        archived_at = utc_now()
+        db.execute(
+            insert(NotificationArchive),
+            [{**_row_to_dict(row), 'archived_at': archived_at} for row in rows]
+        )
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def recover(self, db: Session) -> int:
+        return 0
+
+
+class NotificationRetentionService:
+    """
+    Keeps the hot notifications table small.
+
+    - Monthly range partitions on created_at (PostgreSQL, see migrations/003)
+    - Read notifications past the retention window are moved in bulk to an archive
+    - Fully expired partitions are archived and dropped instead of deleted row by row
+    """
+
+    @staticmethod
+    def _archive_backend():
+        settings = get_settings()
+        if settings.NOTIFICATION_ARCHIVE_BACKEND == 'table':
+            return _TableArchive()
+        if settings.NOTIFICATION_ARCHIVE_BACKEND == 'file':
+            return _FileArchive(settings.NOTIFICATION_ARCHIVE_DIR)
+        raise ValueError(f"Unknown NOTIFICATION_ARCHIVE_BACKEND: {settings.NOTIFICATION_ARCHIVE_BACKEND}")
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int | None = None) -> dict:
+        """
+        Create upcoming monthly partitions (no-op when notifications is not partitioned).
+        See ensure_monthly_partitions for the result.
+        """
+        if months_ahead is None:
+            months_ahead = get_settings().NOTIFICATION_PARTITIONS_AHEAD
+        return ensure_monthly_partitions(db, 'notifications', months_ahead)
+
+    @staticmethod
+    def archive_read_notifications(db: Session, older_than: datetime) -> int:
+        """
+        Move read notifications created before `older_than` to the archive in batches.
+        Each batch is one SELECT, one bulk archive write and one DELETE ... WHERE id IN (...).
+
+        Returns:
+            int: Number of notifications archived
+        """
+        archive = NotificationRetentionService._archive_backend()
+        archive.recover(db)
+        columns = [getattr(Notification, c) for c in _ARCHIVED_COLUMNS]
+        total = 0
+
+        while True:
+            rows = db.execute(
+                select(*columns).where(
+                    Notification.is_read == True,
+                    Notification.created_at < older_than
+                ).order_by(Notification.created_at).limit(ARCHIVE_BATCH_SIZE)
+            ).all()
+
+            if not rows:
+                break
+
+            try:
+                archive.write(db, rows)
+                db.execute(
+                    delete(Notification).where(Notification.id.in_([row[0] for row in rows])),
+                    execution_options={"synchronize_session": False}
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                archive.rollback()
+                raise
+            archive.commit()
+            total += len(rows)
+
+            if len(rows) < ARCHIVE_BATCH_SIZE:
+                break
+
+        return total
+
+    @staticmethod
+    def drop_expired_partitions(db: Session, older_than: datetime) -> list[str]:
+        """
+        Archive and drop monthly partitions that lie entirely before `older_than`.
+
+        Partitions still holding unread notifications are kept; their read rows are
+        handled by archive_read_notifications instead.
+
+        Returns:
+            list: Names of partitions that were dropped
+        """
+        if not is_partitioned(db, 'notifications'):
+            return []
+
+        settings = get_settings()
+        archive = NotificationRetentionService._archive_backend()
+        archive.recover(db)
+        column_list = ', '.join(_ARCHIVED_COLUMNS)
+        dropped = []
+
+        for name, lower in list_monthly_partitions(db, 'notifications'):
+            if add_months(lower, 1) > older_than:
+                break
+
+            has_unread = db.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {name} WHERE is_read = FALSE)"
+            )).scalar()
+            if has_unread:
+                continue
+
+            try:
+                if settings.NOTIFICATION_ARCHIVE_BACKEND == 'table':
+                    # Single server-side copy; no rows travel through the worker
+                    db.execute(text(
+                        f"INSERT INTO notifications_archive ({column_list}, archived_at) "
+                        f"SELECT {column_list}, NOW() FROM {name} ON CONFLICT (id) DO NOTHING"
+                    ))
+                else:
+                    result = db.execute(
+                        text(f"SELECT {column_list} FROM {name}"),
+                        execution_options={"stream_results": True, "yield_per": ARCHIVE_BATCH_SIZE}
+                    )
+                    for rows in result.partitions():
+                        archive.write(db, rows)
+
+                db.execute(text(f"ALTER TABLE notifications DETACH PARTITION {name}"))
+                db.execute(text(f"DROP TABLE {name}"))
+                db.commit()
+            except Exception:
+                db.rollback()
+                archive.rollback()
+                raise
+            archive.commit()
+            dropped.append(name)
+
+        return dropped
+
+    @staticmethod
+    def run(db: Session, retention_days: int | None = None) -> dict:
+        """Run a full retention pass: create upcoming partitions, drop expired ones, archive the rest."""
+        if retention_days is None:
+            retention_days = get_settings().NOTIFICATION_RETENTION_DAYS
+        cutoff = utc_now() - timedelta(days=retention_days)
+
+        partitions = NotificationRetentionService.ensure_partitions(db)
+        dropped = NotificationRetentionService.drop_expired_partitions(db, cutoff)
+        archived = NotificationRetentionService.archive_read_notifications(db, cutoff)
+
+        return {
+            "cutoff": cutoff.isoformat(),
+            "partitions_created": partitions["created"],
+            "partitions_skipped": partitions["skipped"],
+            "rows_moved_from_default": partitions["rows_moved"],
+            "partitions_dropped": dropped,
+            "rows_archived": archived
+        }
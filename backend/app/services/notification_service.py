@@ -1,10 +1,20 @@
 import json
+import uuid
 from datetime import datetime
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from ..models.notification import Notification
+from ..models.notification import Notification, NotificationCounter
 from ..models.user import User, UserRole
 from ..utils import utc_now
 
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
 def serialize_for_json(obj):
     """Convert UUIDs and other non-serializable objects to strings."""
     if isinstance(obj, dict):
@@ -39,6 +49,8 @@ class NotificationService:
         )
         
         db.add(notification)
+        db.flush()
+        NotificationService._adjust_unread_count(db, notification.recipient_id, 1)
         db.commit()
         db.refresh(notification)
         
@@ -76,6 +88,28 @@ class NotificationService:
         rejection_reason: str = None
     ):
         """Notify user about their approval/rejection."""
+        NotificationService.create_notification(
+            db,
+            recipient_id=user_id,
+            **NotificationService._approval_decision_content(decision, approved_role, rejection_reason)
+        )
+    
+    @staticmethod
+    def notify_users_approval_decisions(
+        db: Session,
+        user_ids: list[str],
+        decision: str,
+        approved_role: str = None,
+        rejection_reason: str = None
+    ):
+        """Notify many users of the same decision (bulk approvals); does not commit."""
+        content = NotificationService._approval_decision_content(decision, approved_role, rejection_reason)
+        NotificationService.create_notifications(
+            db, [{"recipient_id": user_id, **content} for user_id in user_ids]
+        )
+    
+    @staticmethod
+    def _approval_decision_content(decision: str, approved_role: str = None, rejection_reason: str = None) -> dict:
         if decision == 'approved':
             title = 'Welcome to DS Club!'
             message = f'Your account has been approved as a {approved_role}. You can now log in.'
@@ -86,18 +120,54 @@ class NotificationService:
             title = 'Signup Request Expired'
             message = 'Your signup request expired after 3 minutes of inactivity.'
         
-        NotificationService.create_notification(
-            db,
-            recipient_id=user_id,
-            type='approval_decision',
-            title=title,
-            message=message,
-            data={
+        return {
+            "type": 'approval_decision',
+            "title": title,
+            "message": message,
+            "data": {
                 'decision': decision,
                 'approved_role': approved_role,
                 'rejection_reason': rejection_reason
             }
-        )
+        }
+    
+    @staticmethod
+    def create_notifications(db: Session, notifications: list[dict]) -> int:
+        """
+        Insert many notifications with one multi-row INSERT and update the unread
+        counters set-based, inside the caller's transaction (no commit).
+        
+        Args:
+            notifications: dicts with recipient_id, type, title and optional message / data
+        
+        Returns:
+            int: Number of notifications inserted
+        """
+        if not notifications:
+            return 0
+        
+        now = utc_now()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "recipient_id": str(n["recipient_id"]),
+                "type": n["type"],
+                "title": n["title"],
+                "message": n.get("message"),
+                "notification_data": json.dumps(serialize_for_json(n["data"])) if n.get("data") else None,
+                "is_read": False,
+                "created_at": now
+            }
+            for n in notifications
+        ]
+        db.execute(Notification.__table__.insert(), rows)
+        
+        deltas = {}
+        for row in rows:
+            deltas[row["recipient_id"]] = deltas.get(row["recipient_id"], 0) + 1
+        NotificationService._adjust_unread_counts(db, deltas)
+        
+        return len(rows)
     
     @staticmethod
     def notify_admins_attendance_update(db: Session, event_id: str, event_title: str, user_name: str, attendance_count: int):
@@ -122,33 +192,188 @@ class NotificationService:
                 }
             )
     
+    @staticmethod
+    def _adjust_unread_count(db: Session, user_id: str, delta: int):
+        """
+        Apply a delta to the user's unread counter inside the caller's transaction.
+        
+        The UPDATE is a single atomic increment, so concurrent writers never lose counts.
+        A missing counter row is seeded from the notifications table once (this also
+        backfills users created before counters existed).
+        """
+        def increment():
+            return db.query(NotificationCounter).filter(
+                NotificationCounter.user_id == user_id
+            ).update(
+                {
+                    NotificationCounter.unread_count: NotificationCounter.unread_count + delta,
+                    NotificationCounter.updated_at: utc_now()
+                },
+                synchronize_session=False
+            )
+        
+        if increment():
+            return
+        
+        # First touch for this user: seed from the (already flushed) notifications
+        unread = db.query(func.count(Notification.id)).filter(
+            Notification.recipient_id == user_id,
+            Notification.is_read == False
+        ).scalar()
+        try:
+            with db.begin_nested():
+                db.add(NotificationCounter(user_id=user_id, unread_count=unread, updated_at=utc_now()))
+        except IntegrityError:
+            # Another transaction seeded the row first and cannot see our change yet
+            increment()
+    
+    @staticmethod
+    def _adjust_unread_counts(db: Session, deltas: dict[str, int]):
+        """
+        Set-based _adjust_unread_count for many users: one UPDATE per distinct delta
+        for existing counters, one upsert seeding the missing ones from the (already
+        flushed) notifications table.
+        """
+        if not deltas:
+            return
+        
+        now = utc_now()
+        existing = {row.user_id for row in db.query(NotificationCounter.user_id).filter(
+            NotificationCounter.user_id.in_(list(deltas))
+        ).all()}
+        
+        by_delta = {}
+        for user_id, delta in deltas.items():
+            if user_id in existing:
+                by_delta.setdefault(delta, []).append(user_id)
+        for delta, user_ids in by_delta.items():
+            db.query(NotificationCounter).filter(
+                NotificationCounter.user_id.in_(user_ids)
+            ).update(
+                {
+                    NotificationCounter.unread_count: NotificationCounter.unread_count + delta,
+                    NotificationCounter.updated_at: now
+                },
+                synchronize_session=False
+            )
+        
+        missing = [user_id for user_id in deltas if user_id not in existing]
+        if not missing:
+            return
+        
+        unread = dict(db.query(Notification.recipient_id, func.count(Notification.id)).filter(
+            Notification.recipient_id.in_(missing),
+            Notification.is_read == False
+        ).group_by(Notification.recipient_id).all())
+        
+        insert = _dialect_insert(db)
+        table = NotificationCounter.__table__
+        missing_by_delta = {}
+        for user_id in missing:
+            missing_by_delta.setdefault(deltas[user_id], []).append(user_id)
+        for delta, user_ids in missing_by_delta.items():
+            stmt = insert(table).values([
+                {"user_id": user_id, "unread_count": unread.get(user_id, 0), "updated_at": now}
+                for user_id in user_ids
+            ])
+            # Seeded concurrently by a transaction that cannot see our rows: add our delta
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id'],
+                set_={
+                    "unread_count": table.c.unread_count + delta,
+                    "updated_at": stmt.excluded.updated_at
+                }
+            )
+            db.execute(stmt)
+    
     @staticmethod
     def mark_as_read(db: Session, notification_id: str, user_id: str):
         """Mark a notification as read."""
-        notification = db.query(Notification).filter(
-            Notification.id == notification_id,
-            Notification.recipient_id == user_id
-        ).first()
-        
-        if notification and not notification.is_read:
-            notification.is_read = True
-            notification.read_at = utc_now()
-            db.commit()
+        NotificationService.mark_many_as_read(db, user_id, notification_ids=[notification_id])
     
     @staticmethod
-    def get_user_notifications(db: Session, user_id: str, unread_only: bool = False, limit: int = 50):
-        """Get notifications for a user."""
+    def mark_many_as_read(
+        db: Session,
+        user_id: str,
+        notification_ids: list[str] | None = None,
+        before: tuple[datetime, str] | None = None
+    ) -> int:
+        """
+        Mark notifications as read with a single UPDATE statement.
+        
+        Args:
+            db: Database session
+            user_id: Recipient whose notifications are updated
+            notification_ids: Explicit ids to mark (ignored if None)
+            before: Keyset position (created_at, id); marks everything at or older than it.
+                    When neither ids nor before are given, all unread notifications are marked.
+        
+        Returns:
+            int: Number of notifications that changed from unread to read
+        """
+        query = db.query(Notification).filter(
+            Notification.recipient_id == user_id,
+            Notification.is_read == False
+        )
+        
+        if notification_ids is not None:
+            if not notification_ids:
+                return 0
+            query = query.filter(Notification.id.in_(notification_ids))
+        
+        if before is not None:
+            query = query.filter(tuple_(Notification.created_at, Notification.id) <= before)
+        
+        changed = query.update(
+            {Notification.is_read: True, Notification.read_at: utc_now()},
+            synchronize_session=False
+        )
+        
+        if changed:
+            NotificationService._adjust_unread_count(db, user_id, -changed)
+        db.commit()
+        
+        return changed
+    
+    @staticmethod
+    def get_user_notifications(
+        db: Session,
+        user_id: str,
+        unread_only: bool = False,
+        limit: int = 50,
+        after: tuple[datetime, str] | None = None
+    ):
+        """
+        Get notifications for a user, newest first.
+        
+        Args:
+            after: Keyset position (created_at, id) of the last row of the previous page
+        """
         query = db.query(Notification).filter(Notification.recipient_id == user_id)
         
         if unread_only:
             query = query.filter(Notification.is_read == False)
         
-        return query.order_by(Notification.created_at.desc()).limit(limit).all()
+        if after is not None:
+            query = query.filter(tuple_(Notification.created_at, Notification.id) < after)
+        
+        return query.order_by(
+            Notification.created_at.desc(),
+            Notification.id.desc()
+        ).limit(limit).all()
     
     @staticmethod
     def get_unread_count(db: Session, user_id: str) -> int:
-        """Get count of unread notifications."""
-        return db.query(Notification).filter(
+        """Get count of unread notifications (primary key lookup on the counter table)."""
+        counter = db.query(NotificationCounter.unread_count).filter(
+            NotificationCounter.user_id == user_id
+        ).scalar()
+        
+        if counter is not None:
+            return counter
+        
+        # No counter yet (user never received a notification since counters were added)
+        return db.query(func.count(Notification.id)).filter(
             Notification.recipient_id == user_id,
             Notification.is_read == False
-        ).count()
+        ).scalar()
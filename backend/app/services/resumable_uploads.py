@@ -0,0 +1,193 @@
+import os
+import time
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from ..models.material import MaterialUpload
+from ..config import get_settings
+from ..utils import utc_now
+from .blob_store import UPLOAD_DIR, GC_GRACE_SECONDS, _hash_file, _remove
+from .uploads import ReceivedFile, safe_file_name
+
+# Same filesystem as the blob store, so finalizing is a rename
+RESUMABLE_DIR = os.path.join(UPLOAD_DIR, "incoming")
+
+
+def upload_path(upload_id: str) -> str:
+    return os.path.join(RESUMABLE_DIR, f"{upload_id}.part")
+
+
+def _preallocate(path: str, size: int):
+    """Create the file with `size` bytes reserved (real blocks where the OS supports it)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        if size:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+    except BaseException:
+        os.close(fd)
+        _remove(path)
+        raise
+    os.close(fd)
+
+
+class ResumableUploadService:
+    """
+    Resumable (chunked) study material uploads.
+
+    An upload is a material_uploads row plus a file preallocated to the full size.
+    Chunks must arrive in order: a PUT is accepted only at the current offset, is
+    written straight into the file under a per-file lock (ChunkWriter), and only
+    advances the offset once its SHA-256 matches. A dropped connection therefore
+    loses at most the chunk in flight. Finalize hashes the whole file and hands it
+    to the blob store. Uploads not touched for RESUMABLE_UPLOAD_EXPIRY_HOURS are
+    removed by the uploads-expire command.
+    """
+
+    @staticmethod
+    def create(db: Session, user_id: str, file_name: str, title: str, size: int,
+               description: str | None = None, event_id: str | None = None,
+               expected_sha256: str | None = None) -> MaterialUpload:
+        """
+        Start an upload and commit.
+
+        Raises:
+            OSError: The file could not be preallocated (e.g. disk full)
+        """
+        now = utc_now()
+        upload = MaterialUpload(
+            title=title,
+            description=description,
+            event_id=event_id or None,
+            file_name=safe_file_name(file_name),
+            size=size,
+            received=0,
+            expected_sha256=expected_sha256,
+            created_by=user_id,
+            created_at=now,
+            updated_at=now,
+            expires_at=now + timedelta(hours=get_settings().RESUMABLE_UPLOAD_EXPIRY_HOURS)
+        )
+        db.add(upload)
+        db.flush()
+
+        os.makedirs(RESUMABLE_DIR, exist_ok=True)
+        _preallocate(upload_path(upload.id), size)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            _remove(upload_path(upload.id))
+            raise
+        db.refresh(upload)
+        return upload
+
+    @staticmethod
+    def get(db: Session, upload_id: str, user_id: str) -> MaterialUpload | None:
+        """The user's upload, or None if unknown or expired."""
+        return db.query(MaterialUpload).filter(
+            MaterialUpload.id == upload_id,
+            MaterialUpload.created_by == user_id,
+            MaterialUpload.expires_at > utc_now()
+        ).first()
+
+    @staticmethod
+    def advance(db: Session, upload_id: str, offset: int, length: int) -> int | None:
+        """
+        Record a verified chunk written at `offset` and commit.
+
+        Returns:
+            int: The new offset, or None if the offset moved meanwhile
+        """
+        now = utc_now()
+        updated = db.query(MaterialUpload).filter(
+            MaterialUpload.id == upload_id,
+            MaterialUpload.received == offset,
+            MaterialUpload.size >= offset + length
+        ).update({
+            MaterialUpload.received: offset + length,
+            MaterialUpload.updated_at: now,
+            MaterialUpload.expires_at: now + timedelta(hours=get_settings().RESUMABLE_UPLOAD_EXPIRY_HOURS)
+        }, synchronize_session=False)
+        db.commit()
+        return offset + length if updated else None
+
+    @staticmethod
+    def verify(upload_id: str, file_name: str, size: int, expected_sha256: str | None) -> ReceivedFile:
+        """
+        Hash a complete upload's file (blocking, no database).
+
+        Raises:
+            ValueError: The file doesn't match the size or the SHA-256 declared at creation
+        """
+        path = upload_path(upload_id)
+        sha256, actual_size = _hash_file(path)
+        if actual_size != size:
+            raise ValueError(f"Upload file has {actual_size} bytes, expected {size}")
+        if expected_sha256 and sha256 != expected_sha256:
+            raise ValueError(f"SHA-256 mismatch: received {sha256}, expected {expected_sha256}")
+        return ReceivedFile(file_name, path, size, sha256)
+
+    @staticmethod
+    def claim(db: Session, upload_id: str, user_id: str) -> MaterialUpload | None:
+        """
+        Lock and delete the upload row for finalizing (caller commits), so only one
+        finalize can succeed. None if it is already gone.
+        """
+        upload = db.query(MaterialUpload).filter(
+            MaterialUpload.id == upload_id,
+            MaterialUpload.created_by == user_id,
+            MaterialUpload.received == MaterialUpload.size
+        ).with_for_update().first()
+        if upload is not None:
+            db.delete(upload)
+            db.flush()
+        return upload
+
+    @staticmethod
+    def abort(db: Session, upload_id: str, user_id: str) -> bool:
+        """Cancel an upload and delete its file; commits."""
+        deleted = db.query(MaterialUpload).filter(
+            MaterialUpload.id == upload_id,
+            MaterialUpload.created_by == user_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            _remove(upload_path(upload_id))
+        return bool(deleted)
+
+    @staticmethod
+    def expire(db: Session) -> dict:
+        """
+        Delete expired uploads and their files, then upload files without a row
+        (older than GC_GRACE_SECONDS, so a create in progress is left alone).
+        """
+        try:
+            expired = [
+                row.id for row in db.query(MaterialUpload.id).filter(
+                    MaterialUpload.expires_at <= utc_now()
+                ).all()
+            ]
+            if expired:
+                db.query(MaterialUpload).filter(
+                    MaterialUpload.id.in_(expired)
+                ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for upload_id in expired:
+            _remove(upload_path(upload_id))
+
+        known = {row.id for row in db.query(MaterialUpload.id).all()}
+        cutoff = time.time() - GC_GRACE_SECONDS
+        orphans = 0
+        if os.path.isdir(RESUMABLE_DIR):
+            for name in os.listdir(RESUMABLE_DIR):
+                path = os.path.join(RESUMABLE_DIR, name)
+                if name.removesuffix(".part") not in known and os.path.getmtime(path) <= cutoff:
+                    _remove(path)
+                    orphans += 1
+
+        return {"uploads_expired": len(expired), "orphan_files_deleted": orphans, "in_progress": len(known)}
@@ -0,0 +1,164 @@
+import os
+import threading
+import uuid
+from datetime import datetime
+from ..database import engine
+from ..models.audit_log import SecurityEventRollup
+from ..config import get_settings
+from ..utils import utc_now
+
+def _dialect_insert():
+    if engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+def _window_start(now: datetime) -> datetime:
+    return now.replace(second=0, microsecond=0)
+
+
+class SecurityEventAggregator:
+    """
+    In-memory per-(user, action, reason, minute) counters for rejected security events.
+
+    record() tells the caller whether this occurrence should still get a full audit row
+    (the first AUDIT_FAILURE_FULL_ROWS_PER_WINDOW per window); every occurrence is counted.
+    Closed windows are upserted into security_event_rollups every AUDIT_ROLLUP_FLUSH_SECONDS
+    by a background thread. Upserts add counts, so several workers aggregating the same
+    window converge on the correct total.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.full_rows_per_window = settings.AUDIT_FAILURE_FULL_ROWS_PER_WINDOW
+        self.flush_seconds = settings.AUDIT_ROLLUP_FLUSH_SECONDS
+
+        self._windows: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="security-rollup", daemon=True)
+            self._thread.start()
+
+    def record(self, user_id: str, action: str, reason: str, ip_address: str | None = None) -> bool:
+        """
+        Count one occurrence.
+
+        Returns:
+            bool: True if the caller should also write a full-fidelity audit row
+        """
+        self._ensure_started()
+        now = utc_now()
+        key = (str(user_id), action, reason, _window_start(now))
+
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None:
+                entry = {"count": 0, "first_seen": now, "last_seen": now, "ip_address": ip_address}
+                self._windows[key] = entry
+            entry["count"] += 1
+            entry["last_seen"] = now
+            if ip_address:
+                entry["ip_address"] = ip_address
+            return entry["count"] <= self.full_rows_per_window
+
+    def flush(self, include_open: bool = False) -> int:
+        """
+        Upsert finished windows (and the current one if include_open) in one statement.
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        current = _window_start(utc_now())
+        with self._lock:
+            keys = [k for k in self._windows if include_open or k[3] < current]
+            pending = [(k, self._windows.pop(k)) for k in keys]
+
+        if not pending:
+            return 0
+
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "action": action,
+                "reason": reason,
+                "window_start": window_start,
+                "count": entry["count"],
+                "first_seen": entry["first_seen"],
+                "last_seen": entry["last_seen"],
+                "ip_address": entry["ip_address"]
+            }
+            for (user_id, action, reason, window_start), entry in pending
+        ]
+
+        insert = _dialect_insert()
+        stmt = insert(SecurityEventRollup.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'action', 'reason', 'window_start'],
+            set_={
+                "count": SecurityEventRollup.__table__.c.count + stmt.excluded.count,
+                "last_seen": stmt.excluded.last_seen,
+                "ip_address": stmt.excluded.ip_address
+            }
+        )
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt, rows)
+        except Exception as e:
+            # Put the counts back so the next flush retries them
+            print(f"Security rollup flush failed: {str(e)}")
+            with self._lock:
+                for key, entry in pending:
+                    existing = self._windows.get(key)
+                    if existing is None:
+                        self._windows[key] = entry
+                    else:
+                        existing["count"] += entry["count"]
+                        existing["first_seen"] = min(existing["first_seen"], entry["first_seen"])
+            return 0
+
+        return len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def close(self):
+        """Stop the flush thread and write everything, including the open window."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(self.flush_seconds)
+        self.flush(include_open=True)
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+def get_security_aggregator() -> SecurityEventAggregator:
+    """Process-wide aggregator (created on first use)."""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = SecurityEventAggregator()
+    return _aggregator
+
+def shutdown_security_aggregator():
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is not None:
+            _aggregator.close()
+            _aggregator = None
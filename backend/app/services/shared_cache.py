@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import Callable
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..models.shared_cache import SharedCacheEntry
+from ..utils import utc_now, ensure_utc
+from .change_versions import ChangeVersionService
+
+# Per-worker layer in front of the shared table: key -> (fingerprint, value, expires monotonic)
+_local: dict[str, tuple[str, object, float]] = {}
+_local_lock = threading.Lock()
+
+
+def _dialect_insert():
+    if engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+class SharedCache:
+    """
+    Short-TTL result cache shared across workers, invalidated by change versions.
+
+    A cached value carries the fingerprint of the change versions it was computed
+    from; any write that bumps one of those scopes makes it stale immediately (within
+    CHANGE_VERSION_CACHE_SECONDS for writes made by other workers). Lookups go
+    worker memory -> shared_cache table -> compute, so concurrent dashboards across
+    all workers trigger at most one computation per TTL.
+    """
+
+    @staticmethod
+    def get_or_compute(db: Session, key: str, scopes: list[str], ttl_seconds: float, compute: Callable[[], object]):
+        """
+        Return the cached value for `key`, or compute, store and return it.
+
+        Args:
+            db: Database session
+            key: Cache key (e.g. 'admin:stats')
+            scopes: Change-version scopes the value depends on
+            ttl_seconds: Maximum age of a cached value
+            compute: Zero-argument function producing a JSON-serializable value
+        """
+        fingerprint = ChangeVersionService.fingerprint(db, scopes)
+
+        now = time.monotonic()
+        with _local_lock:
+            cached = _local.get(key)
+        if cached is not None and cached[0] == fingerprint and cached[2] > now:
+            return cached[1]
+
+        entry = db.query(SharedCacheEntry).filter(SharedCacheEntry.key == key).first()
+        if entry is not None and entry.fingerprint == fingerprint:
+            remaining = (ensure_utc(entry.expires_at) - utc_now()).total_seconds()
+            if remaining > 0:
+                # JSONB in PostgreSQL comes back already decoded
+                value = json.loads(entry.value) if isinstance(entry.value, str) else entry.value
+                with _local_lock:
+                    _local[key] = (fingerprint, value, now + min(remaining, ttl_seconds))
+                return value
+
+        value = compute()
+        SharedCache._store(key, fingerprint, value, ttl_seconds)
+        with _local_lock:
+            _local[key] = (fingerprint, value, now + ttl_seconds)
+        return value
+
+    @staticmethod
+    def _store(key: str, fingerprint: str, value, ttl_seconds: float):
+        # Own connection: never commits the caller's session
+        row = {
+            "key": key,
+            "fingerprint": fingerprint,
+            "value": json.dumps(value, default=str),
+            "expires_at": utc_now() + timedelta(seconds=ttl_seconds)
+        }
+        insert = _dialect_insert()
+        stmt = insert(SharedCacheEntry.__table__).values(row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key'],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "value": stmt.excluded.value,
+                "expires_at": stmt.excluded.expires_at
+            }
+        )
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt)
+        except Exception as e:
+            # A failed store only costs a recomputation elsewhere
+            print(f"Shared cache store failed for {key}: {str(e)}")
@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from functools import lru_cache
+from urllib.parse import quote
+from ..config import get_settings
+from ..utils import utc_now
+
+
+@lru_cache()
+def _signing_key() -> bytes:
+    settings = get_settings()
+    if settings.DOWNLOAD_SIGNING_SECRET:
+        return settings.DOWNLOAD_SIGNING_SECRET.encode('utf-8')
+    # No dedicated secret: derive one, so a download signature can never pass as a JWT or QR signature
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), b"download-urls", hashlib.sha256).digest()
+
+
+def _signature(sha256: str, file_name: str, expires: int) -> str:
+    message = f"{sha256}\n{file_name}\n{expires}".encode('utf-8')
+    return hmac.new(_signing_key(), message, hashlib.sha256).hexdigest()
+
+
+class SignedURLService:
+    """
+    HMAC-signed, expiring download URLs for study material files.
+
+    A URL names the content (SHA-256) and the download file name, and carries its
+    expiry and an HMAC-SHA256 over all three, so a download is checked by signature
+    alone: no JWT decode, no users query, no database at all.
+
+    Expiry is rounded up to whole windows of DOWNLOAD_URL_EXPIRY_SECONDS and is one
+    to two windows away, so every listing within a window hands out the same URL
+    for a file. Browser and proxy caches keep hitting the same key, and the listing
+    stays cacheable by ETag (window() is part of it).
+    """
+
+    @staticmethod
+    def window(now: datetime | None = None) -> int:
+        """Index of the current expiry window."""
+        now = now or utc_now()
+        return int(now.timestamp()) // get_settings().DOWNLOAD_URL_EXPIRY_SECONDS
+
+    @staticmethod
+    def sign(sha256: str, file_name: str, now: datetime | None = None) -> dict:
+        """
+        Returns:
+            dict: {'url': path with query string, 'expires_at': datetime}
+        """
+        expires = (SignedURLService.window(now) + 2) * get_settings().DOWNLOAD_URL_EXPIRY_SECONDS
+        signature = _signature(sha256, file_name, expires)
+        return {
+            'url': f"/api/resources/files/{sha256}/{quote(file_name)}?expires={expires}&signature={signature}",
+            'expires_at': datetime.fromtimestamp(expires, tz=timezone.utc)
+        }
+
+    @staticmethod
+    def verify(sha256: str, file_name: str, expires: int, signature: str) -> int:
+        """
+        Check a download URL's signature and expiry.
+
+        Returns:
+            int: Seconds until the URL expires
+
+        Raises:
+            ValueError: Signature mismatch or expired
+        """
+        # Constant-time comparison to prevent timing attacks
+        if not hmac.compare_digest(signature.encode('utf-8'), _signature(sha256, file_name, expires).encode('utf-8')):
+            raise ValueError("Invalid download signature")
+        remaining = expires - int(utc_now().timestamp())
+        if remaining <= 0:
+            raise ValueError("Download link expired")
+        return remaining
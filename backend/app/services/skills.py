@@ -0,0 +1,209 @@
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..models.skill import Skill, UserSkill
+from ..models.user import User, UserRole
+
+MAX_SKILLS = 30
+MAX_SKILL_LENGTH = 50
+
+
+def _dialect_insert(db: Session):
+    if db.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def split_skills(text: str | None) -> list[str]:
+    """The users.skills column (comma-separated) as a list."""
+    return [s.strip() for s in text.split(',') if s.strip()] if text else []
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _clean(names: list[str]) -> list[str]:
+    """Tidy spelling, split stray commas and drop duplicates (by slug), keeping order."""
+    cleaned, seen = [], set()
+    for name in names:
+        for part in name.split(','):
+            part = " ".join(part.split())
+            slug = normalize_skill(part)
+            if slug and slug not in seen:
+                seen.add(slug)
+                cleaned.append(part)
+    return cleaned
+
+
+def _students(include_inactive: bool) -> list:
+    filters = [User.role == UserRole.STUDENT.value]
+    if not include_inactive:
+        filters.append(User.is_active == True)
+    return filters
+
+
+class SkillService:
+    """
+    Normalized member skills.
+
+    skills / user_skills are the source for skill-based discovery: the
+    (skill_id, user_id) primary key is an inverted index from a skill to its
+    members, so intersections and per-skill counts are index scans and GROUP BYs
+    over the mapping rather than string matching over users.skills. users.skills
+    is kept as the display copy (it also feeds the member search document).
+    """
+
+    @staticmethod
+    def set_user_skills(db: Session, user: User, names: list[str]) -> list[str]:
+        """
+        Replace a member's skills (caller commits).
+
+        Raises:
+            ValueError: Too many skills or a name is too long
+        """
+        cleaned = _clean(names)
+        if len(cleaned) > MAX_SKILLS:
+            raise ValueError(f"At most {MAX_SKILLS} skills are allowed")
+        for name in cleaned:
+            if len(name) > MAX_SKILL_LENGTH:
+                raise ValueError(f"Skill names are limited to {MAX_SKILL_LENGTH} characters")
+
+        user.skills = ",".join(cleaned) or None
+
+        wanted = set(SkillService._ensure_skills(db, cleaned).values())
+        current = {
+            row.skill_id for row in db.query(UserSkill.skill_id).filter(UserSkill.user_id == user.id).all()
+        }
+        removed = current - wanted
+        if removed:
+            db.query(UserSkill).filter(
+                UserSkill.user_id == user.id, UserSkill.skill_id.in_(removed)
+            ).delete(synchronize_session=False)
+        added = wanted - current
+        if added:
+            insert = _dialect_insert(db)
+            db.execute(
+                insert(UserSkill.__table__).values([
+                    {"skill_id": skill_id, "user_id": user.id} for skill_id in added
+                ]).on_conflict_do_nothing(index_elements=['skill_id', 'user_id'])
+            )
+        return cleaned
+
+    @staticmethod
+    def _ensure_skills(db: Session, names: list[str]) -> dict[str, str]:
+        """Create missing skill tags; returns {slug: skill_id}."""
+        if not names:
+            return {}
+        rows = {}
+        for name in names:
+            rows.setdefault(normalize_skill(name), name)
+        insert = _dialect_insert(db)
+        db.execute(
+            insert(Skill.__table__).values([
+                {"id": str(uuid.uuid4()), "slug": slug, "name": name}
+                for slug, name in rows.items()
+            ]).on_conflict_do_nothing(index_elements=['slug'])
+        )
+        return dict(db.query(Skill.slug, Skill.id).filter(Skill.slug.in_(list(rows))).all())
+
+    @staticmethod
+    def directory(db: Session, prefix: str | None, include_inactive: bool, limit: int) -> list[dict]:
+        """Skills with their member counts, most common first (optionally by name prefix)."""
+        members = func.count(UserSkill.user_id).label("members")
+        query = db.query(Skill.name, Skill.slug, members).join(
+            UserSkill, UserSkill.skill_id == Skill.id
+        ).join(User, User.id == UserSkill.user_id).filter(*_students(include_inactive))
+
+        prefix = normalize_skill(prefix or "")
+        if prefix:
+            query = query.filter(Skill.slug.like(_escape_like(prefix) + "%", escape="\\"))
+
+        rows = query.group_by(Skill.id, Skill.name, Skill.slug).order_by(
+            members.desc(), Skill.name
+        ).limit(limit).all()
+        return [{"name": row.name, "slug": row.slug, "members": row.members} for row in rows]
+
+    @staticmethod
+    def find_members(db: Session, names: list[str], include_inactive: bool,
+                     offset: int, limit: int, facet_limit: int) -> dict:
+        """
+        Students having every one of `names`.
+
+        Returns:
+            dict: user_ids (one page, by name), total, skills (matched tags),
+                  unknown (names with no tag), facets (other skills among the
+                  matching members with their counts)
+        """
+        slugs = list(dict.fromkeys(normalize_skill(name) for name in names if normalize_skill(name)))
+        tags = db.query(Skill.id, Skill.name, Skill.slug).filter(Skill.slug.in_(slugs)).all()
+        found = {tag.slug: tag.name for tag in tags}
+        result = {
+            "user_ids": [],
+            "total": 0,
+            "skills": [found[slug] for slug in slugs if slug in found],
+            "unknown": [slug for slug in slugs if slug not in found],
+            "facets": []
+        }
+        if not tags or result["unknown"]:
+            return result
+
+        skill_ids = [tag.id for tag in tags]
+        matched = select(UserSkill.user_id).join(User, User.id == UserSkill.user_id).where(
+            UserSkill.skill_id.in_(skill_ids), *_students(include_inactive)
+        ).group_by(UserSkill.user_id).having(func.count(UserSkill.skill_id) == len(skill_ids))
+
+        result["total"] = db.execute(select(func.count()).select_from(matched.subquery())).scalar()
+        if not result["total"]:
+            return result
+
+        result["user_ids"] = [
+            row.id for row in db.query(User.id).filter(User.id.in_(matched)).order_by(
+                User.full_name, User.id
+            ).offset(offset).limit(limit).all()
+        ]
+
+        members = func.count(UserSkill.user_id).label("members")
+        result["facets"] = [
+            {"name": row.name, "slug": row.slug, "members": row.members}
+            for row in db.query(Skill.name, Skill.slug, members).join(
+                UserSkill, UserSkill.skill_id == Skill.id
+            ).filter(
+                UserSkill.user_id.in_(matched), UserSkill.skill_id.not_in(skill_ids)
+            ).group_by(Skill.id, Skill.name, Skill.slug).order_by(
+                members.desc(), Skill.name
+            ).limit(facet_limit).all()
+        ]
+        return result
+
+    @staticmethod
+    def rebuild(db: Session) -> dict:
+        """Re-derive user_skills from users.skills (backfill / repair) and commit."""
+        profiles = []
+        for row in db.query(User.id, User.skills).filter(User.skills.isnot(None)).all():
+            cleaned = [name[:MAX_SKILL_LENGTH] for name in _clean(split_skills(row.skills))][:MAX_SKILLS]
+            if cleaned:
+                profiles.append((row.id, cleaned))
+
+        try:
+            ids = SkillService._ensure_skills(db, [name for _, names in profiles for name in names])
+            mappings = {
+                (ids[normalize_skill(name)], user_id) for user_id, names in profiles for name in names
+            }
+            db.query(UserSkill).delete(synchronize_session=False)
+            if mappings:
+                db.execute(UserSkill.__table__.insert(), [
+                    {"skill_id": skill_id, "user_id": user_id} for skill_id, user_id in mappings
+                ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return {"members": len(profiles), "skills": len(set(ids.values())), "mappings": len(mappings)}
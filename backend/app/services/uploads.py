@@ -0,0 +1,276 @@
+import hashlib
+import os
+import tempfile
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process chunk lock
+    fcntl = None
+from dataclasses import dataclass
+from typing import Optional
+import anyio
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_FIELD_BYTES = 64 * 1024  # Per non-file form field
+FORM_OVERHEAD_BYTES = 256 * 1024  # Allowance for fields and part headers in Content-Length
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class UploadBusy(ValueError):
+    """Another request is writing to the same resumable upload."""
+    pass
+
+
+@dataclass
+class ReceivedFile:
+    """A file part written to a temp file next to its final location."""
+    file_name: str
+    temp_path: str
+    size: int
+    sha256: str
+
+
+class _FileWriter:
+    """Temp file plus running SHA-256; every method runs in a worker thread."""
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+        self.file = os.fdopen(fd, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes):
+        self.file.write(data)
+        self.digest.update(data)  # Releases the GIL for large buffers
+        self.size += len(data)
+
+    def close(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.chmod(self.path, 0o644)  # mkstemp creates 0600
+
+    def discard(self):
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ChunkWriter:
+    """
+    Writes one chunk into an existing (preallocated) file from `offset`, with a
+    running SHA-256 of the chunk. Holds an exclusive lock on the file while open,
+    so two workers can never write the same upload at once. Blocking: every
+    method runs in a worker thread.
+
+    Raises:
+        FileNotFoundError: The upload file does not exist
+        UploadBusy: The file is locked by another writer
+    """
+
+    def __init__(self, path: str, offset: int):
+        self.fd = os.open(path, os.O_WRONLY)
+        if fcntl is not None:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(self.fd)
+                raise UploadBusy("Another chunk is being written to this upload")
+        os.lseek(self.fd, offset, os.SEEK_SET)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        self.digest.update(data)
+        self.size += len(data)
+
+    def sync(self):
+        os.fsync(self.fd)
+
+    def close(self):
+        """Close the file, which releases the lock."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def safe_file_name(name: str) -> str:
+    """Basename only (no directories from the client), never empty or hidden."""
+    name = os.path.basename((name or "").replace("\\", "/")).strip()
+    return name.lstrip(".") or "upload"
+
+
+def _disposition(headers: dict) -> tuple[Optional[str], Optional[str]]:
+    _, options = parse_options_header(headers.get(b"content-disposition", b""))
+    name = options.get(b"name")
+    filename = options.get(b"filename")
+    return (
+        name.decode("utf-8", "replace") if name is not None else None,
+        filename.decode("utf-8", "replace") if filename is not None else None
+    )
+
+
+async def receive_multipart(request: Request, directory: str, max_bytes: int,
+                            chunk_bytes: int) -> tuple[dict[str, str], Optional[ReceivedFile]]:
+    """
+    Stream a multipart/form-data body with one file part to a temp file in `directory`.
+
+    The body is parsed as it arrives; file data is buffered up to `chunk_bytes` and
+    written (and hashed) in a worker thread, so the event loop never blocks on disk.
+    The size limit is enforced while streaming: the request fails as soon as the
+    file passes `max_bytes`, and the temp file is removed.
+
+    Returns:
+        tuple: (form fields, ReceivedFile or None); the caller renames or discards the temp file
+
+    Raises:
+        UploadTooLarge: The file (or declared body) exceeds max_bytes
+        ValueError: Not multipart/form-data, or more than one file part
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise UploadTooLarge(f"File exceeds the {max_bytes} byte upload limit")
+
+    # Parser callbacks only record what happened; the async loop below acts on it
+    events = []
+    header = {"field": b"", "value": b""}
+    headers = {}
+
+    def on_header_field(data, start, end):
+        header["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        headers[header["field"].lower()] = header["value"]
+        header["field"] = header["value"] = b""
+
+    def on_headers_finished():
+        events.append(("headers", dict(headers)))
+        headers.clear()
+
+    def on_part_data(data, start, end):
+        events.append(("data", bytes(data[start:end])))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    fields: dict[str, str] = {}
+    received = None
+    writer = None
+    pending = bytearray()
+    field_name = None
+    field_value = bytearray()
+    in_file = False
+
+    async def flush():
+        if pending:
+            data = bytes(pending)
+            pending.clear()
+            await anyio.to_thread.run_sync(writer.write, data)
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for kind, value in events:
+                if kind == "headers":
+                    field_name, file_name = _disposition(value)
+                    in_file = file_name is not None
+                    if in_file:
+                        if writer is not None:
+                            raise ValueError("Only one file per upload")
+                        writer = await anyio.to_thread.run_sync(_FileWriter, directory)
+                        received = ReceivedFile(safe_file_name(file_name), writer.path, 0, "")
+                elif kind == "data":
+                    if in_file:
+                        if writer.size + len(pending) + len(value) > max_bytes:
+                            raise UploadTooLarge(f"File exceeds the {max_bytes} byte upload limit")
+                        pending.extend(value)
+                        if len(pending) >= chunk_bytes:
+                            await flush()
+                    else:
+                        field_value.extend(value)
+                        if len(field_value) > MAX_FIELD_BYTES:
+                            raise ValueError(f"Form field '{field_name}' is too long")
+                elif kind == "end":
+                    if in_file:
+                        await flush()
+                    elif field_name is not None:
+                        fields[field_name] = field_value.decode("utf-8", "replace")
+                    field_value.clear()
+                    in_file = False
+            events.clear()
+        parser.finalize()
+
+        if writer is not None:
+            await flush()
+            await anyio.to_thread.run_sync(writer.close)
+            received.size = writer.size
+            received.sha256 = writer.digest.hexdigest()
+        return fields, received
+    except BaseException:
+        if writer is not None:
+            # Shielded so a client disconnect (cancellation) still removes the temp file
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(writer.discard)
+        raise
+
+
+async def receive_chunk(request: Request, writer: ChunkWriter, max_bytes: int, chunk_bytes: int) -> tuple[int, str]:
+    """
+    Stream a raw request body into `writer`, buffering up to `chunk_bytes` per
+    write (worker thread). Fails as soon as the body passes `max_bytes`; bytes
+    already written stay in the file but are not counted by the caller.
+
+    Returns:
+        tuple: (bytes written, SHA-256 hex of the body)
+
+    Raises:
+        UploadTooLarge: The body is longer than max_bytes
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise UploadTooLarge(f"Chunk exceeds the {max_bytes} bytes allowed at this offset")
+
+    pending = bytearray()
+    received = 0
+    async for data in request.stream():
+        received += len(data)
+        if received > max_bytes:
+            raise UploadTooLarge(f"Chunk exceeds the {max_bytes} bytes allowed at this offset")
+        pending.extend(data)
+        if len(pending) >= chunk_bytes:
+            buffered = bytes(pending)
+            pending.clear()
+            await anyio.to_thread.run_sync(writer.write, buffered)
+    if pending:
+        await anyio.to_thread.run_sync(writer.write, bytes(pending))
+    return writer.size, writer.digest.hexdigest()
+
+
+def discard_file(received: Optional[ReceivedFile]):
+    """Remove a received temp file that will not be committed. Blocking."""
+    if received is not None and os.path.exists(received.temp_path):
+        os.remove(received.temp_path)
@@ -0,0 +1,22 @@
+from fastapi import Request, Response
+
+# Per-user responses: browsers may store them but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches `etag` (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the validator."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,26 @@
+import base64
+from datetime import datetime
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """
+    Encode a keyset cursor from the last row of a page.
+
+    The cursor is an opaque URL-safe string holding the sort key and the
+    row id (tie-breaker for rows sharing the same timestamp).
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8')
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a keyset cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8')
+        sort_value, row_id = raw.split('|', 1)
+        return datetime.fromisoformat(sort_value), row_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from . import utc_now
+
+# Helpers for PostgreSQL tables range-partitioned by month.
+# Partitions are named <table>_yYYYYmMM (e.g. audit_logs_y2025m03).
+
+def month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+def add_months(dt: datetime, months: int) -> datetime:
+    month_index = dt.year * 12 + (dt.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+def partition_month(table: str, name: str) -> datetime | None:
+    """Parse '<table>_y2025m03' back into its month start; None for other partitions (e.g. default)."""
+    prefix = f"{table}_y"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split('m')
+        return datetime(int(year), int(month), 1, tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def is_partitioned(db: Session, table: str) -> bool:
+    """True if `table` is a partitioned table (always False outside PostgreSQL)."""
+    if db.bind.dialect.name != 'postgresql':
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table"
+    ), {"table": table}).scalar())
+
+def list_monthly_partitions(db: Session, table: str) -> list[tuple[str, datetime]]:
+    """Return (partition_name, month_start) for every monthly partition of `table`, oldest first."""
+    names = db.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": table}).scalars().all()
+
+    partitions = [(name, partition_month(table, name)) for name in names]
+    return sorted((p for p in partitions if p[1] is not None), key=lambda p: p[1])
+
+def default_partition(db: Session, table: str) -> str | None:
+    """Name of the DEFAULT partition of `table`, if it has one."""
+    return db.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table AND pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'"
+    ), {"table": table}).scalar()
+
+def _create_partition(db: Session, table: str, name: str, lower: datetime, upper: datetime,
+                      default: str | None, key: str) -> int:
+    """
+    Create one monthly partition. PostgreSQL refuses the CREATE while the DEFAULT
+    partition holds rows of that month (the job lapsed and they landed there), so
+    those are moved: detach the default, create the month, move its rows, reattach.
+    Runs in the caller's transaction; ACCESS EXCLUSIVE on the table until it commits.
+
+    Returns:
+        int: Rows moved out of the default partition
+    """
+    bounds = {"lower": lower, "upper": upper}
+    in_range = f"{key} >= :lower AND {key} < :upper"
+    stranded = default is not None and db.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"
+    ), bounds).scalar()
+
+    create = (
+        f"CREATE TABLE {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+    if not stranded:
+        db.execute(text(create))
+        return 0
+
+    db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    db.execute(text(create))
+    moved = db.execute(text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}"), bounds).rowcount
+    db.execute(text(f"DELETE FROM {default} WHERE {in_range}"), bounds)
+    db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    return moved
+
+def ensure_monthly_partitions(db: Session, table: str, months_ahead: int, key: str = 'created_at') -> dict:
+    """
+    Create monthly partitions of `table` from the current month up to `months_ahead` ahead,
+    moving rows that landed in the DEFAULT partition for a missing month into it.
+    Each month is its own transaction: one that fails is skipped and reported, the
+    rest are still created. No-op when the table is not partitioned.
+
+    Returns:
+        dict: created (partition names), rows_moved ({partition: rows taken from the
+              default partition}), skipped ({partition: error})
+    """
+    result = {"created": [], "rows_moved": {}, "skipped": {}}
+    if not is_partitioned(db, table):
+        return result
+
+    existing = {name for name, _ in list_monthly_partitions(db, table)}
+    default = default_partition(db, table)
+    db.commit()
+    current = month_start(utc_now())
+
+    for offset in range(months_ahead + 1):
+        lower = add_months(current, offset)
+        name = partition_name(table, lower)
+        if name in existing:
+            continue
+        try:
+            moved = _create_partition(db, table, name, lower, add_months(lower, 1), default, key)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            result["skipped"][name] = str(e).splitlines()[0]
+            continue
+        result["created"].append(name)
+        if moved:
+            result["rows_moved"][name] = moved
+
+    return result
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the admin analytics metrics (app/services/analytics.py).
+
+Builds a synthetic students × events attendance matrix in memory and times each
+vectorized metric. Every metric must finish in milliseconds at club scale
+(10k members × 500 events); no database is needed:
+
+    python benchmark_analytics.py
+    python benchmark_analytics.py --students 20000 --events 1000 --budget-ms 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Settings are read at import time; provide harmless defaults for a standalone run
+# (the database is never connected to)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'analytics-bench.db')}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("QR_SIGNING_SECRET", "benchmark-qr-secret-key")
+os.environ.setdefault("ADMIN_EMAIL", "admin@bench.local")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark-password")
+
+import numpy as np
+
+from app.services.analytics import AttendanceMatrix
+from app.utils import utc_now
+
+
+def build(n_students: int, n_events: int, seed: int = 42) -> AttendanceMatrix:
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(utc_now().replace(tzinfo=None), 's')
+    two_years = np.timedelta64(730, 'D').astype('timedelta64[s]').astype(np.int64)
+
+    event_times = np.sort(now - rng.integers(0, two_years, n_events).astype('timedelta64[s]'))
+    joined = now - rng.integers(0, two_years, n_students).astype('timedelta64[s]')
+
+    # Each student attends ~35% of the events held after they joined
+    eligible = joined[:, None] <= event_times[None, :]
+    attended = eligible & (rng.random((n_students, n_events)) < 0.35)
+    users, events = np.nonzero(attended)
+
+    branches = rng.choice(["CSE", "ECE", "ME", "CE", "IT", ""], n_students)
+    years = rng.choice(["1", "2", "3", "4"], n_students)
+
+    return AttendanceMatrix.from_codes(
+        user_ids=[f"user-{i}" for i in range(n_students)],
+        user_names=[f"Student {i}" for i in range(n_students)],
+        joined=joined,
+        branches=branches,
+        years=years,
+        event_ids=[f"event-{i}" for i in range(n_events)],
+        event_times=event_times,
+        record_users=users,
+        record_events=events
+    )
+
+
+def timed(fn, repeats: int):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admin analytics benchmark")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Fail if any metric is slower")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    matrix = build(args.students, args.events)
+    print(f"matrix {args.students} × {args.events}, "
+          f"{int(matrix.attended.sum())} check-ins, built in {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    metrics = {
+        "rates (branch)": lambda: matrix.group_rates('branch'),
+        "rates (year)": lambda: matrix.group_rates('year'),
+        "retention (12 months)": lambda: matrix.retention(12),
+        "cohorts (6 months)": lambda: matrix.cohorts(6),
+        "streaks (top 10)": lambda: matrix.streaks(10),
+    }
+
+    print(f"{'metric':<24} {'ms':>10}")
+    slowest = 0.0
+    for name, fn in metrics.items():
+        elapsed = timed(fn, args.repeats) * 1000
+        slowest = max(slowest, elapsed)
+        print(f"{name:<24} {elapsed:>10.1f}")
+
+    within = slowest <= args.budget_ms
+    print(f"\n✅ Every metric within {args.budget_ms:.0f} ms" if within
+          else f"\n❌ Slowest metric took {slowest:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /api/events: number of SQL statements and latency per call
+as the event count grows.
+
+The event list must be served by a constant number of queries (attendance info is
+joined in, not fetched per event). Runs against a throwaway SQLite database by
+default so it never touches real data:
+
+    python benchmark_events_query.py
+    python benchmark_events_query.py --sizes 10 100 1000 5000 --database-url postgresql://...
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Settings are read at import time; provide harmless defaults for a standalone run
+BENCH_DIR = tempfile.mkdtemp(prefix="events-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(BENCH_DIR, 'app.db')}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("QR_SIGNING_SECRET", "benchmark-qr-secret-key")
+os.environ.setdefault("ADMIN_EMAIL", "admin@bench.local")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark-password")
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event as sa_event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, UserRole, Event, AttendanceRecord, QRSession
+from app.routes.events import get_events
+from app.utils import utc_now
+
+
+def seed(db, n_events: int, n_students: int = 50):
+    admin = User(email=f"admin-{uuid.uuid4().hex[:8]}@bench.local", hashed_password="x",
+                 full_name="Bench Admin", role=UserRole.ADMIN.value, is_active=True)
+    students = [
+        User(email=f"student-{i}-{uuid.uuid4().hex[:8]}@bench.local", hashed_password="x",
+             full_name=f"Bench Student {i}", role=UserRole.STUDENT.value, is_active=True)
+        for i in range(n_students)
+    ]
+    db.add_all([admin] + students)
+    db.flush()
+
+    now = utc_now()
+    events = [
+        Event(title=f"Bench Event {i}", scheduled_at=now - timedelta(days=i),
+              created_by=admin.id, is_deleted=False)
+        for i in range(n_events)
+    ]
+    db.add_all(events)
+    db.flush()
+
+    sessions = [
+        QRSession(event_id=ev.id, session_token=uuid.uuid4().hex, token_signature="x",
+                  created_at=now, created_by=admin.id, expires_at=now + timedelta(seconds=60),
+                  nonce=uuid.uuid4().hex)
+        for ev in events
+    ]
+    db.add_all(sessions)
+    db.flush()
+
+    rng = random.Random(42)
+    records = []
+    for ev, session in zip(events, sessions):
+        for student in rng.sample(students, k=rng.randint(0, min(10, n_students))):
+            records.append(AttendanceRecord(event_id=ev.id, user_id=student.id,
+                                            qr_session_id=session.id, marked_at=now))
+    db.add_all(records)
+    db.commit()
+    return admin, students[0]
+
+
+def measure(engine, Session, current_user, repeats: int = 3):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        best = None
+        for _ in range(repeats):
+            statements.clear()
+            db = Session()
+            try:
+                started = time.perf_counter()
+                result = get_events(
+                    request=Request({"type": "http", "headers": []}), response=Response(),
+                    include_deleted=False, start=None, end=None, limit=None, cursor=None,
+                    db=db, current_user=db.merge(current_user)
+                )
+                elapsed = time.perf_counter() - started
+            finally:
+                db.close()
+            best = elapsed if best is None else min(best, elapsed)
+        return len(statements), best, len(result["events"])
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /api/events query-count benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'role':>8} {'queries':>8} {'ms':>10}")
+    query_counts = set()
+
+    for size in args.sizes:
+        url = args.database_url or f"sqlite:///{os.path.join(BENCH_DIR, f'bench-{size}.db')}"
+
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+        db = Session()
+        try:
+            admin, student = seed(db, size)
+        finally:
+            db.close()
+
+        for role, current_user in (("admin", admin), ("student", student)):
+            queries, elapsed, returned = measure(engine, Session, current_user)
+            assert returned >= size, f"expected at least {size} events, got {returned}"
+            query_counts.add((role, queries))
+            print(f"{size:>8} {role:>8} {queries:>8} {elapsed * 1000:>10.1f}")
+
+        engine.dispose()
+
+    shutil.rmtree(BENCH_DIR, ignore_errors=True)
+
+    per_role = {}
+    for role, queries in query_counts:
+        per_role.setdefault(role, set()).add(queries)
+
+    constant = all(len(counts) == 1 for counts in per_role.values())
+    print("\n✅ Query count is constant" if constant else "\n❌ Query count grows with event count")
+    sys.exit(0 if constant else 1)
+
+
+if __name__ == "__main__":
+    main()
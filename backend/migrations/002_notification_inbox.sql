@@ -0,0 +1,26 @@
+-- Migration: Notification inbox index and incremental unread counters
+-- Reason: Keyset-paginated inbox listing and constant-time unread badge polling
+-- Run this in Supabase SQL Editor
+
+-- Step 1: Replace the (recipient_id, is_read) index with one that also covers ordering
+DROP INDEX IF EXISTS idx_notifications_recipient_read;
+CREATE INDEX IF NOT EXISTS idx_notifications_inbox
+ON notifications(recipient_id, is_read, created_at);
+
+-- Step 2: Per-user unread counter, maintained by the backend on create / mark-read
+CREATE TABLE IF NOT EXISTS notification_counters (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    unread_count INTEGER DEFAULT 0 NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Step 3: Backfill counters from existing notifications
+INSERT INTO notification_counters (user_id, unread_count, updated_at)
+SELECT recipient_id, COUNT(*) FILTER (WHERE is_read = FALSE), NOW()
+FROM notifications
+GROUP BY recipient_id
+ON CONFLICT (user_id) DO UPDATE SET unread_count = EXCLUDED.unread_count, updated_at = NOW();
+
+-- Verify changes
+SELECT indexname FROM pg_indexes WHERE tablename = 'notifications';
+SELECT COUNT(*) AS counters FROM notification_counters;
@@ -0,0 +1,80 @@
+-- Migration: Monthly range partitioning and archive table for notifications
+-- Reason: Keep inbox indexes small; expired months are dropped as whole partitions
+-- Run this in Supabase SQL Editor (PostgreSQL 14+ for column compression)
+-- Afterwards schedule: python -m app.cli notifications-retention
+
+BEGIN;
+
+-- Step 1: Move the existing table out of the way
+ALTER TABLE notifications RENAME TO notifications_legacy;
+ALTER INDEX IF EXISTS idx_notifications_inbox RENAME TO idx_notifications_legacy_inbox;
+
+-- Step 2: Recreate notifications as a partitioned table
+-- The partition key must be part of the primary key
+CREATE TABLE notifications (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    recipient_id UUID NOT NULL REFERENCES users(id),
+    type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT,
+    notification_data JSONB,
+    is_read BOOLEAN DEFAULT FALSE NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    read_at TIMESTAMPTZ,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX idx_notifications_inbox ON notifications(recipient_id, is_read, created_at);
+
+-- Catch-all so inserts never fail if the retention job has not created a month yet
+CREATE TABLE notifications_default PARTITION OF notifications DEFAULT;
+
+-- Step 3: One partition per month covering existing data plus three months ahead
+DO $$
+DECLARE
+    month_start DATE;
+    last_month DATE := date_trunc('month', NOW() + INTERVAL '3 months')::DATE;
+BEGIN
+    SELECT COALESCE(date_trunc('month', MIN(created_at))::DATE, date_trunc('month', NOW())::DATE)
+    INTO month_start
+    FROM notifications_legacy;
+    
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            'notifications_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END $$;
+
+-- Step 4: Copy data and drop the old table
+INSERT INTO notifications SELECT * FROM notifications_legacy;
+DROP TABLE notifications_legacy;
+
+-- Step 5: Archive table for read notifications past the retention window
+CREATE TABLE IF NOT EXISTS notifications_archive (
+    id UUID PRIMARY KEY,
+    recipient_id UUID NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT COMPRESSION lz4,
+    notification_data JSONB COMPRESSION lz4,
+    is_read BOOLEAN DEFAULT TRUE NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    read_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+COMMIT;
+
+-- Verify changes
+SELECT child.relname AS partition
+FROM pg_inherits i
+JOIN pg_class parent ON parent.oid = i.inhparent
+JOIN pg_class child ON child.oid = i.inhrelid
+WHERE parent.relname = 'notifications'
+ORDER BY child.relname;
@@ -0,0 +1,24 @@
+-- Migration: Per-minute rollups for rejected security events
+-- Reason: Failed attendance scans are counted per (user, reason, minute) instead of
+--         writing one audit_logs row per attempt
+-- Run this in Supabase SQL Editor
+
+CREATE TABLE IF NOT EXISTS security_event_rollups (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    action VARCHAR(50) NOT NULL,
+    reason VARCHAR(50) NOT NULL,
+    window_start TIMESTAMPTZ NOT NULL,
+    count INTEGER DEFAULT 0 NOT NULL,
+    first_seen TIMESTAMPTZ NOT NULL,
+    last_seen TIMESTAMPTZ NOT NULL,
+    ip_address VARCHAR(45),
+    
+    CONSTRAINT one_rollup_per_window UNIQUE (user_id, action, reason, window_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollups_window ON security_event_rollups(window_start);
+CREATE INDEX IF NOT EXISTS idx_rollups_user_window ON security_event_rollups(user_id, window_start);
+
+-- Verify changes
+SELECT COUNT(*) AS rollups FROM security_event_rollups;
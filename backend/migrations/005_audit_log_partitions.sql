@@ -0,0 +1,86 @@
+-- Migration: Monthly range partitioning and JSONB indexes for audit_logs
+-- Reason: Forensic queries (by action, user, resource, event, QR session and time)
+--         prune to the relevant months and use targeted indexes instead of scanning
+-- Run this in Supabase SQL Editor
+-- Afterwards schedule: python -m app.cli audit-partitions
+
+BEGIN;
+
+-- Step 1: Move the existing table out of the way
+ALTER TABLE audit_logs RENAME TO audit_logs_legacy;
+
+DROP INDEX IF EXISTS idx_audit_logs_user;
+DROP INDEX IF EXISTS idx_audit_logs_action;
+DROP INDEX IF EXISTS idx_audit_logs_created;
+DROP INDEX IF EXISTS idx_audit_logs_user_action;
+DROP INDEX IF EXISTS idx_audit_user_action;
+DROP INDEX IF EXISTS idx_audit_action_created;
+DROP INDEX IF EXISTS ix_audit_logs_created_at;
+
+-- Step 2: Recreate audit_logs partitioned by month on created_at
+-- resource_id is free text: QR session ids are URL-safe tokens, not UUIDs
+CREATE TABLE audit_logs (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID,  -- Nullable for system actions
+    action VARCHAR(50) NOT NULL,
+    resource_type VARCHAR(50),
+    resource_id VARCHAR(64),
+    meta_data JSONB,
+    ip_address VARCHAR(45),
+    user_agent TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+DO $$
+DECLARE
+    month_start DATE;
+    last_month DATE := date_trunc('month', NOW() + INTERVAL '3 months')::DATE;
+BEGIN
+    SELECT COALESCE(date_trunc('month', MIN(created_at))::DATE, date_trunc('month', NOW())::DATE)
+    INTO month_start
+    FROM audit_logs_legacy;
+    
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END $$;
+
+-- Step 3: Indexes (created on the parent, inherited by every partition)
+-- BRIN: tiny, ideal for append-only time ranges
+CREATE INDEX idx_audit_created_brin ON audit_logs USING BRIN (created_at);
+CREATE INDEX idx_audit_action_created ON audit_logs(action, created_at);
+CREATE INDEX idx_audit_user_created ON audit_logs(user_id, created_at);
+CREATE INDEX idx_audit_user_action ON audit_logs(user_id, action);
+CREATE INDEX idx_audit_resource ON audit_logs(resource_type, resource_id);
+-- Targeted JSONB lookups used by the admin audit query API
+CREATE INDEX idx_audit_meta_event ON audit_logs((meta_data->>'event_id'), created_at)
+    WHERE meta_data->>'event_id' IS NOT NULL;
+CREATE INDEX idx_audit_meta_qr_session ON audit_logs((meta_data->>'qr_session_id'), created_at)
+    WHERE meta_data->>'qr_session_id' IS NOT NULL;
+
+-- Step 4: Copy data (meta_data may still be TEXT on databases created by the ORM)
+INSERT INTO audit_logs (id, user_id, action, resource_type, resource_id, meta_data, ip_address, user_agent, created_at)
+SELECT id::uuid, user_id::uuid, action, resource_type, resource_id::text, meta_data::jsonb, ip_address, user_agent, created_at
+FROM audit_logs_legacy;
+
+DROP TABLE audit_logs_legacy;
+
+COMMIT;
+
+-- Verify changes
+SELECT child.relname AS partition
+FROM pg_inherits i
+JOIN pg_class parent ON parent.oid = i.inhparent
+JOIN pg_class child ON child.oid = i.inhrelid
+WHERE parent.relname = 'audit_logs'
+ORDER BY child.relname;
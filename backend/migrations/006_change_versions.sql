@@ -0,0 +1,13 @@
+-- Migration: Change versions for conditional GET (ETag / 304)
+-- Reason: Event, member and resource listings answer If-None-Match from a
+--         per-scope version instead of re-running the list queries
+-- Run this in Supabase SQL Editor
+
+CREATE TABLE IF NOT EXISTS change_versions (
+    scope VARCHAR(100) PRIMARY KEY,  -- e.g. 'events', 'resources', 'attendance:user:<id>'
+    version BIGINT DEFAULT 1 NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Verify changes
+SELECT scope, version FROM change_versions ORDER BY scope;
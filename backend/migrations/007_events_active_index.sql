@@ -0,0 +1,11 @@
+-- Migration: Partial index for live event listings
+-- Reason: GET /api/events and /api/member/events filter is_deleted = false, bound
+--         scheduled_at by the visible calendar range and paginate by (scheduled_at, id)
+-- Run this in Supabase SQL Editor
+
+CREATE INDEX IF NOT EXISTS idx_events_active_scheduled
+    ON events(scheduled_at, id)
+    WHERE is_deleted = false;
+
+-- Verify changes
+SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'events';
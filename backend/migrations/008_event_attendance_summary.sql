@@ -0,0 +1,35 @@
+-- Migration: Materialized per-event attendance summary
+-- Reason: Admin reports read attended / eligible counts per event instead of
+--         re-counting attendance_records and active students on every request
+-- Run this in Supabase SQL Editor
+-- Afterwards backfill: python -m app.cli attendance-summary-rebuild
+
+-- Step 1: Create table
+CREATE TABLE IF NOT EXISTS event_attendance_summary (
+    event_id UUID PRIMARY KEY REFERENCES events(id) ON DELETE CASCADE,
+    attended_count INTEGER DEFAULT 0 NOT NULL,
+    eligible_count INTEGER DEFAULT 0 NOT NULL,  -- Active students at event time
+    first_check_in TIMESTAMPTZ,
+    last_check_in TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Step 2: Initial backfill (the rebuild command produces the same result)
+INSERT INTO event_attendance_summary (event_id, attended_count, eligible_count, first_check_in, last_check_in)
+SELECT
+    e.id,
+    COALESCE(a.attended, 0),
+    (SELECT COUNT(*) FROM users u
+     WHERE u.role = 'student' AND u.is_active = TRUE AND u.created_at <= e.scheduled_at),
+    a.first_check_in,
+    a.last_check_in
+FROM events e
+LEFT JOIN (
+    SELECT event_id, COUNT(*) AS attended, MIN(marked_at) AS first_check_in, MAX(marked_at) AS last_check_in
+    FROM attendance_records
+    GROUP BY event_id
+) a ON a.event_id = e.id
+ON CONFLICT (event_id) DO NOTHING;
+
+-- Verify changes
+SELECT COUNT(*) AS summaries, SUM(attended_count) AS attended FROM event_attendance_summary;
@@ -0,0 +1,14 @@
+-- Migration: Shared short-TTL result cache
+-- Reason: Admin dashboard stats are computed once per TTL for all workers and
+--         invalidated by change versions on user, approval, event and attendance writes
+-- Run this in Supabase SQL Editor
+
+CREATE TABLE IF NOT EXISTS shared_cache (
+    key VARCHAR(200) PRIMARY KEY,
+    fingerprint VARCHAR(64) NOT NULL,  -- Hash of the change versions the value was computed from
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Verify changes
+SELECT key, expires_at FROM shared_cache;
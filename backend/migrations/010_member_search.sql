@@ -0,0 +1,27 @@
+-- Migration: Indexed member search
+-- Reason: GET /api/admin/members/search ranks members by name / email prefix and
+--         trigram similarity over name, email, branch, section and skills
+-- Run this in Supabase SQL Editor
+
+-- Step 1: Trigram support
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Step 2: Prefix lookups on name and email (LIKE 'abc%')
+CREATE INDEX IF NOT EXISTS idx_users_name_prefix
+    ON users (lower(full_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_users_email_prefix
+    ON users (lower(email) text_pattern_ops);
+
+-- Step 3: Substring / fuzzy matching (LIKE '%abc%', word_similarity <%)
+-- The expression must match search_document() in app/services/member_search.py
+CREATE INDEX IF NOT EXISTS idx_users_search_trgm
+    ON users USING GIN (
+        lower(
+            coalesce(full_name, '') || ' ' || coalesce(email, '') || ' ' ||
+            coalesce(branch, '') || ' ' || coalesce(section, '') || ' ' ||
+            coalesce(skills, '')
+        ) gin_trgm_ops
+    );
+
+-- Verify changes
+SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'users';
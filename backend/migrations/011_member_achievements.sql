@@ -0,0 +1,30 @@
+-- Migration: Member streaks and badges
+-- Reason: /api/member/activity and /api/member/badges read per-member state that is
+--         updated at check-in time instead of scanning attendance history per request
+-- Run this in Supabase SQL Editor
+-- Afterwards backfill: python -m app.cli achievements-rebuild
+
+-- Step 1: Per-member totals and streaks
+CREATE TABLE IF NOT EXISTS member_streaks (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_attended INTEGER DEFAULT 0 NOT NULL,
+    current_streak INTEGER DEFAULT 0 NOT NULL,  -- Run ending at last_event_id
+    longest_streak INTEGER DEFAULT 0 NOT NULL,
+    last_event_id UUID,                         -- Latest attended event (scheduled order)
+    last_event_at TIMESTAMPTZ,                  -- Its scheduled_at
+    last_check_in TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Step 2: Earned badges
+CREATE TABLE IF NOT EXISTS member_badges (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    badge VARCHAR(50) NOT NULL,
+    awarded_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (user_id, badge)
+);
+
+-- Verify changes
+SELECT
+    (SELECT COUNT(*) FROM member_streaks) AS members,
+    (SELECT COUNT(*) FROM member_badges) AS badges;
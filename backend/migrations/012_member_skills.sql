@@ -0,0 +1,33 @@
+-- Migration: Normalized member skills
+-- Reason: Skill-based member discovery (GET /api/admin/members/skills) intersects
+--         skill tags through an inverted index instead of string matching over
+--         users.skills, which stays as the comma-separated display copy
+-- Run this in Supabase SQL Editor
+-- Afterwards backfill: python -m app.cli skills-rebuild
+
+-- Step 1: Skill tags (slug = lowercase name with single spaces)
+CREATE TABLE IF NOT EXISTS skills (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    slug VARCHAR(50) UNIQUE NOT NULL,
+    name VARCHAR(50) NOT NULL,  -- First spelling used
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Prefix lookups for the skill directory (slug LIKE 'py%')
+CREATE INDEX IF NOT EXISTS idx_skills_slug_prefix ON skills (slug text_pattern_ops);
+
+-- Step 2: Member <-> skill mapping
+-- The primary key is the inverted index (skill -> members); the second index
+-- serves a member's own skills
+CREATE TABLE IF NOT EXISTS user_skills (
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    PRIMARY KEY (skill_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_skills_user ON user_skills(user_id);
+
+-- Verify changes
+SELECT
+    (SELECT COUNT(*) FROM skills) AS skills,
+    (SELECT COUNT(*) FROM user_skills) AS mappings;
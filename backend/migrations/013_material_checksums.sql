@@ -0,0 +1,11 @@
+-- Migration: Size and checksum for study materials
+-- Reason: Uploads are streamed to disk with the SHA-256 computed on the fly;
+--         keep size and digest with the material for integrity checks
+-- Run this in Supabase SQL Editor
+
+ALTER TABLE study_materials ADD COLUMN IF NOT EXISTS file_size BIGINT;
+ALTER TABLE study_materials ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
+
+-- Verify changes
+SELECT column_name, data_type FROM information_schema.columns
+WHERE table_name = 'study_materials' AND column_name IN ('file_size', 'content_sha256');
@@ -0,0 +1,19 @@
+-- Migration: Content-addressed storage for study materials
+-- Reason: Files are stored once per SHA-256 under uploads/blobs/ and shared by
+--         every material with the same content (duplicate uploads only add a row)
+-- Run this in Supabase SQL Editor
+-- Afterwards move existing files into the store: python -m app.cli blobs-import
+
+-- Step 1: Blob table (ref_count = study_materials pointing at the blob)
+CREATE TABLE IF NOT EXISTS material_blobs (
+    sha256 CHAR(64) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    ref_count INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Step 2: Materials by content hash (reference counting / garbage collection)
+CREATE INDEX IF NOT EXISTS idx_materials_sha256 ON study_materials(content_sha256);
+
+-- Verify changes
+SELECT COUNT(*) AS blobs, COALESCE(SUM(ref_count), 0) AS references FROM material_blobs;
@@ -0,0 +1,27 @@
+-- Migration: Resumable study material uploads
+-- Reason: Multi-GB datasets are sent in checksummed chunks that survive dropped
+--         connections (create, PUT at offset, query offset, finalize)
+-- Run this in Supabase SQL Editor
+
+-- Step 1: Uploads in progress (file preallocated at uploads/incoming/<id>.part)
+CREATE TABLE IF NOT EXISTS material_uploads (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    event_id UUID REFERENCES events(id),
+    file_name VARCHAR(255) NOT NULL,
+    size BIGINT NOT NULL,
+    received BIGINT DEFAULT 0 NOT NULL,
+    expected_sha256 CHAR(64),
+    created_by UUID NOT NULL REFERENCES users(id),
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    CHECK (received >= 0 AND received <= size)
+);
+
+-- Step 2: Expiry sweep (python -m app.cli uploads-expire)
+CREATE INDEX IF NOT EXISTS idx_material_uploads_expires ON material_uploads(expires_at);
+
+-- Verify changes
+SELECT COUNT(*) AS uploads_in_progress FROM material_uploads;
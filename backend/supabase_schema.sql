@@ -8,12 +8,24 @@
 
 -- Drop existing tables in correct order (respecting foreign keys)
 DROP TABLE IF EXISTS used_nonces CASCADE;
+DROP TABLE IF EXISTS user_skills CASCADE;
+DROP TABLE IF EXISTS skills CASCADE;
+DROP TABLE IF EXISTS member_badges CASCADE;
+DROP TABLE IF EXISTS member_streaks CASCADE;
+DROP TABLE IF EXISTS event_attendance_summary CASCADE;
 DROP TABLE IF EXISTS attendance_records CASCADE;
 DROP TABLE IF EXISTS qr_sessions CASCADE;
+DROP TABLE IF EXISTS notification_counters CASCADE;
+DROP TABLE IF EXISTS notifications_archive CASCADE;
 DROP TABLE IF EXISTS notifications CASCADE;
+DROP TABLE IF EXISTS security_event_rollups CASCADE;
+DROP TABLE IF EXISTS change_versions CASCADE;
+DROP TABLE IF EXISTS shared_cache CASCADE;
 DROP TABLE IF EXISTS audit_logs CASCADE;
 DROP TABLE IF EXISTS approval_requests CASCADE;
+DROP TABLE IF EXISTS material_uploads CASCADE;
 DROP TABLE IF EXISTS study_materials CASCADE;
+DROP TABLE IF EXISTS material_blobs CASCADE;
 DROP TABLE IF EXISTS events CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
 
@@ -56,6 +68,19 @@ CREATE TABLE users (
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role_active ON users(role, is_active);
 
+-- Member search (GET /api/admin/members/search); the trigram expression must match
+-- search_document() in app/services/member_search.py
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_users_name_prefix ON users (lower(full_name) text_pattern_ops);
+CREATE INDEX idx_users_email_prefix ON users (lower(email) text_pattern_ops);
+CREATE INDEX idx_users_search_trgm ON users USING GIN (
+    lower(
+        coalesce(full_name, '') || ' ' || coalesce(email, '') || ' ' ||
+        coalesce(branch, '') || ' ' || coalesce(section, '') || ' ' ||
+        coalesce(skills, '')
+    ) gin_trgm_ops
+);
+
 -- Trigger to update updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -113,6 +138,7 @@ CREATE TABLE events (
 CREATE INDEX idx_events_scheduled ON events(scheduled_at);
 CREATE INDEX idx_events_created_by ON events(created_by);
 CREATE INDEX idx_events_active ON events(is_deleted) WHERE is_deleted = FALSE;
+CREATE INDEX idx_events_active_scheduled ON events(scheduled_at, id) WHERE is_deleted = FALSE;
 
 CREATE TRIGGER update_events_updated_at
     BEFORE UPDATE ON events
@@ -164,6 +190,57 @@ CREATE INDEX idx_attendance_event ON attendance_records(event_id);
 CREATE INDEX idx_attendance_user ON attendance_records(user_id);
 CREATE INDEX idx_attendance_marked_at ON attendance_records(marked_at);
 
+-- Per-event totals maintained by the backend on check-in and member (de)activation
+-- (backfill / repair: python -m app.cli attendance-summary-rebuild)
+CREATE TABLE event_attendance_summary (
+    event_id UUID PRIMARY KEY REFERENCES events(id) ON DELETE CASCADE,
+    attended_count INTEGER DEFAULT 0 NOT NULL,
+    eligible_count INTEGER DEFAULT 0 NOT NULL,  -- Active students at event time
+    first_check_in TIMESTAMPTZ,
+    last_check_in TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Per-member streaks and badges maintained by the backend on check-in
+-- (backfill / repair: python -m app.cli achievements-rebuild)
+CREATE TABLE member_streaks (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_attended INTEGER DEFAULT 0 NOT NULL,
+    current_streak INTEGER DEFAULT 0 NOT NULL,  -- Run ending at last_event_id
+    longest_streak INTEGER DEFAULT 0 NOT NULL,
+    last_event_id UUID,                         -- Latest attended event (scheduled order)
+    last_event_at TIMESTAMPTZ,                  -- Its scheduled_at
+    last_check_in TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+CREATE TABLE member_badges (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    badge VARCHAR(50) NOT NULL,
+    awarded_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (user_id, badge)
+);
+
+-- Normalized skill tags for skill-based member discovery; users.skills stays the
+-- display copy (backfill / repair: python -m app.cli skills-rebuild)
+CREATE TABLE skills (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    slug VARCHAR(50) UNIQUE NOT NULL,  -- Lowercase name with single spaces
+    name VARCHAR(50) NOT NULL,         -- First spelling used
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX idx_skills_slug_prefix ON skills (slug text_pattern_ops);
+
+-- Primary key is the inverted index (skill -> members)
+CREATE TABLE user_skills (
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    PRIMARY KEY (skill_id, user_id)
+);
+
+CREATE INDEX idx_user_skills_user ON user_skills(user_id);
+
 -- =============================================================================
 -- USED NONCES TABLE (Replay attack prevention)
 -- =============================================================================
@@ -189,39 +266,117 @@ CREATE TABLE study_materials (
     description TEXT,
     file_path VARCHAR(500) NOT NULL,
     file_name VARCHAR(255) NOT NULL,
+    file_size BIGINT,               -- Bytes
+    content_sha256 CHAR(64),        -- Hex digest; the material_blobs key for stored blobs
     uploaded_by UUID NOT NULL REFERENCES users(id),
     uploaded_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
 );
 
 CREATE INDEX idx_materials_event ON study_materials(event_id);
+CREATE INDEX idx_materials_sha256 ON study_materials(content_sha256);
+
+-- Content-addressed files (uploads/blobs/<aa>/<sha256>), shared by materials with
+-- the same content (garbage collection: python -m app.cli blobs-gc)
+CREATE TABLE material_blobs (
+    sha256 CHAR(64) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    ref_count INTEGER DEFAULT 0 NOT NULL,  -- study_materials pointing at the blob
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Resumable uploads in progress (file preallocated at uploads/incoming/<id>.part);
+-- expired ones are removed by python -m app.cli uploads-expire
+CREATE TABLE material_uploads (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    event_id UUID REFERENCES events(id),
+    file_name VARCHAR(255) NOT NULL,
+    size BIGINT NOT NULL,
+    received BIGINT DEFAULT 0 NOT NULL,  -- Verified bytes from the start of the file
+    expected_sha256 CHAR(64),            -- Checked on finalize when given
+    created_by UUID NOT NULL REFERENCES users(id),
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    CHECK (received >= 0 AND received <= size)
+);
+
+CREATE INDEX idx_material_uploads_expires ON material_uploads(expires_at);
 
 -- =============================================================================
 -- AUDIT LOGS TABLE
 -- =============================================================================
 
+-- Range-partitioned by month; upcoming partitions are created by
+-- `python -m app.cli audit-partitions`
 CREATE TABLE audit_logs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id UUID,  -- Nullable for system actions
     action VARCHAR(50) NOT NULL,
     resource_type VARCHAR(50),
-    resource_id UUID,
+    resource_id VARCHAR(64),  -- Free text: QR session ids are not UUIDs
     meta_data JSONB,  -- Native JSON support in PostgreSQL
     ip_address VARCHAR(45),
     user_agent TEXT,
-    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+DO $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::DATE;
+BEGIN
+    FOR i IN 0..3 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END $$;
+
+CREATE INDEX idx_audit_created_brin ON audit_logs USING BRIN (created_at);
+CREATE INDEX idx_audit_action_created ON audit_logs(action, created_at);
+CREATE INDEX idx_audit_user_created ON audit_logs(user_id, created_at);
+CREATE INDEX idx_audit_user_action ON audit_logs(user_id, action);
+CREATE INDEX idx_audit_resource ON audit_logs(resource_type, resource_id);
+CREATE INDEX idx_audit_meta_event ON audit_logs((meta_data->>'event_id'), created_at)
+    WHERE meta_data->>'event_id' IS NOT NULL;
+CREATE INDEX idx_audit_meta_qr_session ON audit_logs((meta_data->>'qr_session_id'), created_at)
+    WHERE meta_data->>'qr_session_id' IS NOT NULL;
+
+-- Per-minute aggregates of rejected security events (failed attendance scans)
+CREATE TABLE security_event_rollups (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    action VARCHAR(50) NOT NULL,
+    reason VARCHAR(50) NOT NULL,
+    window_start TIMESTAMPTZ NOT NULL,
+    count INTEGER DEFAULT 0 NOT NULL,
+    first_seen TIMESTAMPTZ NOT NULL,
+    last_seen TIMESTAMPTZ NOT NULL,
+    ip_address VARCHAR(45),
+    
+    CONSTRAINT one_rollup_per_window UNIQUE (user_id, action, reason, window_start)
 );
 
-CREATE INDEX idx_audit_logs_user ON audit_logs(user_id);
-CREATE INDEX idx_audit_logs_action ON audit_logs(action);
-CREATE INDEX idx_audit_logs_created ON audit_logs(created_at DESC);
-CREATE INDEX idx_audit_logs_user_action ON audit_logs(user_id, action);
+CREATE INDEX idx_rollups_window ON security_event_rollups(window_start);
+CREATE INDEX idx_rollups_user_window ON security_event_rollups(user_id, window_start);
 
 -- =============================================================================
 -- NOTIFICATIONS TABLE
 -- =============================================================================
 
+-- Range-partitioned by month; partitions are created ahead and expired ones
+-- dropped by `python -m app.cli notifications-retention`
 CREATE TABLE notifications (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     recipient_id UUID NOT NULL REFERENCES users(id),
     type VARCHAR(50) NOT NULL,
     title VARCHAR(255) NOT NULL,
@@ -229,10 +384,69 @@ CREATE TABLE notifications (
     notification_data JSONB,  -- Native JSON support
     is_read BOOLEAN DEFAULT FALSE NOT NULL,
     created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
-    read_at TIMESTAMPTZ
+    read_at TIMESTAMPTZ,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE notifications_default PARTITION OF notifications DEFAULT;
+
+DO $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::DATE;
+BEGIN
+    FOR i IN 0..3 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            'notifications_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END $$;
+
+CREATE INDEX idx_notifications_inbox ON notifications(recipient_id, is_read, created_at);
+
+-- Read notifications past the retention window (NOTIFICATION_ARCHIVE_BACKEND=table)
+CREATE TABLE notifications_archive (
+    id UUID PRIMARY KEY,
+    recipient_id UUID NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT COMPRESSION lz4,
+    notification_data JSONB COMPRESSION lz4,
+    is_read BOOLEAN DEFAULT TRUE NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    read_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Per-user unread counter (maintained incrementally by the backend)
+CREATE TABLE notification_counters (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    unread_count INTEGER DEFAULT 0 NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
 );
 
-CREATE INDEX idx_notifications_recipient_read ON notifications(recipient_id, is_read);
+-- =============================================================================
+-- CHANGE VERSIONS TABLE
+-- =============================================================================
+
+-- Monotonic version per data scope, bumped on writes; list endpoints derive ETags from it
+CREATE TABLE change_versions (
+    scope VARCHAR(100) PRIMARY KEY,  -- e.g. 'events', 'resources', 'attendance:user:<id>'
+    version BIGINT DEFAULT 1 NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- Short-TTL results shared by all workers (e.g. admin stats), keyed to change versions
+CREATE TABLE shared_cache (
+    key VARCHAR(200) PRIMARY KEY,
+    fingerprint VARCHAR(64) NOT NULL,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
 
 -- =============================================================================
 -- ROW LEVEL SECURITY (Optional - Enable if using Supabase Auth)
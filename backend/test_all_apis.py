@@ -402,6 +402,48 @@ def test_get_resources(token):
     except Exception as e:
         log_test("Resources: Get All", False, str(e))
 
+# ============================================
+# NOTIFICATION TESTS
+# ============================================
+
+def test_notifications_inbox(token):
+    """Test notification listing, unread count and bulk mark-read"""
+    try:
+        response = requests.get(
+            f"{BASE_URL}/notifications/",
+            headers=get_auth_header(token),
+            params={"limit": 5}
+        )
+        if response.status_code != 200:
+            log_test("Notifications: List", False, f"Status: {response.status_code}")
+            return
+        data = response.json()
+        log_test("Notifications: List", "notifications" in data and "next_cursor" in data)
+        
+        if data["next_cursor"]:
+            page2 = requests.get(
+                f"{BASE_URL}/notifications/",
+                headers=get_auth_header(token),
+                params={"limit": 5, "cursor": data["next_cursor"]}
+            ).json()
+            first_ids = {n["id"] for n in data["notifications"]}
+            log_test("Notifications: Next Page", not any(n["id"] in first_ids for n in page2["notifications"]))
+        
+        response = requests.post(
+            f"{BASE_URL}/notifications/mark-read",
+            headers=get_auth_header(token),
+            json={}
+        )
+        log_test("Notifications: Mark All Read", response.status_code == 200 and response.json()["unread_count"] == 0)
+        
+        response = requests.get(
+            f"{BASE_URL}/notifications/unread-count",
+            headers=get_auth_header(token)
+        )
+        log_test("Notifications: Unread Count", response.status_code == 200 and response.json()["unread_count"] == 0)
+    except Exception as e:
+        log_test("Notifications: Inbox", False, str(e))
+
 # ============================================
 # MAIN TEST RUNNER
 # ============================================
@@ -480,6 +522,12 @@ def run_all_tests():
     if admin_token:
         test_get_resources(admin_token)
     
+    # 7. Notification Tests
+    print("\n📌 NOTIFICATION TESTS")
+    print("-" * 40)
+    if admin_token:
+        test_notifications_inbox(admin_token)
+    
     # Summary
     print("\n" + "=" * 60)
     print("TEST SUMMARY")
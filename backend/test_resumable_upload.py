@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test Script: Resumable chunked uploads
+Tests: Create → PUT chunks → dropped chunk → bad checksum → resume from offset → finalize → download
+
+Run against a live server:
+    uvicorn app.main:app --port 8000
+    python test_resumable_upload.py
+    python test_resumable_upload.py --size-mb 2000 --chunk-mb 64
+"""
+import argparse
+import hashlib
+import os
+import sys
+
+import httpx
+
+BASE_URL = "http://127.0.0.1:8000"
+
+
+def print_section(title):
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def chunk_bytes(index: int, size: int) -> bytes:
+    """Deterministic chunk content, so the file never has to exist on the client."""
+    seed = hashlib.sha256(str(index).encode()).digest()
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+class DroppedConnection(Exception):
+    pass
+
+
+def dropping_body(data: bytes):
+    """Sends half of the chunk, then fails like a dropped connection."""
+    yield data[:len(data) // 2]
+    raise DroppedConnection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable upload test")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    client = httpx.Client(base_url=args.base_url, timeout=None)
+    size = args.size_mb * 1024 * 1024
+    chunk_size = args.chunk_mb * 1024 * 1024
+    chunks = [chunk_bytes(i, min(chunk_size, size - start)) for i, start in enumerate(range(0, size, chunk_size))]
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+
+    print_section("STEP 1: ADMIN LOGIN")
+    response = client.post("/api/auth/login", data={
+        "username": os.getenv("ADMIN_EMAIL", "admin@dsclub.com"),
+        "password": os.getenv("ADMIN_PASSWORD", "SecureAdmin@2026")
+    })
+    if response.status_code != 200:
+        print(f"❌ Admin login failed: {response.status_code} {response.text}")
+        sys.exit(1)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    print("✅ Admin logged in")
+
+    print_section(f"STEP 2: CREATE A {args.size_mb} MB UPLOAD")
+    response = client.post("/api/resources/uploads", headers=headers, json={
+        "file_name": "resumable-test.bin",
+        "title": "Resumable upload test",
+        "size": size,
+        "sha256": digest.hexdigest()
+    })
+    if response.status_code != 201:
+        print(f"❌ Create failed: {response.status_code} {response.text}")
+        sys.exit(1)
+    upload_id = response.json()["id"]
+    url = f"/api/resources/uploads/{upload_id}"
+    print(f"✅ Upload {upload_id} created")
+
+    def put(offset: int, content, checksum: str):
+        return client.put(url, params={"offset": offset}, content=content,
+                          headers={**headers, "X-Chunk-SHA256": checksum})
+
+    def offset_now() -> int:
+        return client.get(url, headers=headers).json()["offset"]
+
+    ok = True
+    print_section("STEP 3: SEND CHUNKS, DROP ONE, CORRUPT ONE, RESUME")
+    middle = len(chunks) // 2
+    offset = 0
+    for index, chunk in enumerate(chunks):
+        checksum = hashlib.sha256(chunk).hexdigest()
+        if index == middle:
+            try:
+                put(offset, dropping_body(chunk), checksum)
+            except DroppedConnection:
+                pass
+            if offset_now() != offset:
+                print(f"❌ A dropped chunk moved the offset to {offset_now()}")
+                ok = False
+            else:
+                print(f"✅ Dropped chunk {index}: offset still {offset}")
+
+            response = put(offset, chunk, hashlib.sha256(b"wrong").hexdigest())
+            if response.status_code != 422 or offset_now() != offset:
+                print(f"❌ Bad checksum: expected 422 and no progress, got {response.status_code}")
+                ok = False
+            else:
+                print(f"✅ Bad checksum rejected (422), offset still {offset}")
+
+            response = put(offset + 1, chunk, checksum)
+            if response.status_code != 409 or response.headers.get("Upload-Offset") != str(offset):
+                print(f"❌ Wrong offset: expected 409 with Upload-Offset {offset}, got {response.status_code}")
+                ok = False
+            else:
+                print("✅ Wrong offset rejected (409) with the current offset")
+
+        response = put(offset, chunk, checksum)
+        if response.status_code != 204:
+            print(f"❌ Chunk {index} failed: {response.status_code} {response.text}")
+            sys.exit(1)
+        offset = int(response.headers["Upload-Offset"])
+    print(f"✅ {len(chunks)} chunks sent, offset {offset}")
+
+    print_section("STEP 4: FINALIZE AND VERIFY")
+    response = client.post(f"{url}/finalize", headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Finalize failed: {response.status_code} {response.text}")
+        sys.exit(1)
+    material = response.json()
+    if material.get("file_size") != size or material.get("content_sha256") != digest.hexdigest():
+        print(f"❌ Stored file mismatch: {material.get('file_size')} bytes, {material.get('content_sha256')}")
+        ok = False
+    else:
+        print("✅ Material created; size and SHA-256 match")
+
+    response = client.get(material["download_url"], headers={"Range": "bytes=-1024"})
+    if response.status_code != 206 or response.content != chunks[-1][-1024:]:
+        print(f"❌ Ranged download of the tail failed: {response.status_code}")
+        ok = False
+    else:
+        print("✅ Signed ranged download returns the file's tail")
+
+    if client.post(f"{url}/finalize", headers=headers).status_code != 404:
+        print("❌ A second finalize did not return 404")
+        ok = False
+
+    client.delete(f"/api/resources/{material['id']}", headers=headers)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test Script: Streaming uploads don't block the worker
+Tests: Stream a 500 MB upload → poll the API meanwhile → verify size and SHA-256
+
+Run against a live server with a single worker (the worst case):
+    uvicorn app.main:app --port 8000 --workers 1
+    python test_upload_concurrency.py
+    python test_upload_concurrency.py --size-mb 2000 --max-latency-ms 250
+
+The upload body is generated on the fly, so the client needs no disk space.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+import uuid
+
+import httpx
+
+BASE_URL = "http://127.0.0.1:8000"
+BLOCK = os.urandom(1024 * 1024)
+
+
+def print_section(title):
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def multipart_body(size_mb: int, boundary: str, digest):
+    """multipart/form-data with a title field and a size_mb MiB file, yielded in 1 MiB pieces."""
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="title"\r\n\r\n'
+        f"Upload concurrency test\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="concurrency-test.bin"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    for _ in range(size_mb):
+        digest.update(BLOCK)
+        yield BLOCK
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming upload concurrency test")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--max-latency-ms", type=float, default=500.0,
+                        help="Fail if any concurrent request takes longer")
+    args = parser.parse_args()
+
+    client = httpx.Client(base_url=args.base_url, timeout=None)
+
+    print_section("STEP 1: ADMIN LOGIN")
+    response = client.post("/api/auth/login", data={
+        "username": os.getenv("ADMIN_EMAIL", "admin@dsclub.com"),
+        "password": os.getenv("ADMIN_PASSWORD", "SecureAdmin@2026")
+    })
+    if response.status_code != 200:
+        print(f"❌ Admin login failed: {response.status_code} {response.text}")
+        sys.exit(1)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    print("✅ Admin logged in")
+
+    print_section(f"STEP 2: STREAM A {args.size_mb} MB UPLOAD WHILE POLLING THE API")
+    boundary = uuid.uuid4().hex
+    digest = hashlib.sha256()
+    result = {}
+
+    def upload():
+        started = time.perf_counter()
+        with httpx.Client(base_url=args.base_url, timeout=None) as upload_client:
+            result["response"] = upload_client.post(
+                "/api/resources/upload",
+                content=multipart_body(args.size_mb, boundary, digest),
+                headers={**headers, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+            )
+        result["seconds"] = time.perf_counter() - started
+
+    uploader = threading.Thread(target=upload)
+    uploader.start()
+
+    latencies = []
+    while uploader.is_alive():
+        started = time.perf_counter()
+        probe = client.get("/api/resources/", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if probe.status_code != 200:
+            print(f"❌ Concurrent request failed: {probe.status_code}")
+            sys.exit(1)
+        time.sleep(0.05)
+    uploader.join()
+
+    response = result["response"]
+    if response.status_code != 200:
+        print(f"❌ Upload failed: {response.status_code} {response.text}")
+        sys.exit(1)
+    material = response.json()
+    throughput = args.size_mb / result["seconds"]
+    print(f"Upload: {result['seconds']:.1f} s ({throughput:.0f} MB/s)")
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+    slowest = latencies[-1] if latencies else 0.0
+    print(f"Concurrent requests: {len(latencies)}, p95 {p95:.1f} ms, max {slowest:.1f} ms")
+
+    print_section("STEP 3: VERIFY")
+    ok = True
+    if material.get("file_size") != args.size_mb * 1024 * 1024:
+        print(f"❌ Size mismatch: {material.get('file_size')}")
+        ok = False
+    if material.get("content_sha256") != digest.hexdigest():
+        print(f"❌ SHA-256 mismatch: {material.get('content_sha256')} != {digest.hexdigest()}")
+        ok = False
+    if len(latencies) < 5:
+        print("❌ Too few concurrent requests completed during the upload")
+        ok = False
+    if slowest > args.max_latency_ms:
+        print(f"❌ A concurrent request took {slowest:.1f} ms (budget {args.max_latency_ms:.0f} ms)")
+        ok = False
+
+    client.delete(f"/api/resources/{material['id']}", headers=headers)
+
+    if ok:
+        print(f"✅ Size and SHA-256 match; API stayed responsive (max {slowest:.1f} ms)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
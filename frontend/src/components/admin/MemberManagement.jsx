@@ -1,26 +1,67 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
-import { Trash2, UserX, UserCheck } from 'lucide-react';
+import { Trash2, UserX, UserCheck, Search } from 'lucide-react';
 import { GlassCard } from '../common/GlassCard';
 import { Button } from '../common/Button';
 import { admin } from '../../services/api';
 
+const PAGE_SIZE = 50;
+
 export const MemberManagement = () => {
   const [members, setMembers] = useState([]);
+  const [sort, setSort] = useState({ field: 'name', order: 'asc' });
+  const [query, setQuery] = useState('');
+  const [search, setSearch] = useState('');
+  const [page, setPage] = useState(1);
+  const [total, setTotal] = useState(0);
+
+  // Debounce typing so each keystroke doesn't hit the server
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setSearch(query.trim());
+      setPage(1);
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [query]);
 
   useEffect(() => {
     loadMembers();
-  }, []);
+  }, [sort, search, page]);
 
   const loadMembers = async () => {
     try {
-      const response = await admin.getMembers();
+      // One page at a time; searches are ranked by the server
+      const response = search
+        ? await admin.searchMembers({ q: search, include_inactive: true, page, limit: PAGE_SIZE })
+        : await admin.getMembers({
+            include_inactive: true,
+            sort: sort.field,
+            order: sort.order,
+            page,
+            limit: PAGE_SIZE,
+          });
       setMembers(response.data);
+      setTotal(Number(response.headers['x-total-count'] || response.data.length));
     } catch (error) {
       console.error('Failed to load members:', error);
     }
   };
 
+  const toggleSort = (field) => {
+    setQuery('');
+    setSearch('');
+    setPage(1);
+    setSort((current) => ({
+      field,
+      order: current.field === field && current.order === 'desc' ? 'asc' : 'desc',
+    }));
+  };
+
+  const sortIndicator = (field) => {
+    if (sort.field !== field) return '';
+    return sort.order === 'asc' ? ' ▲' : ' ▼';
+  };
+
   const handleToggle = async (userId) => {
     try {
       await admin.toggleMember(userId);
@@ -53,14 +94,30 @@ export const MemberManagement = () => {
       </motion.div>
 
       <GlassCard>
+        <div className="relative mb-4">
+          <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 w-4 h-4 text-slate-400" />
+          <input
+            type="text"
+            placeholder="Search by name, email, branch, section or skill..."
+            value={query}
+            onChange={(e) => setQuery(e.target.value)}
+            className="w-full pl-10 pr-4 py-2 bg-slate-700/50 border border-slate-600 rounded-lg text-white placeholder-slate-400 focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent"
+          />
+        </div>
         <div className="overflow-x-auto">
           <table className="w-full">
             <thead>
               <tr className="border-b border-white/10">
-                <th className="text-left py-3 px-4">Name</th>
+                <th className="text-left py-3 px-4 cursor-pointer" onClick={() => toggleSort('name')}>
+                  Name{sortIndicator('name')}
+                </th>
                 <th className="text-left py-3 px-4">Email</th>
-                <th className="text-left py-3 px-4">Attended</th>
-                <th className="text-left py-3 px-4">Rate</th>
+                <th className="text-left py-3 px-4 cursor-pointer" onClick={() => toggleSort('attended')}>
+                  Attended{sortIndicator('attended')}
+                </th>
+                <th className="text-left py-3 px-4 cursor-pointer" onClick={() => toggleSort('rate')}>
+                  Rate{sortIndicator('rate')}
+                </th>
                 <th className="text-left py-3 px-4">Status</th>
                 <th className="text-right py-3 px-4">Actions</th>
               </tr>
@@ -68,7 +125,7 @@ export const MemberManagement = () => {
             <tbody>
               {members.map((member) => (
                 <tr key={member.id} className="border-b border-white/5">
-                  <td className="py-4 px-4">{member.name}</td>
+                  <td className="py-4 px-4">{member.full_name || member.name}</td>
                   <td className="py-4 px-4 text-gray-400">{member.email}</td>
                   <td className="py-4 px-4">{member.attended}/{member.total_events}</td>
                   <td className="py-4 px-4">
@@ -108,6 +165,21 @@ export const MemberManagement = () => {
             </tbody>
           </table>
         </div>
+        {total > PAGE_SIZE && (
+          <div className="flex items-center justify-between mt-4 text-sm text-gray-400">
+            <span>
+              {(page - 1) * PAGE_SIZE + 1}-{Math.min(page * PAGE_SIZE, total)} of {total}
+            </span>
+            <div className="flex gap-2">
+              <Button variant="secondary" size="sm" disabled={page === 1} onClick={() => setPage(page - 1)}>
+                Previous
+              </Button>
+              <Button variant="secondary" size="sm" disabled={page * PAGE_SIZE >= total} onClick={() => setPage(page + 1)}>
+                Next
+              </Button>
+            </div>
+          </div>
+        )}
       </GlassCard>
     </div>
   );
@@ -19,7 +19,9 @@ import {
   CheckCircle,
   Loader2
 } from 'lucide-react';
-import { resources, events as eventsApi } from '../../services/api';
+import { resources, events as eventsApi, uploadResumable } from '../../services/api';
+
+const RESUMABLE_THRESHOLD_BYTES = 64 * 1024 * 1024;
 
 export const ResourceManagement = () => {
   const [materials, setMaterials] = useState([]);
@@ -82,13 +84,22 @@ export const ResourceManagement = () => {
     setError(null);
 
     try {
-      const formData = new FormData();
-      formData.append('file', uploadForm.file);
-      formData.append('title', uploadForm.title);
-      if (uploadForm.description) formData.append('description', uploadForm.description);
-      if (uploadForm.event_id) formData.append('event_id', uploadForm.event_id);
+      if (uploadForm.file.size > RESUMABLE_THRESHOLD_BYTES) {
+        // Large datasets: chunked, so a dropped connection doesn't restart the upload
+        await uploadResumable(uploadForm.file, {
+          title: uploadForm.title,
+          description: uploadForm.description,
+          eventId: uploadForm.event_id,
+        });
+      } else {
+        const formData = new FormData();
+        formData.append('file', uploadForm.file);
+        formData.append('title', uploadForm.title);
+        if (uploadForm.description) formData.append('description', uploadForm.description);
+        if (uploadForm.event_id) formData.append('event_id', uploadForm.event_id);
 
-      await resources.upload(formData);
+        await resources.upload(formData);
+      }
       
       setUploadSuccess(true);
       setTimeout(() => {
@@ -1,26 +1,45 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
-import { Calendar as CalendarIcon, Clock, User } from 'lucide-react';
+import { Calendar as CalendarIcon, Clock, User, ChevronLeft, ChevronRight } from 'lucide-react';
 import { GlassCard } from '../common/GlassCard';
 import { events as eventsApi } from '../../services/api';
 
 export const Calendar = () => {
   const [events, setEvents] = useState([]);
   const [selectedEvent, setSelectedEvent] = useState(null);
+  const [month, setMonth] = useState(() => {
+    const now = new Date();
+    return new Date(now.getFullYear(), now.getMonth(), 1);
+  });
 
   useEffect(() => {
     loadEvents();
-  }, []);
+  }, [month]);
 
   const loadEvents = async () => {
     try {
-      const response = await eventsApi.getAll();
-      setEvents(response.data);
+      // Only the visible month is fetched
+      const nextMonth = new Date(month.getFullYear(), month.getMonth() + 1, 1);
+      const response = await eventsApi.getAll({
+        from: month.toISOString(),
+        to: nextMonth.toISOString(),
+      });
+      const eventsData = response.data?.events || response.data || [];
+      setEvents(eventsData.map(e => ({
+        ...e,
+        date: e.scheduled_at || e.date,
+        attended: e.user_attended || e.attended || false,
+      })));
     } catch (error) {
       console.error('Failed to load events:', error);
     }
   };
 
+  const changeMonth = (offset) => {
+    setSelectedEvent(null);
+    setMonth(new Date(month.getFullYear(), month.getMonth() + offset, 1));
+  };
+
   const getStatusColor = (event) => {
     if (event.attended) return 'border-green-500 bg-green-500/10';
     if (event.status === 'completed') return 'border-red-500 bg-red-500/10';
@@ -39,6 +58,24 @@ export const Calendar = () => {
         <p className="text-gray-400">View all events and your attendance</p>
       </motion.div>
 
+      <div className="flex items-center gap-4 mb-6">
+        <button
+          onClick={() => changeMonth(-1)}
+          className="p-2 rounded-lg hover:bg-gray-700/50 transition-colors"
+        >
+          <ChevronLeft size={20} />
+        </button>
+        <h2 className="text-xl font-semibold min-w-[200px] text-center">
+          {month.toLocaleDateString('en-US', { month: 'long', year: 'numeric' })}
+        </h2>
+        <button
+          onClick={() => changeMonth(1)}
+          className="p-2 rounded-lg hover:bg-gray-700/50 transition-colors"
+        >
+          <ChevronRight size={20} />
+        </button>
+      </div>
+
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
         <div className="lg:col-span-2 space-y-4">
           {events.map((event) => (
@@ -95,6 +132,9 @@ export const Calendar = () => {
               </GlassCard>
             </motion.div>
           ))}
+          {events.length === 0 && (
+            <p className="text-gray-500 text-center py-8">No events this month</p>
+          )}
         </div>
 
         {selectedEvent && (
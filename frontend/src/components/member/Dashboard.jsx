@@ -4,7 +4,7 @@ import { Calendar, CheckCircle, TrendingUp, QrCode, Clock, ChevronRight, BarChar
 import { GlassCard } from '../common/GlassCard';
 import { StatCard } from '../common/StatCard';
 import { Button } from '../common/Button';
-import { attendance, events as eventsApi } from '../../services/api';
+import { member } from '../../services/api';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../contexts/AuthContext';
 
@@ -23,14 +23,20 @@ export const Dashboard = () => {
   const loadData = async () => {
     try {
       setLoading(true);
-      const [statsRes, sessionRes, eventsRes] = await Promise.all([
-        attendance.getStats(),
-        attendance.getActiveSession(),
-        eventsApi.getAll(),
-      ]);
-      setStats(statsRes.data);
-      setActiveSession(sessionRes.data);
-      setRecentEvents(eventsRes.data.slice(0, 5));
+      // Stats, live session, upcoming events and recent attendance in one request
+      const { data } = await member.getDashboard();
+      setStats(data.stats);
+      setActiveSession(data.active_session);
+      setRecentEvents([
+        ...data.upcoming_events.map((event) => ({ ...event, status: 'scheduled' })),
+        ...data.recent_attendance.map((record) => ({
+          id: record.event_id,
+          title: record.event_title,
+          date: record.event_date,
+          attended: record.status === 'present',
+          status: 'completed',
+        })),
+      ].slice(0, 5));
     } catch (error) {
       console.error('Failed to load dashboard data:', error);
     } finally {
@@ -110,8 +116,8 @@ export const Dashboard = () => {
         <StatCard
           icon={TrendingUp}
           label="Attendance Rate"
-          value={`${stats?.percentage || 0}%`}
-          subValue={stats?.percentage >= 80 ? 'Excellent' : stats?.percentage >= 60 ? 'Good' : 'Needs Improvement'}
+          value={`${stats?.attendance_rate || 0}%`}
+          subValue={stats?.attendance_rate >= 80 ? 'Excellent' : stats?.attendance_rate >= 60 ? 'Good' : 'Needs Improvement'}
           color="purple"
           delay={0.3}
         />
@@ -264,7 +270,7 @@ export const Dashboard = () => {
       </motion.div>
 
       {/* Motivation Card */}
-      {stats?.percentage >= 80 && (
+      {stats?.attendance_rate >= 80 && (
         <motion.div
           initial={{ opacity: 0, y: 20 }}
           animate={{ opacity: 1, y: 0 }}
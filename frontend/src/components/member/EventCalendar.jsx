@@ -16,34 +16,38 @@ export const EventCalendar = () => {
   const [currentDate, setCurrentDate] = useState(new Date());
   const [viewMode, setViewMode] = useState('month'); // 'month' or 'week'
   const [events, setEvents] = useState([]);
+  const [upcoming, setUpcoming] = useState([]);
   const [selectedDate, setSelectedDate] = useState(null);
   const [selectedEvent, setSelectedEvent] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    loadEvents();
+    loadUpcoming();
   }, []);
 
-  const loadEvents = async () => {
+  const fetchEvents = async (params) => {
+    // Try member events first, fall back to general events
+    let response;
+    try {
+      response = await member.getMyEvents(params);
+    } catch {
+      response = await eventsApi.getAll(params);
+    }
+    
+    const eventsData = response.data?.events || response.data || [];
+    // Normalize event data
+    return eventsData.map(e => ({
+      ...e,
+      date: new Date(e.scheduled_at || e.date),
+      type: e.type || (e.is_workshop ? 'class' : 'event'),
+      attended: e.attended || e.user_attended || false
+    }));
+  };
+
+  const loadEvents = async (from, to) => {
     setLoading(true);
     try {
-      // Try member events first, fall back to general events
-      let response;
-      try {
-        response = await member.getMyEvents();
-      } catch {
-        response = await eventsApi.getAll();
-      }
-      
-      const eventsData = response.data?.events || response.data || [];
-      // Normalize event data
-      const normalized = eventsData.map(e => ({
-        ...e,
-        date: new Date(e.scheduled_at || e.date),
-        type: e.type || (e.is_workshop ? 'class' : 'event'),
-        attended: e.attended || false
-      }));
-      setEvents(normalized);
+      setEvents(await fetchEvents({ from: from.toISOString(), to: to.toISOString() }));
     } catch (error) {
       console.error('Failed to load events:', error);
     } finally {
@@ -51,6 +55,14 @@ export const EventCalendar = () => {
     }
   };
 
+  const loadUpcoming = async () => {
+    try {
+      setUpcoming(await fetchEvents({ from: new Date().toISOString() }));
+    } catch (error) {
+      console.error('Failed to load upcoming events:', error);
+    }
+  };
+
   // Calendar calculations
   const calendarData = useMemo(() => {
     const year = currentDate.getFullYear();
@@ -106,6 +118,13 @@ export const EventCalendar = () => {
     }
   }, [currentDate, viewMode]);
 
+  // Fetch only the visible range (month grid including padding days, or the week)
+  useEffect(() => {
+    const first = calendarData[0].date;
+    const last = calendarData[calendarData.length - 1].date;
+    loadEvents(first, new Date(last.getFullYear(), last.getMonth(), last.getDate() + 1));
+  }, [calendarData]);
+
   const getEventsForDate = (date) => {
     return events.filter(event => {
       const eventDate = new Date(event.date);
@@ -447,8 +466,7 @@ export const EventCalendar = () => {
           <GlassCard>
             <h3 className="font-semibold mb-4">Upcoming</h3>
             <div className="space-y-2">
-              {events
-                .filter(e => new Date(e.date) >= new Date())
+              {[...upcoming]
                 .sort((a, b) => new Date(a.date) - new Date(b.date))
                 .slice(0, 5)
                 .map((event, i) => (
@@ -475,7 +493,7 @@ export const EventCalendar = () => {
                   </div>
                 ))
               }
-              {events.filter(e => new Date(e.date) >= new Date()).length === 0 && (
+              {upcoming.length === 0 && (
                 <p className="text-sm text-slate-500 text-center py-2">No upcoming events</p>
               )}
             </div>
@@ -48,6 +48,17 @@ export const Resources = () => {
       return;
     }
     
+    if (material.download_url) {
+      // Signed URL: the browser streams the file itself (no token, no in-memory blob)
+      const link = document.createElement('a');
+      link.href = resources.fileUrl(material);
+      link.setAttribute('download', material.file_name || 'download');
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      return;
+    }
+    
     try {
       const response = await resources.download(material.id);
       // Create blob and download
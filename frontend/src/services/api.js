@@ -2,6 +2,8 @@ import axios from 'axios';
 
 // Use environment variable for production, fallback to /api for local dev with Vite proxy
 const API_BASE_URL = import.meta.env.VITE_API_URL || '/api';
+// Signed download URLs are paths on the API host (they already start with /api)
+const API_ORIGIN = API_BASE_URL.replace(/\/api\/?$/, '');
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -109,7 +111,7 @@ export const auth = {
 };
 
 export const events = {
-  getAll: () => api.get('/events/'),
+  getAll: (params = {}) => api.get('/events/', { params }),
   getOne: (id) => api.get(`/events/${id}`),
   create: (data) => api.post('/events/', {
     title: data.title,
@@ -150,6 +152,13 @@ export const admin = {
       approved_role: approvedRole,
       rejection_reason: rejectionReason
     }),
+  decideApprovals: (requestIds, decision, approvedRole = 'student', rejectionReason = null) =>
+    api.post('/admin/approval-requests/bulk-decide', {
+      request_ids: requestIds,
+      decision,
+      approved_role: approvedRole,
+      rejection_reason: rejectionReason
+    }),
   
   // Legacy endpoints (mapped to new structure)
   getPendingUsers: () => api.get('/admin/approval-requests', { params: { status_filter: 'PENDING' } }),
@@ -160,10 +169,23 @@ export const admin = {
     }),
   
   // Member management
-  getMembers: () => api.get('/admin/members'),
+  getMembers: (params = {}) => api.get('/admin/members', { params }),
+  searchMembers: (params = {}) => api.get('/admin/members/search', { params }),
+  getSkills: (params = {}) => api.get('/admin/skills', { params }),
+  findMembersBySkills: (skills, params = {}) =>
+    api.get('/admin/members/skills', { params: { ...params, skill: skills }, paramsSerializer: { indexes: null } }),
   toggleMember: (userId) => api.post(`/admin/toggle-member/${userId}`),
   removeMember: (userId) => api.delete(`/admin/remove-member/${userId}`),
+  toggleMembers: (userIds, isActive = null) => api.post('/admin/toggle-members', { user_ids: userIds, is_active: isActive }),
+  removeMembers: (userIds) => api.post('/admin/remove-members', { user_ids: userIds }),
   getStats: () => api.get('/admin/stats'),
+  getAnalytics: (metric, params = {}) => api.get(`/admin/analytics/${metric}`, { params }),
+  exportAttendance: (params = {}) => api.get('/admin/export/attendance', { params, responseType: 'blob' }),
+  exportMatrix: (params = {}) => api.get('/admin/export/matrix', { params, responseType: 'blob' }),
+  
+  // Security monitoring
+  getSecurityEvents: (params = {}) => api.get('/admin/audit/security-events', { params }),
+  getAuditLogs: (params = {}) => api.get('/admin/audit/logs', { params }),
 };
 
 export const resources = {
@@ -171,9 +193,68 @@ export const resources = {
   upload: (formData) => api.post('/resources/upload', formData, {
     headers: { 'Content-Type': 'multipart/form-data' }
   }),
+  createFromBlob: (data) => api.post('/resources/from-blob', data),
+  download: (id) => api.get(`/resources/${id}/download`, { responseType: 'blob' }),
+  fileUrl: (material) => `${API_ORIGIN}${material.download_url}`,
+  // Resumable uploads (see uploadResumable)
+  createUpload: (data) => api.post('/resources/uploads', data),
+  getUpload: (id) => api.get(`/resources/uploads/${id}`),
+  putChunk: (id, offset, chunk, sha256) => api.put(`/resources/uploads/${id}`, chunk, {
+    params: { offset },
+    headers: { 'Content-Type': 'application/octet-stream', 'X-Chunk-SHA256': sha256 }
+  }),
+  finalizeUpload: (id) => api.post(`/resources/uploads/${id}/finalize`),
+  abortUpload: (id) => api.delete(`/resources/uploads/${id}`),
   delete: (id) => api.delete(`/resources/${id}`),
 };
 
+const RESUMABLE_CHUNK_BYTES = 16 * 1024 * 1024;
+const RESUMABLE_RETRIES = 5;
+
+const sha256Hex = async (buffer) => {
+  const digest = await crypto.subtle.digest('SHA-256', buffer);
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Upload a large file in checksummed chunks; after a failure, resume from the server's offset
+export const uploadResumable = async (file, { title, description, eventId }, onProgress) => {
+  const { data: upload } = await resources.createUpload({
+    file_name: file.name,
+    title,
+    description: description || null,
+    event_id: eventId || null,
+    size: file.size,
+  });
+  const chunkSize = Math.min(upload.max_chunk_bytes, RESUMABLE_CHUNK_BYTES);
+  let offset = 0;
+  let failures = 0;
+  while (offset < file.size) {
+    const chunk = await file.slice(offset, offset + chunkSize).arrayBuffer();
+    try {
+      const response = await resources.putChunk(upload.id, offset, chunk, await sha256Hex(chunk));
+      offset = Number(response.headers['upload-offset']);
+      failures = 0;
+      if (onProgress) onProgress(offset / file.size);
+    } catch (err) {
+      failures += 1;
+      if (failures > RESUMABLE_RETRIES) throw err;
+      await new Promise((resolve) => setTimeout(resolve, 1000 * failures));
+      const { data } = await resources.getUpload(upload.id);
+      offset = data.offset;
+    }
+  }
+  return resources.finalizeUpload(upload.id);
+};
+
+export const notifications = {
+  getAll: (cursor = null, unreadOnly = false, limit = 20) =>
+    api.get('/notifications/', { params: { cursor, unread_only: unreadOnly, limit } }),
+  getUnreadCount: () => api.get('/notifications/unread-count'),
+  markRead: (id) => api.post(`/notifications/${id}/read`),
+  markManyRead: (ids) => api.post('/notifications/mark-read', { ids }),
+  markAllRead: (before = null) => api.post('/notifications/mark-read', { before }),
+};
+
 // Member profile and dashboard APIs
 export const member = {
   // Profile management
@@ -181,11 +262,12 @@ export const member = {
   updateProfile: (data) => api.put('/member/profile', data),
   
   // Member's events and calendar
-  getMyEvents: () => api.get('/member/events'),
+  getMyEvents: (params = {}) => api.get('/member/events', { params }),
   getUpcomingEvents: () => api.get('/member/events/upcoming'),
   getEventHistory: () => api.get('/member/events/history'),
   
   // Activity and stats
+  getDashboard: (params = {}) => api.get('/member/dashboard', { params }),
   getActivityHistory: () => api.get('/member/activity'),
   getBadges: () => api.get('/member/badges'),
 };